@@ -6,6 +6,14 @@ from typing import Optional, Tuple
 import bpy
 from bpy.types import Operator
 
+from .completion import job_running, resolve
+from .clip_context import find_clip_editor
+
+# Poll-Intervall des Operators und Ruhezeit, nach der ein Tracking-Lauf ohne
+# Job-API als beendet gilt (Markeranzahl und Frame unverändert).
+_POLL_SEC = 0.05
+_STABLE_SEC = 0.5
+
 
 # ---------------------------------------------------------------------------
 # UI/Context-Utilities
@@ -15,20 +23,10 @@ def _find_clip_context() -> Tuple[Optional[bpy.types.Window],
                                   Optional[bpy.types.Area],
                                   Optional[bpy.types.Region],
                                   Optional[bpy.types.Space]]:
-    wm = bpy.context.window_manager
-    if not wm:
+    ov = find_clip_editor()
+    if not ov:
         return None, None, None, None
-    for win in wm.windows:
-        scr = win.screen
-        if not scr:
-            continue
-        for area in scr.areas:
-            if area.type == 'CLIP_EDITOR':
-                region = next((r for r in area.regions if r.type == 'WINDOW'), None)
-                space = area.spaces.active if hasattr(area, "spaces") else None
-                if region and space:
-                    return win, area, region, space
-    return None, None, None, None
+    return ov["window"], ov["area"], ov["region"], ov["space_data"]
 
 
 def _run_in_clip_context(op_callable, **kwargs):
@@ -94,6 +92,35 @@ def _deselect_all_tracks(clip) -> None:
         pass
 
 
+# ---------------------------------------------------------------------------
+# Synchroner Lauf (Headless)
+# ---------------------------------------------------------------------------
+
+def run_bidirectional_track_sync(context) -> str:
+    """Vorwärts + rückwärts tracken ohne Timer (``EXEC_DEFAULT``, blockierend).
+
+    Gleiche Schritte und dieselben Szene-Signale (``bidi_active``/``bidi_result``)
+    wie der modale Operator; gedacht für ``blender -b``.
+    """
+    scn = context.scene
+    scn["bidi_active"] = True
+    scn["bidi_result"] = ""
+    result = "FAILED"
+    try:
+        if _get_active_clip_fallback() is not None:
+            start_frame = scn.frame_current
+            _run_in_clip_context(bpy.ops.clip.track_markers, backwards=False, sequence=True)
+            scn.frame_current = start_frame
+            _run_in_clip_context(bpy.ops.clip.track_markers, backwards=True, sequence=True)
+            result = "OK"
+    except Exception as exc:
+        print(f"[BidiTrack] sync failed: {exc!r}")
+    scn["bidi_active"] = False
+    scn["bidi_result"] = result
+    resolve("bidi", result)
+    return result
+
+
 # ---------------------------------------------------------------------------
 # Operator
 # ---------------------------------------------------------------------------
@@ -113,7 +140,7 @@ class CLIP_OT_bidirectional_track(Operator):
 
     _t0 = 0.0
     _tick = 0
-    _t_last_action = 0.0
+    _t_last_action = 0.0  # Start bzw. letzte beobachtete Änderung
 
     # ---------------------------------------------------------------------
 
@@ -132,7 +159,7 @@ class CLIP_OT_bidirectional_track(Operator):
         self._tick = 0
 
         wm = context.window_manager
-        self._timer = wm.event_timer_add(0.5, window=context.window)
+        self._timer = wm.event_timer_add(_POLL_SEC, window=context.window)
         wm.modal_handler_add(self)
 
         return {'RUNNING_MODAL'}
@@ -154,39 +181,60 @@ class CLIP_OT_bidirectional_track(Operator):
             return self._finish(context, result="FAILED")
 
         if self._step == 0:
-            try:
-                bpy.ops.clip.track_markers('INVOKE_DEFAULT', backwards=False, sequence=True)
-            except Exception:
+            if not self._start_direction(context, clip, backwards=False):
                 return self._finish(context, result="FAILED")
-            self._t_last_action = time.perf_counter()
             self._step = 1
             return {'PASS_THROUGH'}
 
         elif self._step == 1:
+            if not self._tracking_done(context, clip):
+                return {'PASS_THROUGH'}
             context.scene.frame_current = self._start_frame
+            if not self._start_direction(context, clip, backwards=True):
+                return self._finish(context, result="FAILED")
             self._step = 2
             return {'PASS_THROUGH'}
 
         elif self._step == 2:
-            self._step = 3
-            return {'PASS_THROUGH'}
-
-        elif self._step == 3:
-            try:
-                bpy.ops.clip.track_markers('INVOKE_DEFAULT', backwards=True, sequence=True)
-            except Exception:
-                return self._finish(context, result="FAILED")
-            self._t_last_action = time.perf_counter()
-            self._step = 4
-            return {'PASS_THROUGH'}
-
-        elif self._step == 4:
+            if not self._tracking_done(context, clip):
+                return {'PASS_THROUGH'}
             return self._finish(context, result="OK")
 
         return {'PASS_THROUGH'}
 
     # ---------------------------------------------------------------------
 
+    def _start_direction(self, context, clip, *, backwards: bool) -> bool:
+        try:
+            bpy.ops.clip.track_markers('INVOKE_DEFAULT', backwards=backwards, sequence=True)
+        except Exception:
+            return False
+        self._t_last_action = time.perf_counter()
+        self._prev_marker_count = _count_total_markers(clip)
+        self._prev_frame = int(context.scene.frame_current)
+        self._stable_count = 0
+        return True
+
+    def _tracking_done(self, context, clip) -> bool:
+        """Fertig, sobald der Tracking-Job endet (Job-API) bzw. Markeranzahl
+        und Frame für ``_STABLE_SEC`` unverändert bleiben."""
+        running = job_running("CLIP_TRACK_MARKERS")
+        if running is not None:
+            return not running
+        count = _count_total_markers(clip)
+        frame = int(context.scene.frame_current)
+        now = time.perf_counter()
+        if count != self._prev_marker_count or frame != self._prev_frame:
+            self._prev_marker_count = count
+            self._prev_frame = frame
+            self._stable_count = 0
+            self._t_last_action = now
+            return False
+        self._stable_count += 1
+        return (now - self._t_last_action) >= _STABLE_SEC
+
+    # ---------------------------------------------------------------------
+
     def _finish(self, context, result: str):
         wm = context.window_manager
         if self._timer:
@@ -198,4 +246,5 @@ class CLIP_OT_bidirectional_track(Operator):
 
         context.scene["bidi_active"] = False
         context.scene["bidi_result"] = result
+        resolve("bidi", result)
         return {'FINISHED'}
@@ -3,6 +3,10 @@ from .multiscale_temporal_grid_clean import multiscale_temporal_grid_clean
 from .segments import track_has_internal_gaps
 from .mute_ops import mute_after_last_marker, mute_unassigned_markers
 from .split_cleanup import clear_path_on_split_tracks_segmented, recursive_split_cleanup
+from .clip_context import find_clip_editor
+from .frame_ops import deps_sync
+from .update_coalescer import request_window_swap
+from .trace import traced
 
 __all__ = ("run_clean_error_tracks",)
 
@@ -14,32 +18,25 @@ try:
     _clip_override
 except NameError:
     def _clip_override(context):
-        """Sicher in den CLIP_EDITOR kontexten."""
+        """Sicher in den CLIP_EDITOR kontexten (gecachter Resolver)."""
         win = context.window
         if not win:
             return None
-        scr = getattr(win, "screen", None)
-        if not scr:
+        ov = find_clip_editor(context, window=win)
+        if not ov:
             return None
-        for area in scr.areas:
-            if area.type == 'CLIP_EDITOR':
-                for region in area.regions:
-                    if region.type == 'WINDOW':
-                        return {
-                            'area': area,
-                            'region': region,
-                            'space_data': area.spaces.active
-                        }
-        return None
+        return {
+            'area': ov['area'],
+            'region': ov['region'],
+            'space_data': ov['space_data']
+        }
 
 try:
     _deps_sync
 except NameError:
     def _deps_sync(context):
-        deps = context.evaluated_depsgraph_get()
-        deps.update()
-        bpy.context.view_layer.update()
-        context.scene.frame_set(context.scene.frame_current)
+        # Frame-frei (Scene-Key ``tco_frame_free``) ein gezählter No-Op
+        deps_sync(context)
 
 try:
     _status
@@ -54,10 +51,8 @@ try:
     _pulse_ui
 except NameError:
     def _pulse_ui():
-        try:
-            bpy.ops.wm.redraw_timer(type='DRAW_WIN_SWAP', iterations=1)
-        except Exception:
-            pass
+        # im Pipeline-Lauf einmal pro Tick (Helper/update_coalescer.py)
+        request_window_swap()
 
 
 # ---------------------------------
@@ -68,6 +63,7 @@ def _lerp(a: float, b: float, t: float) -> float:
     return (1.0 - t) * a + t * b
 
 
+@traced()
 def run_clean_error_tracks(context, *, show_popups: bool = False, soften: float = 0.5):
     """
     Clean Error Tracks mit sichtbaren UI-Schritten.
@@ -19,8 +19,13 @@ Rückgabe (dict):
 }
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Tuple
 import bpy
+import numpy as np
+
+from .segment_runs import segment_runs, track_marker_arrays
+from .update_coalescer import request_depsgraph_update
+from .trace import traced
 
 __all__ = ["clean_short_segments"]
 
@@ -52,63 +57,54 @@ def _tracks_collection(clip) -> bpy.types.bpy_prop_collection | None:
         return None
 
 
-def _iter_segments(
-    markers: List[bpy.types.MovieTrackingMarker],
-    *,
-    treat_muted_as_gap: bool
-) -> List[List[bpy.types.MovieTrackingMarker]]:
-    """Zerlegt Marker in Segmente aus konsekutiven Frames (dt==1).
-    Optional erzeugen 'mute'-Marker Lücken.
-    """
-    segs: List[List[bpy.types.MovieTrackingMarker]] = []
-    if not markers:
-        return segs
-
-    # Sicherheit: nach Frame sortieren
-    markers = sorted(markers, key=lambda m: int(getattr(m, "frame", 0)))
-
-    curr: List[bpy.types.MovieTrackingMarker] = [markers[0]]
-    for prev, curr_m in zip(markers, markers[1:]):
-        f0 = int(getattr(prev, "frame", -10))
-        f1 = int(getattr(curr_m, "frame", -10))
-        dt = f1 - f0
-
-        # Lücke, wenn Frames nicht konsekutiv oder (optional) wenn ein Marker gemutet ist
-        gap = (dt != 1) or (
-            treat_muted_as_gap and (getattr(prev, "mute", False) or getattr(curr_m, "mute", False))
-        )
-
-        if gap:
-            segs.append(curr)
-            curr = [curr_m]
-        else:
-            curr.append(curr_m)
-
-    if curr:
-        segs.append(curr)
-    return segs
-
-def _is_estimated(m: bpy.types.MovieTrackingMarker) -> bool:
+def _estimated_mask(tr, n: int) -> np.ndarray:
     """Ein Marker gilt als 'estimated', wenn er NICHT keyframed ist.
-    Primärsignal: not is_keyed. Fallback: vorhandenes 'is_estimate' Flag.
+    Primärsignal: not is_keyed (vektoriell per foreach_get).
     """
-    try:
-        if hasattr(m, "is_keyed"):
-            return not bool(getattr(m, "is_keyed"))
-    except Exception:
-        pass
-    # Fallback – nur verwenden, wenn es existiert:
-    if hasattr(m, "is_estimate"):
+    keyed = np.ones(n, dtype=bool)
+    if n:
         try:
-            return bool(getattr(m, "is_estimate"))
+            tr.markers.foreach_get("is_keyed", keyed)
         except Exception:
-            return False
-    return False
+            return np.zeros(n, dtype=bool)
+    return ~keyed
+
+
+def _short_segment_frames(frame: np.ndarray, runs, min_len: int) -> Tuple[np.ndarray, int]:
+    """Frames aller zu kurzen Segmente (inkl. Save-Gate) und Anzahl betroffener Segmente.
+
+    SAVE-GATE (1-Frame-Abstand): Head bzw. Tail eines Segments bleiben stehen,
+    wenn direkt davor bzw. danach noch ein Marker existiert.
+    """
+    short = runs.length < int(min_len)
+    if not np.any(short):
+        return np.empty(0, dtype=np.int64), 0
+    first = runs.first[short] + np.isin(runs.start[short] - 1, frame)
+    last = runs.last[short] - np.isin(runs.end[short] + 1, frame)
+    k = np.maximum(last - first + 1, 0)
+    total = int(k.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64), 0
+    idx = np.arange(total) - np.repeat(np.cumsum(k) - k, k) + np.repeat(first, k)
+    return frame[idx].astype(np.int64), int(np.count_nonzero(k))
+
+
+def _delete_frames(tr, frames: np.ndarray) -> int:
+    """Löscht Marker über Frame, rückwärts (stabil). Rückgabe: Anzahl gelöschter."""
+    n = 0
+    for f in np.sort(frames)[::-1].tolist():
+        try:
+            tr.markers.delete_frame(int(f))
+            n += 1
+        except Exception:
+            pass
+    return n
 
 # ------------------------------------------------------------
 # Public API
 # ------------------------------------------------------------
 
+@traced()
 def clean_short_segments(
     context: bpy.types.Context,
     *,
@@ -129,94 +125,44 @@ def clean_short_segments(
     tracks_emptied = 0
     estimated_removed = 0
 
-    # Optional: Depsgraph für UI-Konsistenz
-    deps = context.evaluated_depsgraph_get() if hasattr(context, "evaluated_depsgraph_get") else None
+    # Optional: Depsgraph für UI-Konsistenz (im Pipeline-Lauf gebündelt)
+    deps = context if hasattr(context, "evaluated_depsgraph_get") else None
 
+    rule = "GAP_OR_MUTED" if treat_muted_as_gap else "ALL"
     for tr in list(tracks):
         tracks_visited += 1
-        # Snapshot der Marker (wichtig, da wir währenddessen löschen)
-        markers = list(tr.markers)
-        if not markers:
+        try:
+            n = len(tr.markers)
+        except Exception:
+            continue
+        if not n:
             continue
 
         # 1) OPTION: Alle 'estimated' Marker unabhängig von Segmenten löschen
         if delete_estimated:
-            deleted_any_est = False
-            # rückwärts löschen → stabil
-            for m in reversed(markers):
-                try:
-                    if _is_estimated(m):
-                        f = int(getattr(m, "frame", -10))
-                        tr.markers.delete_frame(f)
-                        markers_removed += 1
-                        estimated_removed += 1
-                        deleted_any_est = True
-                except Exception:
-                    pass
-            if deleted_any_est:
-                # Marker-Snapshot nach Löschungen erneuern
-                markers = list(tr.markers)
-                if not markers:
-                    # Track könnte leer geworden sein
-                    try:
-                        if len(tr.markers) == 0:
-                            tracks_emptied += 1
-                    except Exception:
-                        pass
-                    # Depsgraph/UI aktualisieren
-                    if deps is not None:
-                        try:
-                            deps.update()
-                        except Exception:
-                            pass
-                    # Nächster Track
-                    continue
-
-
-        # Set aller vorhandenen Frames des Tracks (für Save-Gate Prüfung)
-        try:
-            frames_in_track = {int(getattr(m, "frame", -10)) for m in markers}
-        except Exception:
-            frames_in_track = set()
-
-        segments = _iter_segments(markers, treat_muted_as_gap=treat_muted_as_gap)
-
-        # Zu kurze Segmente löschen
-        for seg in segments:
-            if len(seg) < int(min_len):
-                # SAVE-GATE (1-Frame-Abstand):
-                try:
-                    first_f = int(getattr(seg[0], "frame", -10))
-                    last_f  = int(getattr(seg[-1], "frame", -10))
-                except Exception:
-                    first_f = None
-                    last_f = None
-
-                to_delete = list(seg)
-
-                # Head schützen, wenn (first_f - 1) existiert
-                if first_f is not None and (first_f - 1) in frames_in_track:
-                    if to_delete and to_delete[0] is seg[0]:
-                        to_delete = to_delete[1:]
-
-                # Tail schützen, wenn (last_f + 1) existiert
-                if last_f is not None and (last_f + 1) in frames_in_track:
-                    if to_delete and to_delete[-1] is seg[-1]:
-                        to_delete = to_delete[:-1]
-
-                deleted_any = False
-                # Marker DELETE: stabil über Frame löschen (robuster als remove(marker))
-                for m in reversed(to_delete):
+            frame, _mute, _est = track_marker_arrays(tr)
+            removed = _delete_frames(tr, frame[_estimated_mask(tr, n)])
+            markers_removed += removed
+            estimated_removed += removed
+            if removed and len(tr.markers) == 0:
+                # Track ist leer geworden
+                tracks_emptied += 1
+                if deps is not None:
                     try:
-                        f = int(getattr(m, "frame", -10))
-                        tr.markers.delete_frame(f)
-                        markers_removed += 1
-                        deleted_any = True
+                        request_depsgraph_update(deps)
                     except Exception:
                         pass
-
-                if deleted_any:
-                    segments_removed += 1
+                continue
+
+        # Segmente per Lauflängen-Engine; zu kurze (mit Save-Gate) löschen
+        frame, mute, _est = track_marker_arrays(tr)
+        runs = segment_runs(frame, mute=mute, rule=rule)
+        doomed, n_segs = _short_segment_frames(frame, runs, min_len)
+        if doomed.size:
+            removed = _delete_frames(tr, doomed)
+            markers_removed += removed
+            if removed:
+                segments_removed += n_segs
 
         # Track leer geworden?
         try:
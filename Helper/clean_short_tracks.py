@@ -1,7 +1,14 @@
 # Helper/clean_short_tracks.py — Short-Track-Cleaner NUR nach Länge
 import bpy
+import numpy as np
 from typing import Optional, Tuple, Iterable, Set
 
+from .track_snapshot import get_track_snapshot
+from .track_removal import remove_tracks, hull_track_mask
+from .segment_runs import snapshot_segment_runs
+from .trace import traced
+from .rna_profile import profiled_clip
+
 # Keys, die mit Detect/Coordinator abgestimmt sind
 KEY_SKIP_ONCE = "__skip_clean_short_once"
 KEY_FRESH     = "__just_created_names"   # Liste frisch angelegter Track-Namen
@@ -70,24 +77,46 @@ def _names_set(tracks: Iterable[bpy.types.MovieTrackingTrack]) -> Set[str]:
     return {str(getattr(t, "name", "")) for t in tracks if getattr(t, "name", "")}
 
 
-def _is_empty_or_fully_muted(track: bpy.types.MovieTrackingTrack) -> bool:
+def _short_track_mask(snap, min_len: int) -> np.ndarray:
+    """Bool-Maske (T,) der Tracks mit mindestens einem zu kurzen Segment.
+
+    Segment = Lauf ungemuteter Marker auf lückenlos aufeinanderfolgenden Frames
+    (Kriterium von ``clip.clean_tracks(action='DELETE_TRACK')``), vektoriell
+    über den Snapshot ausgewertet.
+    """
+    short = np.zeros(snap.n_tracks, dtype=bool)
+    runs = snapshot_segment_runs(snap, "UNMUTED")
+    short[runs.track[runs.length < int(min_len)]] = True
+    return short
+
+
+def _locked_mask(tracks, n: int) -> np.ndarray:
+    lock = np.zeros(n, dtype=bool)
     try:
-        markers = track.markers
-        if len(markers) == 0:
-            return True
-        has_any = False
-        for m in markers:
-            has_any = True
-            if not getattr(m, "mute", False):
-                return False
-        return has_any
+        if n:
+            tracks.foreach_get("lock", lock)
     except Exception:
-        return False
+        pass
+    return lock
+
+
+def _run_clean_tracks_op(scn, window, area, region, space, frames: int, action: str) -> None:
+    try:
+        if window and area and region and space:
+            with bpy.context.temp_override(
+                window=window, screen=window.screen, area=area, region=region, space_data=space, scene=scn
+            ):
+                bpy.ops.clip.clean_tracks(frames=frames, action=action)
+        else:
+            bpy.ops.clip.clean_tracks(frames=frames, action=action)
+    except Exception:
+        pass
 
 
 # ---------------------------------------------------------------------------
 # Kernfunktion (nur LÄNGEN-Prüfung)
 
+@traced()
 def clean_short_tracks(
     context: bpy.types.Context = bpy.context,
     min_len: Optional[int] = None,
@@ -110,6 +139,7 @@ def clean_short_tracks(
     frames = max(frames, 1)
 
     clip, window, area, region, space = _find_clip_and_ui()
+    clip = profiled_clip(clip)
     if not clip:
         return 0, 0
 
@@ -119,53 +149,34 @@ def clean_short_tracks(
 
     fresh = _get_fresh_names(scn) if respect_fresh else set()
 
-    pre_hulls = {t for t in tracks if _is_empty_or_fully_muted(t)}
-    if pre_hulls:
-        _deselect_all(tracks)
-        allow = {str(getattr(t, "name", "")) for t in pre_hulls}
-        _select_names(tracks, allow)
-        try:
-            if window and area and region and space:
-                with bpy.context.temp_override(
-                    window=window, screen=window.screen, area=area, region=region, space_data=space, scene=scn
-                ):
-                    bpy.ops.clip.delete_track()
-            else:
-                bpy.ops.clip.delete_track()
-        except Exception:
-            pass
-
-    names_now = _names_set(clip.tracking.tracks)
-    eligible = names_now - fresh
-    if eligible:
-        _deselect_all(clip.tracking.tracks)
-        _select_names(clip.tracking.tracks, eligible)
-        try:
-            if window and area and region and space:
-                with bpy.context.temp_override(
-                    window=window, screen=window.screen, area=area, region=region, space_data=space, scene=scn
-                ):
-                    bpy.ops.clip.clean_tracks(frames=frames, action=action)
-            else:
-                bpy.ops.clip.clean_tracks(frames=frames, action=action)
-        except Exception:
-            pass
-
-    post_hulls = {t for t in clip.tracking.tracks if _is_empty_or_fully_muted(t)}
-    if post_hulls:
-        _deselect_all(clip.tracking.tracks)
-        allow = {str(getattr(t, "name", "")) for t in post_hulls}
-        _select_names(clip.tracking.tracks, allow)
-        try:
-            if window and area and region and space:
-                with bpy.context.temp_override(
-                    window=window, screen=window.screen, area=area, region=region, space_data=space, scene=scn
-                ):
-                    bpy.ops.clip.delete_track()
-            else:
-                bpy.ops.clip.delete_track()
-        except Exception:
-            pass
+    snap = get_track_snapshot(clip)
+    if snap is None:
+        return processed, 0
+    hulls = hull_track_mask(snap)
+    eligible = np.fromiter((n not in fresh for n in snap.track_names), dtype=bool, count=snap.n_tracks)
+
+    if action == "DELETE_TRACK":
+        # Hüllen + zu kurze Tracks in EINEM Durchgang entfernen
+        doomed = hulls | (eligible & _short_track_mask(snap, frames) & ~_locked_mask(tracks, snap.n_tracks))
+        remove_tracks(clip, snap.track_ptrs[doomed].tolist())
+    else:
+        if hulls.any():
+            remove_tracks(clip, snap.track_ptrs[hulls].tolist())
+            snap.refresh()
+            eligible = np.fromiter((n not in fresh for n in snap.track_names), dtype=bool, count=snap.n_tracks)
+        if eligible.any():
+            try:
+                tracks.foreach_set("select", eligible)
+            except Exception:
+                _deselect_all(tracks)
+                _select_names(tracks, {n for n, ok in zip(snap.track_names, eligible.tolist()) if ok})
+            _run_clean_tracks_op(scn, window, area, region, space, frames, action)
+            # DELETE_SEGMENTS kann neue Hüllen hinterlassen
+            snap.invalidate(snap.track_ptrs.tolist())
+            snap.refresh()
+            post = hull_track_mask(snap)
+            if post.any():
+                remove_tracks(clip, snap.track_ptrs[post].tolist())
 
     total_after = len(clip.tracking.tracks)
     affected = max(0, total_before - total_after) if action == "DELETE_TRACK" else 0
@@ -0,0 +1,212 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/clip_context.py
+----------------------
+Gemeinsamer, gecachter Resolver für den CLIP_EDITOR-Kontext.
+
+Bisher lief jeder Helfer (``_ensure_clip_context``, ``_find_clip_window``,
+``_clip_override``, ``_run_in_clip_context``, Jump-Override, Lösch-Engine) bei
+JEDEM Aufruf über alle Fenster/Areas/Regionen – in Hot-Loops (Distanze: pro
+gelöschtem Track, Split-Cleanup: pro dupliziertem Segment) pro Iteration.
+
+Hier wird einmal gescannt und das Ergebnis (alle CLIP_EDITOR-Einträge
+``window/screen/area/region/space``) gecacht. Gültig bleibt der Cache, solange
+
+  - der Layout-Schlüssel gleich ist (Window-Manager, Screen je Fenster,
+    Anzahl Areas je Screen → Fensterwechsel, Split/Join, Workspace-Wechsel),
+  - kein msgbus-Signal (``Area.type``, ``SpaceClipEditor.clip``) eingegangen ist.
+
+Beim Laden einer Datei (``load_post``) werden Cache und Abo-Status verworfen:
+die gecachten Fenster/Areas gehören zur alten Datei, und ein wiederverwendeter
+Window-Manager-Pointer würde sonst den Neu-Scan samt Neu-Abo verhindern.
+
+Der Schlüssel kostet nur O(Fenster). Ohne offenen Editor wird das negative
+Ergebnis ebenfalls gecacht und ein synthetischer Override geliefert
+(Headless-Override des Laufs bzw. Fenster/Screen/Szene + ``edit_movieclip``).
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .headless import active_clip_override
+from .rna_profile import unwrap_rna
+
+__all__ = (
+    "find_clip_editor",
+    "clip_override",
+    "run_in_clip_context",
+    "invalidate_clip_context",
+    "clear_clip_context",
+    "register_clip_context",
+    "unregister_clip_context",
+)
+
+# {"key": Layout-Schlüssel, "entries": [Editor-Dicts ohne Szene]}
+_CACHE: Dict[str, Any] = {}
+_MSGBUS_OWNER = object()
+_SUBSCRIBED_WM: List[int] = []
+
+
+def invalidate_clip_context(*_args) -> None:
+    """Cache verwerfen (nächster Zugriff scannt neu)."""
+    _CACHE.clear()
+
+
+def _unsubscribe() -> None:
+    try:
+        bpy.msgbus.clear_by_owner(_MSGBUS_OWNER)
+    except Exception:
+        pass
+    _SUBSCRIBED_WM.clear()
+
+
+def clear_clip_context() -> None:
+    """Cache + msgbus-Abos entfernen (Datei-Laden, Unregister)."""
+    _unsubscribe()
+    _CACHE.clear()
+
+
+@persistent
+def _on_load_post(*_args) -> None:
+    clear_clip_context()
+
+
+def register_clip_context() -> None:
+    """``load_post``-Handler installieren (verwirft Editor-Referenzen der alten Datei)."""
+    handlers = bpy.app.handlers.load_post
+    if _on_load_post not in handlers:
+        handlers.append(_on_load_post)
+
+
+def unregister_clip_context() -> None:
+    """Handler entfernen, Cache + msgbus-Abos verwerfen."""
+    handlers = bpy.app.handlers.load_post
+    if _on_load_post in handlers:
+        handlers.remove(_on_load_post)
+    clear_clip_context()
+
+
+def _subscribe(wm_ptr: int) -> None:
+    """msgbus-Abos je Window-Manager (gehen beim Laden einer Datei verloren)."""
+    if _SUBSCRIBED_WM == [wm_ptr]:
+        return
+    _unsubscribe()
+    try:
+        for key in ((bpy.types.Area, "type"), (bpy.types.SpaceClipEditor, "clip")):
+            bpy.msgbus.subscribe_rna(
+                key=key, owner=_MSGBUS_OWNER, args=(), notify=invalidate_clip_context
+            )
+    except Exception:
+        return
+    _SUBSCRIBED_WM.append(wm_ptr)
+
+
+def _layout_key(wm) -> Tuple[Any, ...]:
+    key: List[Any] = [int(wm.as_pointer())]
+    for win in wm.windows:
+        scr = getattr(win, "screen", None)
+        key.append((int(win.as_pointer()), int(scr.as_pointer()) if scr else 0,
+                    len(scr.areas) if scr else 0))
+    return tuple(key)
+
+
+def _scan(wm) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    for win in wm.windows:
+        scr = getattr(win, "screen", None)
+        if not scr:
+            continue
+        for area in scr.areas:
+            if area.type != "CLIP_EDITOR":
+                continue
+            region = next((r for r in area.regions if r.type == "WINDOW"), None)
+            space = area.spaces.active if hasattr(area, "spaces") else None
+            if region and space:
+                entries.append({"window": win, "screen": scr, "area": area,
+                                "region": region, "space_data": space})
+    return entries
+
+
+def _entries() -> List[Dict[str, Any]]:
+    wm = getattr(bpy.context, "window_manager", None)
+    if not wm:
+        return []
+    try:
+        key = _layout_key(wm)
+    except Exception:
+        return []
+    if _CACHE.get("key") != key:
+        _CACHE["key"] = key
+        _CACHE["entries"] = _scan(wm)
+        _subscribe(key[0])
+    return _CACHE["entries"]
+
+
+def find_clip_editor(context=None, *, clip=None, window=None) -> Optional[Dict[str, Any]]:
+    """Override-Dict eines echten CLIP_EDITOR oder None.
+
+    Bevorzugt: Editor in ``context.window``, der ``clip`` zeigt. ``window``
+    beschränkt die Suche auf ein Fenster (Helfer ohne ``window``-Override).
+    """
+    ctx = context or bpy.context
+    clip = unwrap_rna(clip)
+    entries = _entries()
+    # Area-Typwechsel im selben Tick (msgbus meldet erst verzögert)
+    try:
+        stale = any(e["area"].type != "CLIP_EDITOR" for e in entries)
+    except Exception:
+        stale = True
+    if stale:
+        invalidate_clip_context()
+        entries = _entries()
+    if window is not None:
+        entries = [e for e in entries if e["window"] == window]
+    if not entries:
+        return None
+    cur = getattr(ctx, "window", None)
+
+    def _rank(e):
+        return (getattr(e["space_data"], "clip", None) != clip if clip is not None else False,
+                e["window"] != cur)
+
+    best = min(entries, key=_rank)
+    ov = dict(best)
+    ov["scene"] = getattr(ctx, "scene", None) or bpy.context.scene
+    return ov
+
+
+def clip_override(context=None, *, clip=None) -> Dict[str, Any]:
+    """Wie ``find_clip_editor``; ohne Editor ein synthetischer Override.
+
+    Headless: der aktive ``headless_clip_override``. Sonst Fenster/Screen/Szene
+    (+ ``edit_movieclip``), damit Aufrufer ohne Sonderfall ``temp_override``
+    nutzen können. Leer nur ohne Fenster und ohne Headless-Lauf.
+    """
+    clip = unwrap_rna(clip)
+    ov = find_clip_editor(context, clip=clip)
+    if ov is not None:
+        return ov
+    synthetic = active_clip_override()
+    if synthetic:
+        return synthetic
+    ctx = context or bpy.context
+    win = getattr(ctx, "window", None)
+    if win is None:
+        return {}
+    ov = {"window": win, "screen": getattr(win, "screen", None),
+          "scene": getattr(ctx, "scene", None) or bpy.context.scene}
+    if clip is not None:
+        ov["edit_movieclip"] = clip
+    return {k: v for k, v in ov.items() if v is not None}
+
+
+def run_in_clip_context(op_callable: Callable[..., Any], **kwargs):
+    """``op_callable(**kwargs)`` im CLIP_EDITOR-Kontext (ohne Editor: unverändert)."""
+    ov = find_clip_editor() or active_clip_override()
+    if not ov:
+        return op_callable(**kwargs)
+    with bpy.context.temp_override(**ov):
+        return op_callable(**kwargs)
@@ -0,0 +1,189 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/completion.py
+--------------------
+Gemeinsames Fertig-Signal für modale Unter-Operatoren (Tracking, Refine, Solve).
+
+Statt Szene-Flags (``bidi_active``) oder Rekonstruktions-Digests im Timer-Takt
+zu pollen, legt der Aufrufer vor dem Start eine ``Completion`` an
+(``expect(key)``). Aufgelöst wird sie
+
+  - vom Operator selbst beim Beenden (``resolve(key, result)``), oder
+  - über eine ``probe``, die im ``depsgraph_update_post``-Handler geprüft wird
+    (z. B. Solve-Job beendet, Rekonstruktion geändert).
+
+Registrierte Waker (``add_waker``) werden sofort beim Auflösen aufgerufen; der
+Coordinator plant darüber einen 0-s-Timer ein und setzt ohne Wartetakt fort.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import bpy
+
+__all__ = (
+    "Completion",
+    "expect",
+    "resolve",
+    "get_completion",
+    "discard",
+    "add_waker",
+    "remove_waker",
+    "clear_completions",
+    "job_running",
+)
+
+Probe = Callable[[], Any]
+
+
+class Completion:
+    """Einmal auflösbares Fertig-Signal (future-artig, ohne Threads)."""
+
+    __slots__ = ("key", "started_at", "resolved_at", "result", "probe", "_callbacks")
+
+    def __init__(self, key: str, probe: Optional[Probe] = None) -> None:
+        self.key = key
+        self.started_at = time.monotonic()
+        self.resolved_at: Optional[float] = None
+        self.result: Any = None
+        self.probe = probe
+        self._callbacks: List[Callable[["Completion"], None]] = []
+
+    def done(self) -> bool:
+        return self.resolved_at is not None
+
+    def elapsed(self) -> float:
+        end = self.resolved_at if self.resolved_at is not None else time.monotonic()
+        return end - self.started_at
+
+    def add_done_callback(self, fn: Callable[["Completion"], None]) -> None:
+        if self.done():
+            fn(self)
+        else:
+            self._callbacks.append(fn)
+
+    def resolve(self, result: Any = "OK") -> bool:
+        """Löst einmalig auf; weitere Aufrufe sind No-Ops (Rückgabe False)."""
+        if self.done():
+            return False
+        self.result = result
+        self.resolved_at = time.monotonic()
+        self.probe = None
+        callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception as exc:
+                print(f"[Completion] callback failed ({self.key}): {exc!r}")
+        return True
+
+    def __repr__(self) -> str:
+        state = f"done={self.result!r}" if self.done() else "pending"
+        return f"<Completion {self.key} {state} {self.elapsed():.3f}s>"
+
+
+_PENDING: Dict[str, Completion] = {}
+_WAKERS: List[Callable[[Completion], None]] = []
+
+
+# ---------------------------------------------------------------------------
+# Interna
+# ---------------------------------------------------------------------------
+
+def _wake(comp: Completion) -> None:
+    for fn in list(_WAKERS):
+        try:
+            fn(comp)
+        except Exception as exc:
+            print(f"[Completion] waker failed ({comp.key}): {exc!r}")
+
+
+def _on_depsgraph_update(scene, depsgraph=None) -> None:
+    for key, comp in list(_PENDING.items()):
+        if comp.done() or comp.probe is None:
+            continue
+        try:
+            value = comp.probe()
+        except Exception:
+            continue
+        if value is not None and value is not False:
+            resolve(key, value)
+    _sync_handler()
+
+
+def _sync_handler() -> None:
+    """Handler nur installieren, solange Probes offen sind."""
+    handlers = bpy.app.handlers.depsgraph_update_post
+    need = any(c.probe is not None and not c.done() for c in _PENDING.values())
+    installed = _on_depsgraph_update in handlers
+    if need and not installed:
+        handlers.append(_on_depsgraph_update)
+    elif not need and installed:
+        handlers.remove(_on_depsgraph_update)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def expect(key: str, *, probe: Optional[Probe] = None) -> Completion:
+    """Neue offene Completion für ``key`` (ersetzt eine ältere offene)."""
+    comp = Completion(key, probe)
+    _PENDING[key] = comp
+    _sync_handler()
+    return comp
+
+
+def resolve(key: str, result: Any = "OK") -> Optional[Completion]:
+    """Löst die offene Completion ``key`` auf und weckt die Waker.
+
+    Ohne offene Completion (Operator ohne Coordinator gestartet) → None.
+    """
+    comp = _PENDING.pop(key, None)
+    if comp is None:
+        return None
+    if comp.resolve(result):
+        _wake(comp)
+    _sync_handler()
+    return comp
+
+
+def get_completion(key: str) -> Optional[Completion]:
+    return _PENDING.get(key)
+
+
+def discard(key: str) -> None:
+    """Offene Completion ``key`` ohne Auflösen verwerfen (Timeout/Abbruch)."""
+    _PENDING.pop(key, None)
+    _sync_handler()
+
+
+def add_waker(fn: Callable[[Completion], None]) -> None:
+    if fn not in _WAKERS:
+        _WAKERS.append(fn)
+
+
+def remove_waker(fn: Callable[[Completion], None]) -> None:
+    try:
+        _WAKERS.remove(fn)
+    except ValueError:
+        pass
+
+
+def clear_completions() -> None:
+    """Alle offenen Completions verwerfen und den Handler entfernen."""
+    _PENDING.clear()
+    _WAKERS.clear()
+    _sync_handler()
+
+
+def job_running(job_type: str) -> Optional[bool]:
+    """``bpy.app.is_job_running`` (z. B. "CLIP_TRACK_MARKERS"); None, wenn unbekannt."""
+    fn = getattr(bpy.app, "is_job_running", None)
+    if fn is None:
+        return None
+    try:
+        return bool(fn(job_type))
+    except Exception:
+        return None
@@ -11,6 +11,9 @@ from typing import Iterable, Dict, Any, Optional, Set, Tuple, List
 import math
 import statistics
 import bpy
+import numpy as np
+
+from .track_snapshot import get_track_snapshot
 
 __all__ = ("error_value", "evaluate_marker_count", "run_count_tracks")
 
@@ -104,7 +107,15 @@ def run_count_tracks(context: bpy.types.Context, *, frame: int) -> Dict[str, Any
             clip = None
 
     cnt = 0
+    snap = None
     if clip:
+        try:
+            snap = get_track_snapshot(clip)
+        except Exception:
+            snap = None
+    if snap is not None:
+        cnt = int(np.count_nonzero((snap.frame == int(frame)) & ~snap.mute))
+    elif clip:
         trk = getattr(clip, "tracking", None)
         if trk:
             for tr in getattr(trk, "tracks", []):
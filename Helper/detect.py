@@ -4,6 +4,10 @@ from __future__ import annotations
 from typing import Any, Dict, Optional, Set, Tuple
 import bpy
 
+from .clip_context import clip_override
+from .frame_ops import count_avoided, frame_free_enabled, sync_frame
+from .trace import traced
+
 # ---------------------------------------------------------------------------
 # Console logging
 # ---------------------------------------------------------------------------
@@ -40,28 +44,8 @@ def _get_movieclip(context: bpy.types.Context) -> Optional[bpy.types.MovieClip]:
         return None
 
 def _ensure_clip_context(context: bpy.types.Context) -> Dict[str, Any]:
-    """Findet einen CLIP_EDITOR und baut ein temp_override-Dict."""
-    wm = bpy.context.window_manager
-    if not wm:
-        return {}
-    for win in wm.windows:
-        scr = getattr(win, "screen", None)
-        if not scr:
-            continue
-        for area in scr.areas:
-            if area.type != "CLIP_EDITOR":
-                continue
-            region = next((r for r in area.regions if r.type == "WINDOW"), None)
-            space = area.spaces.active if hasattr(area, "spaces") else None
-            if region and space:
-                return {
-                    "window": win,
-                    "area": area,
-                    "region": region,
-                    "space_data": space,
-                    "scene": bpy.context.scene,
-                }
-    return {}
+    """temp_override-Dict für den CLIP-Kontext (gecacht, ggf. synthetisch)."""
+    return clip_override(bpy.context)
 
 def _detect_features(*, placement: str, margin: int, threshold: float, min_distance: int) -> None:
     """Robuster Aufruf von bpy.ops.clip.detect_features im CLIP-Kontext."""
@@ -107,34 +91,39 @@ def perform_marker_detection(
         min_distance=int(min_distance_px),
     )
 
-    # --- NEU: Zustand sicher â€žfluschenâ€œ ---
     scn = bpy.context.scene
     curf = int(scn.frame_current)
-    try:
-        bpy.context.view_layer.update()
-    except Exception:
-        pass
-    try:
-        # Frame kurz â€žanfassenâ€œ, damit marker-arrays intern frisch sind
-        scn.frame_set(curf)
-    except Exception:
-        pass
-
-    # --- Optional: kurze Warte-Schleife bis Keys am Frame sichtbar sind ---
-    # (max. ~0.2 s; bricht frÃ¼her ab, sobald mind. 1 neuer Track einen Marker am curf hat)
-    try:
-        import time
-        deadline = time.time() + 0.2
-        while time.time() < deadline:
-            created_tracks = [t for t in tracking.tracks if t.as_pointer() not in before]
-            if any(t.markers.find_frame(curf, exact=True) for t in created_tracks):
-                break
-            # Einen kleinen Tick geben, dann erneut flushen
-            time.sleep(0.01)
+    if frame_free_enabled(scn):
+        # detect_features schreibt synchron in die Marker-Arrays; lesen per
+        # explizitem Frame, kein Flush/Warten nötig (Flush + Frame-Touch gespart)
+        count_avoided(2)
+    else:
+        # --- NEU: Zustand sicher „fluschen“ ---
+        try:
             bpy.context.view_layer.update()
+        except Exception:
+            pass
+        try:
+            # Frame kurz „anfassen“, damit marker-arrays intern frisch sind
             scn.frame_set(curf)
-    except Exception:
-        pass
+        except Exception:
+            pass
+
+        # --- Optional: kurze Warte-Schleife bis Keys am Frame sichtbar sind ---
+        # (max. ~0.2 s; bricht früher ab, sobald mind. 1 neuer Track einen Marker am curf hat)
+        try:
+            import time
+            deadline = time.time() + 0.2
+            while time.time() < deadline:
+                created_tracks = [t for t in tracking.tracks if t.as_pointer() not in before]
+                if any(t.markers.find_frame(curf, exact=True) for t in created_tracks):
+                    break
+                # Einen kleinen Tick geben, dann erneut flushen
+                time.sleep(0.01)
+                bpy.context.view_layer.update()
+                scn.frame_set(curf)
+        except Exception:
+            pass
 
     created = [t for t in tracking.tracks if t.as_pointer() not in before]
     return before, len(created)
@@ -178,11 +167,13 @@ def run_detect_basic(
         if not clip:
             return {"status": "FAILED", "reason": "no_movieclip"}
 
-        if start_frame is not None:
-            try:
-                scn.frame_set(int(start_frame))
-            except Exception:
-                pass
+        # detect_features läuft auf dem Clip-User-Frame → echtes frame_set,
+        # auch wenn frame_current bereits stimmt (JUMP setzt nur frame_current)
+        try:
+            sync_frame(scn, None if start_frame is None else int(start_frame),
+                       need_depsgraph=True)
+        except Exception:
+            pass
 
         tracking = clip.tracking
 
@@ -273,6 +264,7 @@ def run_detect_basic(
 # -----------------------------
 # Thin Wrapper für Backward-Compat
 # -----------------------------
+@traced()
 def run_detect_once(context: bpy.types.Context, **kwargs) -> Dict[str, Any]:
     # kwargs (inkl. select) werden 1:1 durchgereicht
     res = run_detect_basic(context, **kwargs)
@@ -7,9 +7,15 @@ Helper/distanze.py
 
 from __future__ import annotations
 import bpy
+import numpy as np
 from math import isfinite
 from typing import Iterable, Set, Dict, Any, Optional, Tuple
 
+from .track_snapshot import get_track_snapshot
+from .track_removal import remove_tracks
+from .trace import traced
+from .rna_profile import profiled_clip
+
 # bestehende Imports/Utilities bleiben unverändert …
 
 __all__ = ("run_distance_cleanup",)
@@ -66,35 +72,6 @@ def _track_marker_at_frame(
         return (False, None)
 
 
-def _find_clip_editor_context(context: bpy.types.Context, clip: bpy.types.MovieClip):
-    """
-    Liefert (window, area, region, space) für einen CLIP_EDITOR, falls vorhanden.
-    Fällt ansonsten auf aktive window/screen zurück und setzt space_data pro Override.
-    """
-    win = getattr(context, "window", None)
-    scr = getattr(win, "screen", None) if win else None
-    area = None
-    region = None
-    space = None
-    try:
-        if scr:
-            for a in scr.areas:
-                if getattr(a, "type", "") == "CLIP_EDITOR":
-                    area = a
-                    # bevorzugt WINDOW-Region
-                    for r in a.regions:
-                        if getattr(r, "type", "") == "WINDOW":
-                            region = r
-                            break
-                    space = next(
-                        (s for s in a.spaces if getattr(s, "type", "") == "CLIP_EDITOR"),
-                        None,
-                    )
-                    break
-    except Exception:
-        pass
-    return win, area, region, space
-
 def _collect_old_new_sets(
     context: bpy.types.Context,
     frame: int,
@@ -111,7 +88,7 @@ def _collect_old_new_sets(
       - old_count_markers: Anzahl Referenzmarker @frame (ohne gemutete, wenn include_muted_old=False)
       - new_count_markers: Anzahl Marker @frame in new_set (für Log)
     """
-    clip = _resolve_clip(context)
+    clip = profiled_clip(_resolve_clip(context))
     if not clip:
         return set(), set(), 0, 0
 
@@ -145,9 +122,81 @@ def _collect_old_new_sets(
     return old_set, new_set, old_cnt, new_cnt
 
 
+def _grid_nearest_distance(ref: np.ndarray, qry: np.ndarray, cell: float) -> np.ndarray:
+    """Abstand jedes Query-Punkts zum nächsten Referenzpunkt im 3×3-Zellumfeld.
+
+    Uniform-Grid mit Zellgröße ``cell``: Jeder Referenzpunkt mit Abstand < cell
+    liegt garantiert in einer Nachbarzelle. Punkte ohne Nachbarn dort erhalten
+    ``inf`` (also sicher ≥ cell). Vollständig vektorisiert.
+    """
+    best = np.full(qry.shape[0], np.inf)
+    if not ref.shape[0] or not qry.shape[0]:
+        return best
+    cell = max(float(cell), 1e-9)
+    rc = np.floor(ref / cell).astype(np.int64)
+    qc = np.floor(qry / cell).astype(np.int64)
+    origin = np.minimum(rc.min(axis=0), qc.min(axis=0)) - 1
+    rc -= origin
+    qc -= origin
+    stride = int(max(rc[:, 0].max(), qc[:, 0].max())) + 2
+    rkey = rc[:, 0] + stride * rc[:, 1]
+    order = np.argsort(rkey, kind="stable")
+    rkey = rkey[order]
+    ref = ref[order]
+    q_all = np.arange(qry.shape[0])
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            key = (qc[:, 0] + dx) + stride * (qc[:, 1] + dy)
+            lo = np.searchsorted(rkey, key, side="left")
+            hi = np.searchsorted(rkey, key, side="right")
+            n = hi - lo
+            total = int(n.sum())
+            if not total:
+                continue
+            qi = np.repeat(q_all, n)
+            ri = np.arange(total) - np.repeat(np.cumsum(n) - n, n) + np.repeat(lo, n)
+            d = np.hypot(qry[qi, 0] - ref[ri, 0], qry[qi, 1] - ref[ri, 1])
+            np.minimum.at(best, qi, d)
+    return best
+
+
+def _delete_tracks_batch(
+    context: bpy.types.Context,
+    clip: bpy.types.MovieClip,
+    snap,
+    ptrs: list,
+    frame_i: int,
+) -> Dict[int, str]:
+    """Löscht alle ``ptrs`` in einem Durchgang über ``remove_tracks``.
+
+    Verbliebene Tracks fallen auf Marker@Frame-Löschung zurück.
+    Rückgabe: ptr → "deleted:op" | "deleted:marker" | "failed".
+    """
+    res = remove_tracks(clip, ptrs)
+    out: Dict[int, str] = {int(p): "deleted:op" for p in res["removed_ptrs"]}
+    snap.refresh()
+    leftover = [int(p) for p in ptrs if int(p) not in out]
+    # Fallback: nur Marker am Frame löschen (nicht den ganzen Track)
+    found = snap.resolve_tracks(leftover)
+    for p in leftover:
+        tr = found.get(p)
+        if tr is None:
+            out[p] = "failed"
+            continue
+        try:
+            tr.markers.delete_frame(int(frame_i))
+            ok, _m = _track_marker_at_frame(tr, frame_i)
+            out[p] = "failed" if ok else "deleted:marker"
+        except Exception as e:
+            log(f"[DISTANZE]   delete_frame(frame) failed for ptr={p}: {e}")
+            out[p] = "failed"
+    return out
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
+@traced()
 def run_distance_cleanup(
     context: bpy.types.Context,
     *,
@@ -168,7 +217,7 @@ def run_distance_cleanup(
       - verwendet ``baseline_ptrs`` als Menge der bestehenden Tracks;
         "neu" sind strikt alle Tracks, deren Pointer nicht in ``baseline_ptrs`` enthalten sind.
     """
-    clip = _resolve_clip(context)
+    clip = profiled_clip(_resolve_clip(context))
     if not clip:
         return {"status": "NO_CLIP", "frame": frame}
 
@@ -178,39 +227,26 @@ def run_distance_cleanup(
     #   neu = Track hat auf 'frame' einen Marker, der beim Funktionsstart SELECTED ist
     #   alt = Track hat auf 'frame' einen Marker, der NICHT selected ist
     #   (include_muted_old steuert nur, ob gemutete Alt-Tracks als Referenz zulässig sind)
-    tracking = getattr(clip, "tracking", None)
-    all_tracks = list(getattr(tracking, "tracks", []))
-
-    # Snapshot der Selektion (stabil gegenüber UI-Umschaltungen während des Laufs)
-    new_tracks = []
-    for t in all_tracks:
-        m = _marker_at_frame(t, frame)
-        # Neu = Marker-Selection ODER Track-Selection (Fallback für Detect)
-        if m and (
-            bool(getattr(m, "select", False))
-            or bool(getattr(t, "select", False))
-        ):
-            new_tracks.append(t)
-
-    old_tracks = []
-    for t in all_tracks:
-        m = _marker_at_frame(t, frame)
-        if not m:
-            continue  # kein Marker auf diesem Frame → irrelevant
-        # Alt = weder Marker-Selection noch Track-Selection
-        if not (
-            bool(getattr(m, "select", False))
-            or bool(getattr(t, "select", False))
-        ):
-            if include_muted_old or not bool(getattr(t, "mute", False)):
-                old_tracks.append(t)
+    # Snapshot statt Marker-Walk; Selektion frisch nachladen (ändert keine Markeranzahl)
+    snap = get_track_snapshot(clip)
+    if snap is None:
+        return {"status": "NO_CLIP", "frame": frame}
+    snap.reload_selection()
+    t_idx, m_idx = snap.markers_at_frame(int(frame))
+    # Neu = Marker-Selection ODER Track-Selection (Fallback für Detect)
+    is_new = snap.select[m_idx] | snap.track_select[t_idx]
+    old_ok = ~is_new
+    if not include_muted_old:
+        old_ok &= ~snap.track_mute[t_idx]
+    new_t, new_m = t_idx[is_new], m_idx[is_new]
+    old_t, old_m = t_idx[old_ok], m_idx[old_ok]
 
     classification_mode = "SELECTION_ONLY"
 
-    len_old_markers = len([_marker_at_frame(t, frame) for t in old_tracks])
-    len_new_markers = len([_marker_at_frame(t, frame) for t in new_tracks])
-    old_set = {int(t.as_pointer()) for t in old_tracks}
-    new_set = {int(t.as_pointer()) for t in new_tracks}
+    len_old_markers = int(old_t.size)
+    len_new_markers = int(new_t.size)
+    old_set = {int(p) for p in snap.track_ptrs[old_t]}
+    new_set = {int(p) for p in snap.track_ptrs[new_t]}
     old_cnt_m = len_old_markers
     new_cnt_m = len_new_markers
     skipped_new_no_marker = 0
@@ -239,10 +275,10 @@ def run_distance_cleanup(
         f"select_remaining_new={select_remaining_new}"
     )
     log(
-        f"[DISTANZE] Starting cleanup on frame {frame} with min_distance={min_distance} {distance_unit}; old tracks={len(old_tracks)}"
+        f"[DISTANZE] Starting cleanup on frame {frame} with min_distance={min_distance} {distance_unit}; old tracks={len(old_set)}"
     )
     log(
-        f"[DISTANZE] Found {len_old_markers} reference markers and {len(new_tracks)} new tracks to inspect."
+        f"[DISTANZE] Found {len_old_markers} reference markers and {len(new_set)} new tracks to inspect."
     )
 
     # ======= Kern: Distanzprüfung & Löschung (new_set vs. old_set) =======
@@ -259,25 +295,12 @@ def run_distance_cleanup(
     # Referenz-Koordinaten (old_set) am Frame sammeln
     width = int(getattr(clip, "size", (0, 0))[0] or 0)
     height = int(getattr(clip, "size", (0, 0))[1] or 0)
-    ref_coords = []
-    if width > 0 and height > 0:
-        for tr in clip.tracking.tracks:
-            try:
-                ptr = int(tr.as_pointer())
-                if ptr not in old_set:
-                    continue
-                ok, m = _track_marker_at_frame(tr, frame)
-                if not ok or not m:
-                    continue
-                if not include_muted_old and (getattr(m, "mute", False) or getattr(tr, "mute", False)):
-                    continue
-                # Marker-Koordinaten sind normalized (0..1); für Pixelabstand später mit width/height skalieren
-                ref_coords.append((float(m.co[0]), float(m.co[1])))
-            except Exception:
-                continue
+    if not include_muted_old:
+        old_m = old_m[~snap.mute[old_m]]
+    ref_co = snap.co[old_m].astype(np.float64)
 
     # Wenn keine Referenzen vorhanden sind, gibt es nichts zu vergleichen
-    if not ref_coords or width == 0 or height == 0:
+    if not ref_co.size or width == 0 or height == 0:
         log("[DISTANZE] No valid reference markers or clip size unknown; nothing to clean.")
         return {
             "status": "OK",
@@ -296,166 +319,57 @@ def run_distance_cleanup(
             "failed_removals": 0,
         }
 
-    # Helper zur Pixel-Distanz
-    def _px_dist(nco_a, nco_b) -> float:
-        dx = (float(nco_a[0]) - float(nco_b[0])) * width
-        dy = (float(nco_a[1]) - float(nco_b[1])) * height
-        return (dx * dx + dy * dy) ** 0.5
-
-
-    # Robuste Löschung via Operator + Verifikation; Fallback = Marker@Frame löschen
-    def _delete_track_or_marker(
-        tr: bpy.types.MovieTrackingTrack, ptr: int, frame_i: int
-    ) -> Tuple[bool, str]:
-        name = getattr(tr, "name", "<noname>")
-        # 0) Context für CLIP_EDITOR finden
-        win, area, region, space = _find_clip_editor_context(bpy.context, clip)
-        # 1) Alles deselektieren, Ziel selektieren
-        try:
-            for _t in clip.tracking.tracks:
-                _t.select = False
-            tr.select = True
-            ok_m, m = _track_marker_at_frame(tr, frame_i)
-            if ok_m and m:
-                try:
-                    m.select = True
-                except Exception:
-                    pass
-        except Exception as e:
-            log(f"[DISTANZE]   pre-select failed for {name} ({ptr}): {e}")
-        # 2) Operator-Aufruf mit Override
-        try:
-            override = {}
-            if win:
-                override["window"] = win
-                override["screen"] = win.screen
-            if area:
-                override["area"] = area
-            if region:
-                override["region"] = region
-            if space:
-                override["space_data"] = space
-            override["edit_movieclip"] = clip
-            # bevorzugt den übergebenen Context, fällt andernfalls auf bpy.context zurück
-            _ctx = context if hasattr(context, "temp_override") else bpy.context
-            with _ctx.temp_override(**override):
-                bpy.ops.clip.delete_track()
-        except Exception as e:
-            log(f"[DISTANZE]   bpy.ops.clip.delete_track() failed for {name} ({ptr}): {e}")
-        # 3) Verifikation nach Operator
-        try:
-            still = False
-            for _t in clip.tracking.tracks:
-                if int(getattr(_t, "as_pointer")()) == ptr or getattr(_t, "name", "") == name:
-                    still = True
-                    break
-            if not still:
-                return True, "deleted:op"
-        except Exception:
-            pass
-        # 4) Fallback: nur Marker am Frame löschen (nicht den ganzen Track)
-        try:
-            tr.markers.delete_frame(int(frame_i))
-            try:
-                m_chk = tr.markers.find_frame(int(frame_i), exact=True)
-            except TypeError:
-                m_chk = tr.markers.find_frame(int(frame_i))
-            if not m_chk:
-                return True, "deleted:marker"
-        except Exception as e:
-            log(f"[DISTANZE]   delete_frame(frame) failed for {name} ({ptr}): {e}")
-        return False, "failed"
+    # Nächster Nachbar aller neuen Marker in einem Durchlauf (Uniform-Grid)
+    scale = np.array((width, height), dtype=np.float64) if distance_unit == "pixel" else np.ones(2)
+    new_co = snap.co[new_m].astype(np.float64)
+    min_d = _grid_nearest_distance(ref_co * scale, new_co * scale, float(min_distance))
+    too_close = min_d < float(min_distance)
+    checked = int(new_m.size)
 
     # Vorab: mapping ptr->track für stabile Namenslogs auch nach evtl. Removals
-    ptr_to_name = {}
-    for _t in clip.tracking.tracks:
-        try:
-            ptr_to_name[int(getattr(_t, "as_pointer")())] = getattr(
-                _t, "name", "<noname>"
-            )
-        except Exception:
-            pass
-
-    # WICHTIG: Snapshot der "neuen" selektierten Kandidaten anlegen,
-    # damit require_selected_new NICHT vom späteren Deselektieren beeinflusst wird.
-    _new_selected_snapshot = set(new_set) if require_selected_new else set()
-    log(
-        f"[DISTANZE] Selection snapshot: size={len(new_tracks)} "
-        f"(require_selected_new={require_selected_new})"
-    )
-
-    # Iteration über neue Kandidaten
-    # Achtung: Wir arbeiten über Kopie der Trackliste, da wir ggf. Tracks entfernen.
-    for tr in list(clip.tracking.tracks):
-        try:
-            ptr = int(tr.as_pointer())
-            if ptr not in new_set:
-                continue
-
-            ok, m_new = _track_marker_at_frame(tr, frame)
-            if not ok or not m_new:
-                skipped_no_marker += 1
-                continue
-
-            # Gating ausschließlich gegen den Snapshot, NICHT gegen aktuellen Select-Status
-            if require_selected_new and (ptr not in _new_selected_snapshot):
-                skipped_unselected += 1
-                continue
-
-            checked += 1
-            nco = (float(m_new.co[0]), float(m_new.co[1]))
-
-            # Mindestabstand gegen alle Referenzen prüfen
-            too_close = False
-            min_found = 1e12
-            for rco in ref_coords:
-                d = (
-                    _px_dist(nco, rco)
-                    if distance_unit == "pixel"
-                    else ((nco[0] - rco[0]) ** 2 + (nco[1] - rco[1]) ** 2) ** 0.5
-                )
-                if d < min_found:
-                    min_found = d
-                if d < float(min_distance):
-                    too_close = True
-                    break
-
-            name = ptr_to_name.get(ptr, getattr(tr, "name", "<noname>"))
-            sel_state = f"Tsel={bool(getattr(tr,'select',False))}, Msel={bool(getattr(m_new,'select',False))}"
-            if too_close:
-                ok_del, how = _delete_track_or_marker(tr, ptr, frame)
-                if ok_del:
-                    removed += 1
-                    deleted_ptrs.append(ptr)
-                    if abs(min_found) < 1e-6:
-                        zero_px_deletes += 1
-                    else:
-                        below_thr_nonzero_deletes += 1
-                    log(
-                        f"[DISTANZE]   DELETE  ptr={ptr} name='{name}' min_d={min_found:.2f}px @f{frame}  ({sel_state}) → {how}"
-                    )
+    ptr_to_name = {int(p): snap.track_names[i] for i, p in enumerate(snap.track_ptrs)}
+    sel_track = snap.track_select[new_t]
+    sel_marker = snap.select[new_m]
+
+    # Pointer vor dem Löschen sichern: der Snapshot wird danach neu indiziert
+    new_ptr_arr = snap.track_ptrs[new_t].tolist()
+    doomed = [int(p) for p, c in zip(new_ptr_arr, too_close.tolist()) if c]
+    outcome = _delete_tracks_batch(context, clip, snap, doomed, int(frame)) if doomed else {}
+
+    for k, (ptr, close) in enumerate(zip(new_ptr_arr, too_close.tolist())):
+        ptr = int(ptr)
+        name = ptr_to_name.get(ptr, "<noname>")
+        dk = float(min_d[k])
+        sel_state = f"Tsel={bool(sel_track[k])}, Msel={bool(sel_marker[k])}"
+        if close:
+            how = outcome.get(ptr, "failed")
+            if how != "failed":
+                removed += 1
+                deleted_ptrs.append(ptr)
+                if abs(dk) < 1e-6:
+                    zero_px_deletes += 1
                 else:
-                    failed_removals += 1
-                    log(
-                        f"[DISTANZE]   FAILED  ptr={ptr} name='{name}' min_d={min_found:.2f}px @f{frame}  ({sel_state}) → could not remove"
-                    )
+                    below_thr_nonzero_deletes += 1
+                log(
+                    f"[DISTANZE]   DELETE  ptr={ptr} name='{name}' min_d={dk:.2f}px @f{frame}  ({sel_state}) → {how}"
+                )
             else:
-                kept += 1
+                failed_removals += 1
                 log(
-                    f"[DISTANZE]   KEEP    ptr={ptr} name='{name}' min_d={min_found:.2f}px @f{frame}  ({sel_state})"
+                    f"[DISTANZE]   FAILED  ptr={ptr} name='{name}' min_d={dk:.2f}px @f{frame}  ({sel_state}) → could not remove"
                 )
-        except Exception as e:
-            # Defensive: Fehler pro Track nicht fatal
-            log(f"[DISTANZE]   ERROR   ptr=? exception={e}")
-            continue
+        else:
+            kept += 1
+            log(
+                f"[DISTANZE]   KEEP    ptr={ptr} name='{name}' min_d={dk:.2f}px @f{frame}  ({sel_state})"
+            )
 
     # Optional: Verbleibende neue selektieren (UI-Komfort; kein Gate)
+    deleted_set = set(deleted_ptrs)
     if select_remaining_new:
-        for tr in clip.tracking.tracks:
+        keep_ptrs = [p for p in new_set if p not in deleted_set]
+        for tr in snap.resolve_tracks(keep_ptrs).values():
             try:
-                ptr = int(tr.as_pointer())
-                if ptr not in new_set:
-                    continue
                 ok, m = _track_marker_at_frame(tr, frame)
                 if not ok or not m:
                     continue
@@ -469,20 +383,12 @@ def run_distance_cleanup(
         log(f"[DISTANZE] Reselect remaining new: done.")
 
     # Post-Verification: existieren gelöschte Pointer noch? + Ist-Zustand zählen
-    still_present: list[Tuple[int, str]] = []
-    marker_count_frame = 0
-    try:
-        for _t in clip.tracking.tracks:
-            try:
-                if _track_marker_at_frame(_t, frame)[0]:
-                    marker_count_frame += 1
-                p = int(getattr(_t, "as_pointer")())
-                if p in deleted_ptrs:
-                    still_present.append((p, getattr(_t, "name", "<noname>")))
-            except Exception:
-                pass
-    except Exception:
-        pass
+    snap.refresh()
+    marker_count_frame = int(np.count_nonzero(snap.frame == int(frame)))
+    still_present: list[Tuple[int, str]] = [
+        (p, ptr_to_name.get(p, "<noname>")) for p in deleted_ptrs
+        if snap.index_of(p) is not None and outcome.get(p) == "deleted:op"
+    ]
 
     log(
         f"[DISTANZE] Cleanup complete: removed={removed}, kept={kept}, checked={checked}, "
@@ -500,7 +406,7 @@ def run_distance_cleanup(
         f"lt_thr_nonzero={below_thr_nonzero_deletes}, thr={min_distance}"
     )
 
-    survivors = [ptr for ptr in new_set if ptr not in set(deleted_ptrs)]
+    survivors = [ptr for ptr in new_set if ptr not in deleted_set]
     deleted_struct = [
         {"ptr": int(p), "track": ptr_to_name.get(p, None), "frame": int(frame)}
         for p in deleted_ptrs
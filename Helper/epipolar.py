@@ -0,0 +1,441 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/epipolar.py
+------------------
+Vorab-Prüfung, ob ``clip.solve_camera`` mit dem gewählten Keyframe-Paar
+überhaupt gelingen kann – bevor Solver-Zeit (bzw. der Solve-Timeout)
+verbraucht wird.
+
+Auf den Markern, die auf beiden Keyframes existieren, werden per RANSAC
+(vektorisiert: alle Stichproben als Batch-SVD) geschätzt:
+
+  - Fundamentalmatrix F (normalisierter 8-Punkt, Sampson-Fehler),
+  - Homographie H (normalisierter 4-Punkt-DLT, Transferfehler).
+
+Erklärt H nahezu alle F-Inlier und bleibt der Restfehler nach H unter der
+Parallaxe-Schwelle, ist die Konfiguration degeneriert (reine Rotation,
+zu wenig Parallaxe bzw. planare Szene): die Kamerabewegung ist aus dem Paar
+nicht bestimmbar. ``find_feasible_keyframes`` sucht dann entlang der
+``compute_parallax_scores``-Rangliste ein tragfähiges Paar (Re-Key).
+
+Koordinaten: normalisierte Marker-``co`` × ``clip.size`` (Pixel).
+
+Ausreißer-Vorfilter (ohne Solve): ``epipolar_track_residuals`` schätzt F für
+Frame-Paare ``(f, f + gap)`` entlang des Clips und sammelt je Track die
+Sampson-Distanzen. ``find_epipolar_outliers`` wählt Tracks, die in der Mehrheit
+ihrer Paare über der Pixel-Schwelle liegen; ``apply_epipolar_prefilter``
+markiert sie vor dem ersten Solve (Selektion). Löschen/Muten nur auf
+ausdrücklichen Wunsch: F wird auf verzeichneten Pixeln geschätzt, Randtracks
+mit radialer Verzeichnung fallen daher überproportional auf.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .track_snapshot import get_track_snapshot
+
+__all__ = (
+    "keyframe_correspondences",
+    "ransac_fundamental",
+    "ransac_homography",
+    "sampson_error",
+    "check_solve_feasibility",
+    "find_feasible_keyframes",
+    "epipolar_track_residuals",
+    "find_epipolar_outliers",
+    "apply_epipolar_prefilter",
+)
+
+_MIN_POINTS = 8
+
+
+# ---------------------------------------------------------------------------
+# Korrespondenzen
+# ---------------------------------------------------------------------------
+
+def _clip_size(clip) -> Tuple[float, float]:
+    try:
+        w, h = clip.size
+        if w > 0 and h > 0:
+            return float(w), float(h)
+    except Exception:
+        pass
+    return 1.0, 1.0
+
+
+def keyframe_correspondences(clip, frame_a: int, frame_b: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(pts_a (K,2), pts_b (K,2), Track-Indizes (K,)) aktiver Marker auf beiden Frames."""
+    snap = get_track_snapshot(clip, use_active_object=True)
+    empty = np.zeros((0, 2), dtype=np.float64)
+    if snap is None or not snap.n_markers:
+        return empty, empty, np.zeros(0, dtype=np.int64)
+    mask = snap.active_mask()
+    ta, ia = snap.markers_at_frame(int(frame_a), mask)
+    tb, ib = snap.markers_at_frame(int(frame_b), mask)
+    common, ka, kb = np.intersect1d(ta, tb, assume_unique=True, return_indices=True)
+    scale = np.array(_clip_size(clip), dtype=np.float64)
+    pa = snap.co[ia[ka]].astype(np.float64) * scale
+    pb = snap.co[ib[kb]].astype(np.float64) * scale
+    return pa, pb, common.astype(np.int64)
+
+
+# ---------------------------------------------------------------------------
+# Modelle
+# ---------------------------------------------------------------------------
+
+def _normalize(p: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Hartley-Normalisierung: Schwerpunkt 0, mittlerer Abstand √2."""
+    c = p.mean(axis=0)
+    d = np.sqrt(((p - c) ** 2).sum(axis=1)).mean()
+    s = np.sqrt(2.0) / d if d > 0 else 1.0
+    T = np.array([[s, 0.0, -s * c[0]], [0.0, s, -s * c[1]], [0.0, 0.0, 1.0]])
+    ph = np.column_stack((p, np.ones(len(p)))) @ T.T
+    return ph, T
+
+
+def _sample(rng, n: int, k: int, iters: int) -> np.ndarray:
+    """``iters`` Stichproben à ``k`` verschiedene Indizes aus ``range(n)``."""
+    return np.argpartition(rng.random((iters, n)), k - 1, axis=1)[:, :k]
+
+
+def _fit_fundamental(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """8-Punkt-Lösung(en) in normalisierten Koordinaten; a, b: (..., m, 3)."""
+    x1, y1 = a[..., 0], a[..., 1]
+    x2, y2 = b[..., 0], b[..., 1]
+    one = np.ones_like(x1)
+    A = np.stack((x2 * x1, x2 * y1, x2, y2 * x1, y2 * y1, y2, x1, y1, one), axis=-1)
+    F = np.linalg.svd(A)[2][..., -1, :].reshape(A.shape[:-2] + (3, 3))
+    U, S, Vt = np.linalg.svd(F)
+    S[..., 2] = 0.0  # Rang 2 erzwingen
+    return U @ (S[..., :, None] * Vt)
+
+
+def _fit_homography(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """DLT-Lösung(en) in normalisierten Koordinaten; a, b: (..., m, 3)."""
+    x, y = a[..., 0], a[..., 1]
+    u, v = b[..., 0], b[..., 1]
+    z = np.zeros_like(x)
+    o = np.ones_like(x)
+    r1 = np.stack((-x, -y, -o, z, z, z, u * x, u * y, u), axis=-1)
+    r2 = np.stack((z, z, z, -x, -y, -o, v * x, v * y, v), axis=-1)
+    A = np.concatenate((r1, r2), axis=-2)
+    return np.linalg.svd(A)[2][..., -1, :].reshape(A.shape[:-2] + (3, 3))
+
+
+def sampson_error(F: np.ndarray, pa: np.ndarray, pb: np.ndarray) -> np.ndarray:
+    """Sampson-Distanz (Pixel) für F (3,3) oder (H,3,3) → (n,) bzw. (H,n)."""
+    xa = np.column_stack((pa, np.ones(len(pa))))
+    xb = np.column_stack((pb, np.ones(len(pb))))
+    Fa = F @ xa.T                       # (..., 3, n)
+    Ftb = np.swapaxes(F, -1, -2) @ xb.T
+    num = (xb.T * Fa).sum(axis=-2) ** 2
+    den = Fa[..., 0, :] ** 2 + Fa[..., 1, :] ** 2 + Ftb[..., 0, :] ** 2 + Ftb[..., 1, :] ** 2
+    return np.sqrt(num / np.maximum(den, 1e-12))
+
+
+def _transfer_error(H: np.ndarray, pa: np.ndarray, pb: np.ndarray) -> np.ndarray:
+    xa = np.column_stack((pa, np.ones(len(pa))))
+    q = H @ xa.T                        # (..., 3, n)
+    w = q[..., 2, :]
+    w = np.where(np.abs(w) < 1e-12, 1e-12, w)
+    dx = q[..., 0, :] / w - pb[:, 0]
+    dy = q[..., 1, :] / w - pb[:, 1]
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def _ransac(pa, pb, k, fit, err, thresh, iters, seed):
+    n = len(pa)
+    if n < k:
+        return None, np.zeros(n, dtype=bool)
+    rng = np.random.default_rng(seed)
+    na, Ta = _normalize(pa)
+    nb, Tb = _normalize(pb)
+    idx = _sample(rng, n, k, int(iters))
+    models = fit(na[idx], nb[idx])
+    models = np.swapaxes(Tb, 0, 1) @ models @ Ta if fit is _fit_fundamental else np.linalg.inv(Tb) @ models @ Ta
+    inl = err(models, pa, pb) < thresh
+    best = int(np.argmax(inl.sum(axis=1)))
+    mask = inl[best]
+    if mask.sum() < k:
+        return models[best], mask
+    # Least-Squares-Refit auf allen Inliern
+    M = fit(na[mask][None], nb[mask][None])[0]
+    M = Tb.T @ M @ Ta if fit is _fit_fundamental else np.linalg.inv(Tb) @ M @ Ta
+    refit = err(M, pa, pb) < thresh
+    if refit.sum() >= mask.sum():
+        return M, refit
+    return models[best], mask
+
+
+def ransac_fundamental(pa, pb, *, thresh: float = 1.5, iters: int = 512, seed: int = 0):
+    """(F, Inlier-Maske) per RANSAC; F in Pixelkoordinaten (x_bᵀ F x_a = 0)."""
+    return _ransac(pa, pb, 8, _fit_fundamental, sampson_error, thresh, iters, seed)
+
+
+def ransac_homography(pa, pb, *, thresh: float = 2.0, iters: int = 256, seed: int = 0):
+    """(H, Inlier-Maske) per RANSAC; H bildet a → b ab (Pixel)."""
+    return _ransac(pa, pb, 4, _fit_homography, _transfer_error, thresh, iters, seed)
+
+
+# ---------------------------------------------------------------------------
+# Machbarkeit
+# ---------------------------------------------------------------------------
+
+def check_solve_feasibility(
+    clip,
+    frame_a: int,
+    frame_b: int,
+    *,
+    f_thresh: float = 1.5,
+    h_thresh: float = 2.0,
+    min_inlier_ratio: float = 0.5,
+    h_ratio_max: float = 0.9,
+    min_parallax_px: float = 2.0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Bewertet das Keyframe-Paar ``(frame_a, frame_b)`` vor dem Solve.
+
+    status:
+      OK            – F trägt, ausreichend Parallaxe
+      INSUFFICIENT  – weniger als 8 gemeinsame Marker
+      INCONSISTENT  – F erklärt weniger als ``min_inlier_ratio`` der Marker
+      DEGENERATE    – H erklärt ≥ ``h_ratio_max`` der F-Inlier und der mediane
+                      H-Restfehler liegt unter ``min_parallax_px`` (Rotation/
+                      zu wenig Parallaxe)
+    """
+    pa, pb, _tracks = keyframe_correspondences(clip, frame_a, frame_b)
+    n = int(len(pa))
+    out: Dict[str, Any] = {
+        "status": "OK",
+        "reason": "",
+        "keyframes": [int(frame_a), int(frame_b)],
+        "n": n,
+        "f_inliers": 0,
+        "h_inliers": 0,
+        "h_ratio": 0.0,
+        "parallax_px": 0.0,
+    }
+    if n < _MIN_POINTS:
+        out.update(status="INSUFFICIENT", reason=f"nur {n} gemeinsame Marker auf den Keyframes")
+        return out
+    _F, f_mask = ransac_fundamental(pa, pb, thresh=f_thresh, seed=seed)
+    H, h_mask = ransac_homography(pa, pb, thresh=h_thresh, seed=seed)
+    nf = int(f_mask.sum())
+    nh = int((h_mask & f_mask).sum())
+    out["f_inliers"] = nf
+    out["h_inliers"] = int(h_mask.sum())
+    out["h_ratio"] = round(nh / nf, 4) if nf else 0.0
+    if H is not None and nf:
+        out["parallax_px"] = round(float(np.median(_transfer_error(H, pa[f_mask], pb[f_mask]))), 4)
+    if nf < max(_MIN_POINTS, min_inlier_ratio * n):
+        out.update(status="INCONSISTENT", reason=f"F-Inlier {nf}/{n} – Marker widersprüchlich")
+    elif out["h_ratio"] >= h_ratio_max and out["parallax_px"] < min_parallax_px:
+        out.update(
+            status="DEGENERATE",
+            reason=(
+                f"Homographie erklärt {out['h_ratio']:.0%} der Inlier, Parallaxe "
+                f"{out['parallax_px']:.2f}px – reine Rotation/zu wenig Parallaxe"
+            ),
+        )
+    return out
+
+
+def find_feasible_keyframes(
+    clip,
+    scores: Sequence[Tuple[int, float]],
+    delta: int,
+    frame_range: Tuple[int, int],
+    *,
+    top: int = 4,
+    spreads: Iterable[int] = (1, 2, 4),
+    **kwargs,
+) -> Dict[str, Any]:
+    """Erstes tragfähiges Keyframe-Paar entlang der Parallaxe-Rangliste.
+
+    Probiert für die ``top`` besten Frames Paare ``(f - k·delta, f + k·delta)``.
+    Ohne Treffer: Ergebnis mit der kleinsten H-Quote (status != OK).
+    """
+    fs, fe = int(frame_range[0]), int(frame_range[1])
+    best: Optional[Dict[str, Any]] = None
+    tried = set()
+    for f, _score in list(scores)[: max(1, int(top))]:
+        for k in spreads:
+            a = max(fs, int(f - k * delta))
+            b = min(fe, int(f + k * delta))
+            if b <= a or (a, b) in tried:
+                continue
+            tried.add((a, b))
+            res = check_solve_feasibility(clip, a, b, **kwargs)
+            if res["status"] == "OK":
+                res["tried"] = len(tried)
+                return res
+            if best is None or (res["n"], -res["h_ratio"]) > (best["n"], -best["h_ratio"]):
+                best = res
+    if best is None:
+        best = {"status": "INSUFFICIENT", "reason": "keine Keyframe-Kandidaten", "keyframes": [fs, fe], "n": 0,
+                "f_inliers": 0, "h_inliers": 0, "h_ratio": 0.0, "parallax_px": 0.0}
+    best["tried"] = len(tried)
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Ausreißer-Vorfilter je Track (ohne Solve)
+# ---------------------------------------------------------------------------
+
+def _pair_frames(frame_range: Tuple[int, int], gap: int, max_pairs: int) -> np.ndarray:
+    """Startframes der Paare ``(f, f + gap)``, gleichmäßig über den Clip verteilt."""
+    fs, fe = int(frame_range[0]), int(frame_range[1]) - int(gap)
+    if fe < fs:
+        return np.zeros(0, dtype=np.int64)
+    n = min(int(max_pairs), fe - fs + 1)
+    return np.unique(np.rint(np.linspace(fs, fe, num=max(1, n))).astype(np.int64))
+
+
+def epipolar_track_residuals(
+    clip,
+    frame_range: Tuple[int, int],
+    *,
+    gap: int = 10,
+    max_pairs: int = 32,
+    px_thresh: float = 2.0,
+    f_thresh: float = 1.5,
+    iters: int = 256,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Sampson-Residuen je Track über Frame-Paare ``(f, f + gap)``.
+
+    Marker werden einmal nach Frame sortiert (Snapshot), die Korrespondenzen je
+    Paar per ``searchsorted`` geschnitten. Paare mit < 8 gemeinsamen Markern oder
+    ohne tragfähiges F (Inlier < 50 %) zählen als übersprungen.
+
+    Rückgabe (Arrays der Länge T = Anzahl Tracks im Snapshot)::
+        {"status", "pairs", "skipped", "track_ptrs", "track_names",
+         "seen", "outliers", "mean_px"}
+    """
+    snap = get_track_snapshot(clip, use_active_object=True)
+    t = int(snap.n_tracks) if snap is not None else 0
+    out: Dict[str, Any] = {
+        "status": "INSUFFICIENT",
+        "pairs": 0,
+        "skipped": 0,
+        "track_ptrs": snap.track_ptrs.copy() if t else np.zeros(0, dtype=np.int64),
+        "track_names": list(snap.track_names) if t else [],
+        "seen": np.zeros(t, dtype=np.int64),
+        "outliers": np.zeros(t, dtype=np.int64),
+        "mean_px": np.zeros(t, dtype=np.float64),
+    }
+    if not t or not snap.n_markers:
+        return out
+
+    idx = np.flatnonzero(snap.active_mask())
+    order = idx[np.argsort(snap.frame[idx], kind="stable")]
+    frames = snap.frame[order]
+    scale = np.array(_clip_size(clip), dtype=np.float64)
+    resid_sum = np.zeros(t, dtype=np.float64)
+
+    def _at(f: int) -> Tuple[np.ndarray, np.ndarray]:
+        lo, hi = np.searchsorted(frames, (f, f + 1))
+        ii = order[lo:hi]
+        return snap.marker_track[ii], ii
+
+    for f in _pair_frames(frame_range, gap, max_pairs):
+        ta, ia = _at(int(f))
+        tb, ib = _at(int(f) + int(gap))
+        common, ka, kb = np.intersect1d(ta, tb, assume_unique=True, return_indices=True)
+        if len(common) < _MIN_POINTS:
+            out["skipped"] += 1
+            continue
+        pa = snap.co[ia[ka]].astype(np.float64) * scale
+        pb = snap.co[ib[kb]].astype(np.float64) * scale
+        F, inl = ransac_fundamental(pa, pb, thresh=f_thresh, iters=iters, seed=seed + int(f))
+        if F is None or inl.sum() < max(_MIN_POINTS, 0.5 * len(common)):
+            out["skipped"] += 1
+            continue
+        err = sampson_error(F, pa, pb)
+        err = np.where(np.isfinite(err), err, np.inf)
+        out["seen"][common] += 1
+        out["outliers"][common] += err > float(px_thresh)
+        resid_sum[common] += np.minimum(err, 10.0 * float(px_thresh))
+        out["pairs"] += 1
+
+    seen = out["seen"]
+    out["mean_px"] = np.divide(resid_sum, seen, out=np.zeros(t, dtype=np.float64), where=seen > 0)
+    if out["pairs"]:
+        out["status"] = "OK"
+    return out
+
+
+def find_epipolar_outliers(
+    clip,
+    frame_range: Tuple[int, int],
+    *,
+    px_thresh: float = 2.0,
+    min_pairs: int = 3,
+    min_outlier_ratio: float = 0.5,
+    max_fraction: float = 0.2,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Tracks, deren Marker in ≥ ``min_outlier_ratio`` ihrer Paare die
+    Epipolarbedingung um mehr als ``px_thresh`` verletzen.
+
+    Höchstens ``max_fraction`` der geprüften Tracks (schlechteste zuerst), damit
+    ein falsch geschätztes F nicht den halben Clip entfernt.
+    """
+    res = epipolar_track_residuals(clip, frame_range, px_thresh=px_thresh, **kwargs)
+    seen, bad = res["seen"], res["outliers"]
+    out: Dict[str, Any] = {
+        "status": res["status"],
+        "pairs": int(res["pairs"]),
+        "skipped": int(res["skipped"]),
+        "checked": int((seen >= int(min_pairs)).sum()),
+        "px_thresh": float(px_thresh),
+        "ptrs": [],
+        "names": [],
+        "candidates": 0,
+    }
+    if res["status"] != "OK":
+        return out
+    ratio = np.divide(bad, seen, out=np.zeros(len(seen), dtype=np.float64), where=seen > 0)
+    cand = np.flatnonzero((seen >= int(min_pairs)) & (ratio >= float(min_outlier_ratio)))
+    out["candidates"] = int(cand.size)
+    limit = int(np.floor(float(max_fraction) * out["checked"]))
+    cand = cand[np.lexsort((-res["mean_px"][cand], -ratio[cand]))][:limit]
+    out["ptrs"] = res["track_ptrs"][cand].tolist()
+    out["names"] = [res["track_names"][i] for i in cand.tolist()]
+    return out
+
+
+def apply_epipolar_prefilter(clip, found: Dict[str, Any], *, action: str = "SELECT") -> Dict[str, Any]:
+    """Gefundene Tracks markieren (``"SELECT"``, Default), muten oder löschen.
+
+    ``"SELECT"`` ersetzt die Track-Selektion durch die Kandidaten; das
+    Entfernen bleibt dem normalen Cleanup überlassen.
+    """
+    action = str(action).upper()
+    ptrs = [int(p) for p in found.get("ptrs", ())]
+    out = {"action": action, "affected": 0}
+    if not ptrs:
+        return out
+    if action == "DELETE":
+        from .track_removal import remove_tracks
+
+        res = remove_tracks(clip, ptrs)
+        out["affected"] = int(res["removed"])
+        return out
+    want = set(ptrs)
+    tr = clip.tracking
+    obj = tr.objects.active
+    for trk in (obj.tracks if obj else tr.tracks):
+        try:
+            hit = int(trk.as_pointer()) in want
+            if action == "MUTE":
+                if hit:
+                    trk.mute = True
+            else:
+                trk.select = hit
+            out["affected"] += int(hit)
+        except Exception:
+            pass
+    return out
@@ -2,6 +2,11 @@
 import bpy
 from typing import Optional, Dict, Any, Tuple
 
+from .frame_coverage import get_frame_coverage
+from .track_snapshot import get_track_snapshot
+from .trace import traced
+from .rna_profile import profiled_clip
+
 __all__ = ("find_low_marker_frame_core", "run_find_low_marker_frame")
 
 # ---------------------------------------------------------------------------
@@ -142,17 +147,43 @@ def find_low_marker_frame_core(
     if fe < fs:
         fe = fs
 
+    # Standardfall: persistenter Frame-Index, Abfrage in O(log F)
+    if exact and ignore_muted_marker and ignore_muted_track:
+        try:
+            cov = get_frame_coverage(clip, fs, fe)
+            if cov is not None:
+                return cov.lowest_below(marker_basis, fs, fe)
+        except Exception:
+            pass
+
     lowest_frame: Optional[int] = None
     lowest_count: Optional[int] = None
 
+    # Histogramm einmalig aus dem Snapshot (statt find_frame je Track × Frame)
+    counts = None
+    if exact:
+        try:
+            snap = get_track_snapshot(clip)
+            if snap is not None:
+                counts = snap.frame_counts(
+                    fs, fe,
+                    ignore_muted_marker=ignore_muted_marker,
+                    ignore_muted_track=ignore_muted_track,
+                )
+        except Exception:
+            counts = None
+
     for f in range(fs, fe + 1):
-        n = _count_markers_on_frame(
-            clip,
-            f,
-            exact=exact,
-            ignore_muted_marker=ignore_muted_marker,
-            ignore_muted_track=ignore_muted_track,
-        )
+        if counts is not None:
+            n = int(counts[f - fs])
+        else:
+            n = _count_markers_on_frame(
+                clip,
+                f,
+                exact=exact,
+                ignore_muted_marker=ignore_muted_marker,
+                ignore_muted_track=ignore_muted_track,
+            )
 
         # nur Frames berücksichtigen, die unterhalb des Basiswerts liegen
         if n < marker_basis:
@@ -190,6 +221,7 @@ def _resolve_threshold_from_scene(
     return int(default_basis)
 
 
+@traced()
 def run_find_low_marker_frame(
     context,
     *,
@@ -206,6 +238,7 @@ def run_find_low_marker_frame(
     """
     try:
         clip, scn = _resolve_clip_and_scene(context)
+        clip = profiled_clip(clip)
         if not clip:
             return {"status": "FAILED", "reason": "Kein MovieClip im Kontext."}
 
@@ -42,6 +42,8 @@ from collections import defaultdict
 from typing import Dict, List, Tuple, Any, Optional
 import bpy
 
+from .frame_ops import sync_frame
+
 
 __all__ = ("run_find_max_error_frame",)
 
@@ -160,7 +162,7 @@ def run_find_max_error_frame(
         lo = max(clip_start, scene_start)
         hi = min(clip_end,   scene_end)
         bounded = max(lo, min(int(best_frame), hi))
-        scn.frame_set(int(bounded))
+        sync_frame(scn, int(bounded))
     except Exception:
         bounded = int(best_frame)
     result = {
@@ -3,6 +3,11 @@ from __future__ import annotations
 from typing import Optional, Dict, Any, List
 import bpy
 
+from .frame_coverage import get_frame_coverage
+from .track_snapshot import get_track_snapshot
+from .trace import traced
+from .rna_profile import profiled_clip
+
 __all__ = ["run_find_max_marker_frame"]
 
 # Scene-Flag, das vom Coordinator gesetzt wird, wenn der Spike-Cycle erschöpft ist
@@ -84,10 +89,21 @@ def _build_frame_counts(tracks, start_frame: int, end_frame: int) -> List[int]:
     return counts
 
 
+def _log_spike_finished(context) -> None:
+    """Terminal-Log, falls Spike-Zyklus als ausgereizt markiert wurde."""
+    try:
+        scn = getattr(context, 'scene', None)
+        if scn is not None and bool(scn.get(SPIKE_FLAG_SCENE_KEY, False)):
+            print('finish')
+    except Exception:
+        pass
+
+
 # ---------------------------------------------------------------------------
 # Öffentliche API
 # ---------------------------------------------------------------------------
 
+@traced()
 def run_find_max_marker_frame(
     context: bpy.types.Context,
     *,
@@ -101,7 +117,7 @@ def run_find_max_marker_frame(
     sowie der zugehörige Frame zurückgegeben, um heuristische Entscheidungen
     außerhalb zu erleichtern.
     """
-    clip = _get_active_clip(context)
+    clip = profiled_clip(_get_active_clip(context))
     if not clip:
         return {"status": "FAILED", "reason": "no active MovieClip"}
 
@@ -126,8 +142,39 @@ def run_find_max_marker_frame(
     if s_end < s_start:
         s_start, s_end = s_end, s_start
 
-    # Einmalig zählen → schnell
-    counts = _build_frame_counts(tracks, s_start, s_end)
+    # Persistenter Frame-Index: erster Frame ≤ threshold bzw. Minimum in O(log F)
+    cov = None
+    try:
+        cov = get_frame_coverage(clip, s_start, s_end, use_active_object=True)
+    except Exception:
+        cov = None
+    if cov is not None:
+        hit = cov.first_at_most(threshold, s_start, s_end)
+        if hit is not None:
+            return {
+                "status": "FOUND",
+                "frame": int(hit[0]),
+                "count": int(hit[1]),
+                "threshold": int(threshold),
+            }
+        out = {"status": "NONE", "threshold": int(threshold)}
+        if return_observed_min:
+            low = cov.range_min(s_start, s_end)
+            out.update({
+                "observed_min": int(low[1]) if low else 0,
+                "observed_min_frame": int(low[0]) if low else int(s_start),
+            })
+        _log_spike_finished(context)
+        return out
+
+    # Fallback: einmalig zählen (Snapshot; sonst Marker-Walk)
+    try:
+        snap = get_track_snapshot(clip, use_active_object=True)
+        counts = snap.frame_counts(s_start, s_end).tolist() if snap is not None else None
+    except Exception:
+        counts = None
+    if counts is None:
+        counts = _build_frame_counts(tracks, s_start, s_end)
 
     observed_min = None
     observed_min_frame = None
@@ -156,11 +203,6 @@ def run_find_max_marker_frame(
             "observed_min": int(observed_min or 0),
             "observed_min_frame": int(observed_min_frame or s_start),
         })
-    # Terminal-Log, falls Spike-Zyklus als ausgereizt markiert wurde
-    try:
-        scn = getattr(context, 'scene', None)
-        if scn is not None and bool(scn.get(SPIKE_FLAG_SCENE_KEY, False)):
-            print('finish')
-    except Exception:
-        pass
+    _log_spike_finished(context)
     return out
+
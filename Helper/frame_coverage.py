@@ -0,0 +1,270 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/frame_coverage.py
+------------------------
+Persistenter Zähler aktiver Marker je Frame für FIND_LOW / FIND_MAX.
+
+Der Index wird einmalig per ``np.bincount`` aus dem ``TrackSnapshot`` aufgebaut
+und danach nur noch über Deltas gepflegt: Beim Abgleich (``sync``) werden
+ausschließlich Tracks neu gezählt, deren Snapshot-Block oder Track-Mute sich
+geändert hat – also genau die Tracks, die Detect, Distanzé, Bidirectional-Track
+oder die Cleanup-Pässe angefasst haben.
+
+Über den Zählern liegt ein Minimum-Segmentbaum, sodass
+  - "niedrigster Frame unterhalb marker_basis" und
+  - "erster Frame mit count ≤ threshold"
+in O(log F) beantwortet werden, ohne den Clip neu zu scannen.
+
+Aktiv = Track nicht gemutet UND Marker nicht gemutet (wie bisher in
+``_count_markers_on_frame`` bzw. ``_build_frame_counts``).
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import bpy
+import numpy as np
+
+from .track_snapshot import TrackSnapshot, get_track_snapshot
+
+__all__ = (
+    "FrameCoverageIndex",
+    "get_frame_coverage",
+    "clear_frame_coverage",
+)
+
+_PAD = np.iinfo(np.int64).max
+
+
+class FrameCoverageIndex:
+    """Zähler je Frame in ``[frame_start..frame_end]`` plus Min-Segmentbaum."""
+
+    def __init__(self, frame_start: int, frame_end: int) -> None:
+        self.frame_start = int(frame_start)
+        self.frame_end = max(int(frame_end), int(frame_start))
+        n = self.frame_end - self.frame_start + 1
+        size = 1
+        while size < n:
+            size *= 2
+        self._n = n
+        self._size = size
+        self._tree = np.full(2 * size, _PAD, dtype=np.int64)
+        self._tree[size:size + n] = 0
+        self._rebuild_inner()
+        # ptr → (Block-Objekt, track_mute, aktive Frames) des letzten Abgleichs
+        self._seen: Dict[int, Tuple[object, bool, np.ndarray]] = {}
+        self.deltas_applied = 0
+
+    # ------------------------------------------------------------------
+    # Segmentbaum
+    # ------------------------------------------------------------------
+
+    def _rebuild_inner(self) -> None:
+        t = self._tree
+        lo = self._size
+        while lo > 1:
+            hi = lo
+            lo //= 2
+            np.minimum(t[2 * lo:2 * hi:2], t[2 * lo + 1:2 * hi:2], out=t[lo:hi])
+
+    def _update_leaves(self, leaf_idx: np.ndarray) -> None:
+        t = self._tree
+        idx = np.unique((np.asarray(leaf_idx, dtype=np.int64) + self._size) // 2)
+        while idx.size:
+            t[idx] = np.minimum(t[2 * idx], t[2 * idx + 1])
+            if idx[-1] <= 1:
+                break
+            idx = np.unique(idx // 2)
+
+    def _range_min(self, lo: int, hi: int) -> int:
+        """Minimum über Blätter [lo, hi] (inklusive)."""
+        t = self._tree
+        res = _PAD
+        lo += self._size
+        hi += self._size + 1
+        while lo < hi:
+            if lo & 1:
+                res = min(res, int(t[lo]))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                res = min(res, int(t[hi]))
+            lo //= 2
+            hi //= 2
+        return res
+
+    def _first_at_most(self, lo: int, hi: int, value: int) -> int:
+        """Kleinster Blattindex in [lo, hi] mit Wert ≤ value, sonst -1."""
+        t = self._tree
+        size = self._size
+
+        def descend(node: int, nlo: int, nhi: int) -> int:
+            if nhi < lo or nlo > hi or int(t[node]) > value:
+                return -1
+            if node >= size:
+                return node - size
+            mid = (nlo + nhi) // 2
+            r = descend(2 * node, nlo, mid)
+            if r >= 0:
+                return r
+            return descend(2 * node + 1, mid + 1, nhi)
+
+        return descend(1, 0, size - 1)
+
+    def _clamp(self, frame_start: int, frame_end: int) -> Optional[Tuple[int, int]]:
+        lo = max(int(frame_start), self.frame_start) - self.frame_start
+        hi = min(int(frame_end), self.frame_end) - self.frame_start
+        if hi < lo:
+            return None
+        return lo, hi
+
+    # ------------------------------------------------------------------
+    # Pflege
+    # ------------------------------------------------------------------
+
+    def covers(self, frame_start: int, frame_end: int) -> bool:
+        return self.frame_start <= int(frame_start) and int(frame_end) <= self.frame_end
+
+    def apply_delta(self, frames: np.ndarray, sign: int = 1) -> None:
+        """Addiert ``sign`` auf die Zähler der übergebenen Frames."""
+        f = np.asarray(frames, dtype=np.int64) - self.frame_start
+        f = f[(f >= 0) & (f < self._n)]
+        if not f.size:
+            return
+        uniq, cnt = np.unique(f, return_counts=True)
+        self._tree[self._size + uniq] += int(sign) * cnt
+        self._update_leaves(uniq)
+        self.deltas_applied += int(f.size)
+
+    def build(self, snapshot: TrackSnapshot) -> None:
+        """Vollaufbau per bincount aus dem Snapshot."""
+        self._seen.clear()
+        parts = []
+        for ptr, blk, t_mute in snapshot.iter_blocks():
+            frames = _active_frames(blk, t_mute)
+            self._seen[ptr] = (blk, t_mute, frames)
+            parts.append(frames)
+        leaves = np.zeros(self._n, dtype=np.int64)
+        if parts:
+            f = np.concatenate(parts).astype(np.int64) - self.frame_start
+            f = f[(f >= 0) & (f < self._n)]
+            leaves += np.bincount(f, minlength=self._n)
+        self._tree[self._size:self._size + self._n] = leaves
+        self._rebuild_inner()
+
+    def sync(self, snapshot: TrackSnapshot) -> int:
+        """Übernimmt Änderungen seit dem letzten Abgleich als Deltas.
+
+        Rückgabe: Anzahl der neu gezählten Tracks.
+        """
+        minus = []
+        plus = []
+        current = set()
+        changed = 0
+        for ptr, blk, t_mute in snapshot.iter_blocks():
+            current.add(ptr)
+            seen = self._seen.get(ptr)
+            if seen is not None and seen[0] is blk and seen[1] == t_mute:
+                continue
+            frames = _active_frames(blk, t_mute)
+            if seen is not None:
+                minus.append(seen[2])
+            plus.append(frames)
+            self._seen[ptr] = (blk, t_mute, frames)
+            changed += 1
+        for ptr in [p for p in self._seen if p not in current]:
+            minus.append(self._seen.pop(ptr)[2])
+            changed += 1
+        if minus:
+            self.apply_delta(np.concatenate(minus), -1)
+        if plus:
+            self.apply_delta(np.concatenate(plus), +1)
+        return changed
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def count(self, frame: int) -> int:
+        i = int(frame) - self.frame_start
+        if i < 0 or i >= self._n:
+            return 0
+        return int(self._tree[self._size + i])
+
+    def counts(self, frame_start: int, frame_end: int) -> np.ndarray:
+        rng = self._clamp(frame_start, frame_end)
+        if rng is None:
+            return np.zeros(0, dtype=np.int64)
+        lo, hi = rng
+        return self._tree[self._size + lo:self._size + hi + 1].copy()
+
+    def range_min(self, frame_start: int, frame_end: int) -> Optional[Tuple[int, int]]:
+        """(Frame, Count) des ersten Minimums im Bereich oder None."""
+        rng = self._clamp(frame_start, frame_end)
+        if rng is None:
+            return None
+        lo, hi = rng
+        m = self._range_min(lo, hi)
+        i = self._first_at_most(lo, hi, m)
+        return (self.frame_start + i, int(m)) if i >= 0 else None
+
+    def lowest_below(self, marker_basis: int, frame_start: int, frame_end: int) -> Optional[int]:
+        """Frame mit den wenigsten Markern, sofern dessen Anzahl < marker_basis."""
+        hit = self.range_min(frame_start, frame_end)
+        if hit is None or hit[1] >= int(marker_basis):
+            return None
+        return hit[0]
+
+    def first_at_most(self, threshold: int, frame_start: int, frame_end: int) -> Optional[Tuple[int, int]]:
+        """(Frame, Count) des ersten Frames mit count ≤ threshold oder None."""
+        rng = self._clamp(frame_start, frame_end)
+        if rng is None:
+            return None
+        lo, hi = rng
+        i = self._first_at_most(lo, hi, int(threshold))
+        if i < 0:
+            return None
+        return self.frame_start + i, int(self._tree[self._size + i])
+
+
+def _active_frames(blk, track_mute: bool) -> np.ndarray:
+    if track_mute:
+        return np.empty(0, dtype=np.int32)
+    return blk.frame[~blk.mute]
+
+
+# ---------------------------------------------------------------------------
+# Modulweiter Cache
+# ---------------------------------------------------------------------------
+
+_INDICES: Dict[Tuple[int, bool], FrameCoverageIndex] = {}
+
+
+def get_frame_coverage(
+    clip: bpy.types.MovieClip,
+    frame_start: int,
+    frame_end: int,
+    *,
+    use_active_object: bool = False,
+) -> Optional[FrameCoverageIndex]:
+    """Liefert einen aktuellen Index, der ``[frame_start..frame_end]`` abdeckt."""
+    snap = get_track_snapshot(clip, use_active_object=use_active_object)
+    if snap is None:
+        return None
+    key = (int(clip.as_pointer()), bool(use_active_object))
+    idx = _INDICES.get(key)
+    if idx is None or not idx.covers(frame_start, frame_end):
+        lo, hi = int(frame_start), int(frame_end)
+        if idx is not None:
+            lo, hi = min(lo, idx.frame_start), max(hi, idx.frame_end)
+        idx = FrameCoverageIndex(lo, hi)
+        idx.build(snap)
+        _INDICES[key] = idx
+    else:
+        idx.sync(snap)
+    return idx
+
+
+def clear_frame_coverage() -> None:
+    """Verwirft alle Indizes (z. B. beim Start eines neuen Laufs)."""
+    _INDICES.clear()
@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/frame_ops.py
+-------------------
+Frame-freier Ausführungsmodus für Marker-Helfer.
+
+Marker werden über explizite Frames gelesen/geschrieben
+(``markers.find_frame(f)``, ``markers.insert_frame(f)``); dafür braucht es
+weder ``scene.frame_set`` noch ``view_layer.update`` – beide werten den
+kompletten Depsgraph aus. Clip-Operatoren (detect/refine/delete_marker/
+track_markers) arbeiten dagegen auf dem Clip-User-Frame des Editors, der nur
+über das New-Frame-Update von ``frame_set`` nachgezogen wird
+(``MovieClipUser.frame_current`` ist in RNA read-only). Vor jedem
+Clip-Operator ist daher ``sync_frame(..., need_depsgraph=True)`` Pflicht.
+
+Im Modus (Scene-Key ``tco_frame_free``, Default an):
+
+  - ``sync_frame`` setzt für reine Datenzugriffe nur ``frame_current``
+    (falls abweichend),
+  - ``flush_view_layer`` / ``deps_sync`` entfallen,
+  - ``frame_set`` nur noch mit ``need_depsgraph=True`` (Operator braucht
+    tatsächlich ausgewertete Szenendaten).
+
+Jede vermiedene Auswertung wird je Coordinator-Phase gezählt
+(``set_frame_phase``, ``frame_ops_stats``).
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import bpy
+
+from .update_coalescer import request_depsgraph_update, request_view_layer_update
+
+__all__ = (
+    "frame_free_enabled",
+    "set_frame_phase",
+    "sync_frame",
+    "flush_view_layer",
+    "deps_sync",
+    "count_avoided",
+    "frame_ops_stats",
+    "reset_frame_ops_stats",
+)
+
+_SCENE_KEY = "tco_frame_free"
+
+_STATE: Dict[str, Any] = {"phase": "IDLE"}
+# Phase → {"avoided": n, "evaluated": n}
+_STATS: Dict[str, Dict[str, int]] = {}
+
+
+def frame_free_enabled(scene=None) -> bool:
+    scn = scene if scene is not None else getattr(bpy.context, "scene", None)
+    try:
+        return bool(scn.get(_SCENE_KEY, True)) if scn is not None else True
+    except Exception:
+        return True
+
+
+def set_frame_phase(phase: str) -> None:
+    """Phasenlabel für die Zählung (vom Coordinator je Schritt gesetzt)."""
+    _STATE["phase"] = str(phase)
+
+
+def _bump(key: str, n: int = 1) -> None:
+    st = _STATS.setdefault(_STATE["phase"], {"avoided": 0, "evaluated": 0})
+    st[key] += int(n)
+
+
+def count_avoided(n: int = 1) -> None:
+    """Vermiedene Depsgraph-Auswertungen (z. B. entfallene Warte-Schleifen)."""
+    _bump("avoided", n)
+
+
+def sync_frame(scene, frame: Optional[int] = None, *, need_depsgraph: bool = False) -> int:
+    """Ersetzt ``scene.frame_set(frame)``.
+
+    Frame-frei: nur ``frame_current`` setzen (falls abweichend); die
+    Auswertung wird als vermieden gezählt. Nur für reine Datenzugriffe –
+    der Clip-User-Frame des Editors bleibt dabei stehen. Sonst bzw. mit
+    ``need_depsgraph=True`` (Pflicht vor Clip-Operatoren): echtes
+    ``frame_set``.
+    """
+    f = int(scene.frame_current if frame is None else frame)
+    if need_depsgraph or not frame_free_enabled(scene):
+        scene.frame_set(f)
+        _bump("evaluated")
+        return f
+    if int(scene.frame_current) != f:
+        scene.frame_current = f
+    _bump("avoided")
+    return f
+
+
+def flush_view_layer(context=None) -> None:
+    """Ersetzt ``view_layer.update()``; frame-frei ein gezählter No-Op, sonst gebündelt."""
+    ctx = context or bpy.context
+    if frame_free_enabled(getattr(ctx, "scene", None)):
+        _bump("avoided")
+        return
+    request_view_layer_update(ctx)
+    _bump("evaluated")
+
+
+def deps_sync(context) -> None:
+    """Depsgraph-Update + View-Layer + Frame-Refresh (nur außerhalb des Modus)."""
+    if frame_free_enabled(context.scene):
+        _bump("avoided", 3)
+        return
+    # frame_set(frame_current) ist nur ein weiteres Depsgraph-Update → gebündelt
+    request_depsgraph_update(context)
+    request_view_layer_update(context)
+    _bump("evaluated", 3)
+
+
+def frame_ops_stats() -> Dict[str, Any]:
+    total = {"avoided": 0, "evaluated": 0}
+    for st in _STATS.values():
+        total["avoided"] += st["avoided"]
+        total["evaluated"] += st["evaluated"]
+    return {"phases": {k: dict(v) for k, v in _STATS.items()}, **total}
+
+
+def reset_frame_ops_stats() -> None:
+    _STATS.clear()
+    _STATE["phase"] = "IDLE"
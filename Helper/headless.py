@@ -0,0 +1,250 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/headless.py
+------------------
+Headless-Betrieb (``blender -b``) für den Tracking-Coordinator.
+
+Im Background-Modus gibt es weder Fenster noch Timer-Events; die Helfer finden
+über ``window_manager.windows`` keinen CLIP_EDITOR. Der Coordinator läuft
+deshalb synchron über dieselben Phasenfunktionen und alle Operatoren innerhalb
+EINES ``temp_override`` auf eine CLIP_EDITOR-Area aus ``bpy.data.screens``
+(``headless_clip_override``). Existiert im .blend keine solche Area, wird eine
+vorhandene Area für die Dauer des Laufs temporär umgeschaltet.
+
+``HeadlessRun`` sammelt Laufzeitdaten (Phasen, Zyklen, Dauer) und schreibt am
+Ende eine JSON-Zusammenfassung.
+
+Aufruf auf Render-Nodes (Add-on aktiviert)::
+
+    blender -b shot.blend --python-expr "import bpy; \\
+        bpy.ops.clip.kaiserlich_coordinator_launcher(summary_path='//tco_summary.json'); \\
+        bpy.ops.wm.save_mainfile()"
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import bpy
+
+__all__ = (
+    "is_headless",
+    "headless_clip_override",
+    "active_clip_override",
+    "HeadlessRun",
+    "write_summary",
+    "DEFAULT_SUMMARY_PATH",
+)
+
+DEFAULT_SUMMARY_PATH = "//kaiserlich_headless_summary.json"
+
+# Aktuell aktiver Headless-Override (leer außerhalb von headless_clip_override)
+_ACTIVE: Dict[str, Any] = {}
+
+
+def is_headless() -> bool:
+    """True im Background-Modus (``blender -b``)."""
+    return bool(getattr(bpy.app, "background", False))
+
+
+# ---------------------------------------------------------------------------
+# Synthetischer CLIP_EDITOR-Override
+# ---------------------------------------------------------------------------
+
+def _resolve_clip(context) -> Optional[bpy.types.MovieClip]:
+    clip = getattr(context, "edit_movieclip", None)
+    if clip is None:
+        clip = getattr(getattr(context, "space_data", None), "clip", None)
+    if clip is None and bpy.data.movieclips:
+        clip = bpy.data.movieclips[0]
+    return clip
+
+
+def active_clip_override() -> Dict[str, Any]:
+    """Kopie des aktiven Headless-Overrides (für Helfer ohne Fenster-Fund)."""
+    return dict(_ACTIVE)
+
+
+def _find_area():
+    """(screen, area, umgeschaltet?) – bevorzugt eine echte CLIP_EDITOR-Area."""
+    candidate = None
+    for scr in bpy.data.screens:
+        for area in scr.areas:
+            if area.type == "CLIP_EDITOR":
+                return scr, area, False
+            if candidate is None and any(r.type == "WINDOW" for r in area.regions):
+                candidate = (scr, area)
+    if candidate is None:
+        return None, None, False
+    return candidate[0], candidate[1], True
+
+
+@contextmanager
+def headless_clip_override(context, clip=None) -> Iterator[Dict[str, Any]]:
+    """Aktiviert einen ``temp_override`` auf einen CLIP_EDITOR mit ``clip``.
+
+    Liefert das Override-Dict (leer, falls kein Clip/keine Area vorhanden ist;
+    dann laufen die Operatoren im unveränderten Kontext). Clip, Modus und ggf.
+    der Area-Typ werden beim Verlassen wiederhergestellt.
+    """
+    clip = clip or _resolve_clip(context)
+    scr, area, switched = _find_area() if clip is not None else (None, None, False)
+    if area is None:
+        yield {}
+        return
+
+    prev_type = area.type
+    space = None
+    prev_clip = None
+    prev_mode = None
+    try:
+        if switched:
+            area.type = "CLIP_EDITOR"
+        space = area.spaces.active
+        prev_clip = getattr(space, "clip", None)
+        prev_mode = getattr(space, "mode", None)
+        space.clip = clip
+        try:
+            space.mode = "TRACKING"
+        except Exception:
+            pass
+        region = next((r for r in area.regions if r.type == "WINDOW"), None)
+        ov = {
+            "screen": scr,
+            "area": area,
+            "region": region,
+            "space_data": space,
+            "scene": context.scene,
+            "edit_movieclip": clip,
+        }
+        with bpy.context.temp_override(**ov):
+            _ACTIVE.update(ov)
+            yield ov
+    finally:
+        _ACTIVE.clear()
+        if space is not None:
+            try:
+                space.clip = prev_clip
+                if prev_mode is not None:
+                    space.mode = prev_mode
+            except Exception:
+                pass
+        if switched:
+            try:
+                area.type = prev_type
+            except Exception:
+                pass
+
+
+# ---------------------------------------------------------------------------
+# Laufzeit-Protokoll + JSON-Zusammenfassung
+# ---------------------------------------------------------------------------
+
+def _jsonable(value: Any) -> Any:
+    """IDProperties/RNA-Arrays rekursiv in JSON-taugliche Werte wandeln."""
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    elif hasattr(value, "to_list"):
+        value = value.to_list()
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _clip_summary(clip) -> Dict[str, Any]:
+    if clip is None:
+        return {}
+    tr = clip.tracking
+    tracks = tr.objects.active.tracks if tr.objects.active else tr.tracks
+    rec = tr.reconstruction
+    cam = tr.camera
+    return {
+        "name": clip.name,
+        "frame_start": int(getattr(clip, "frame_start", 1)),
+        "frame_duration": int(getattr(clip, "frame_duration", 0)),
+        "tracks": len(tracks),
+        "markers": sum(len(t.markers) for t in tracks),
+        "reconstruction": {
+            "valid": bool(getattr(rec, "is_valid", False)),
+            "cameras": len(getattr(rec, "cameras", [])),
+            "average_error": float(getattr(rec, "average_error", 0.0)),
+        },
+        "camera": {
+            "distortion_model": str(getattr(cam, "distortion_model", "")),
+            "focal_length": float(getattr(cam, "focal_length", 0.0)),
+        },
+    }
+
+
+class HeadlessRun:
+    """Sammelt Phasenschritte eines synchronen Coordinator-Laufs."""
+
+    def __init__(self) -> None:
+        self.t0 = time.perf_counter()
+        self.started = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.steps = 0
+        self.cycles = 0
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.transitions = 0
+
+    def record(self, phase: str, dt: float, next_phase: str) -> None:
+        self.steps += 1
+        ph = self.phases.setdefault(phase, {"steps": 0, "sec": 0.0})
+        ph["steps"] += 1
+        ph["sec"] += float(dt)
+        base = phase.split(":", 1)[0]
+        if next_phase != base:
+            self.transitions += 1
+            if base in ("BIDI", "SPIKE_CYCLE") and next_phase == "FIND_LOW":
+                self.cycles += 1
+
+    def to_dict(self, context, *, status: str, info: Optional[str], clip=None) -> Dict[str, Any]:
+        scn = context.scene
+        try:
+            clip_info = _clip_summary(clip or _resolve_clip(context))
+        except Exception as exc:
+            clip_info = {"error": str(exc)}
+        return {
+            "status": status,
+            "info": info,
+            "blend": bpy.data.filepath,
+            "blender": bpy.app.version_string,
+            "started": self.started,
+            "wall_sec": round(time.perf_counter() - self.t0, 3),
+            "steps": self.steps,
+            "cycles": self.cycles,
+            "phases": {k: {"steps": int(v["steps"]), "sec": round(v["sec"], 3)} for k, v in self.phases.items()},
+            "transitions": self.transitions,
+            "clip": clip_info,
+            "solve_eval": _jsonable(scn.get("tco_last_solve_eval")),
+            "solve_farm": _jsonable(scn.get("tco_last_solve_farm")),
+            "detect_threshold": _jsonable(scn.get("tco_detect_thr")),
+            "marker_count": _jsonable(scn.get("tco_last_marker_count")),
+            "frame_ops": _jsonable(scn.get("tco_last_frame_ops")),
+            "update_coalescer": _jsonable(scn.get("tco_last_update_coalescer")),
+            "trace": _jsonable(scn.get("tco_last_trace")),
+            "rna_profile": _jsonable(scn.get("tco_last_rna_profile")),
+        }
+
+
+def write_summary(path: Optional[str], data: Dict[str, Any]) -> Optional[str]:
+    """Schreibt ``data`` als JSON nach ``path`` (``//`` = relativ zur .blend)."""
+    target = bpy.path.abspath(path or DEFAULT_SUMMARY_PATH)
+    if not bpy.data.filepath and target.startswith("//"):
+        target = os.path.join(os.getcwd(), target[2:])
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        with open(target, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2, default=str)
+    except Exception as exc:
+        print(f"[Headless] Summary konnte nicht geschrieben werden: {exc!r}")
+        return None
+    print(f"[Headless] Summary → {target}")
+    return target
@@ -1,6 +1,10 @@
 import bpy
+import numpy as np
 from typing import Optional, Dict, Any, Tuple
 
+from .clip_context import find_clip_editor
+from .trace import traced
+
 __all__ = ("run_jump_to_frame", "jump_to_frame")  # jump_to_frame = Legacy-Wrapper
 REPEAT_SATURATION = 10  # Ab dieser Wiederholungsanzahl: Optimizer anstoßen statt Detect
 
@@ -19,33 +23,32 @@ def _clamp(v: int, lo: int = 0, hi: int | None = None) -> int:
     return lo if v < lo else (hi if v > hi else v)
 
 
-def _spread_repeat_to_neighbors(repeat_map: dict[int, int], center_f: int, radius: int, base: int) -> None:
-    # Neu: stufiger Fade: nur alle FADE_STEP_FRAMES -1
-    for off in range(-radius, radius + 1):
-        f = center_f + off
-        if f < 0:
-            continue
-        # Decrement nur in 5er-Schritten: 0..4 → 0, 5..9 → 1, 10..14 → 2, ...
-        dec = abs(off) // FADE_STEP_FRAMES  # stufig (neu)
-        v = base - dec
-        if v <= 0:
-            continue
-        # nur erhöhen, nie verringern
-        cur = repeat_map.get(f, 0)
-        if v > cur:
-            repeat_map[f] = v
-
-
 def diffuse_repeat_counts(repeat_map: dict[int, int], radius: int) -> dict[int, int]:
     """
     Breitet Wiederholungszähler auf Nachbarframes aus, mit stufigem Fade
-    (alle FADE_STEP_FRAMES Frames -1).
+    (alle FADE_STEP_FRAMES Frames -1). Vektorisierter Stencil; Werte werden
+    nur erhöht, nie verringert (Maximum über alle Zentren).
     """
     if not repeat_map or radius <= 0:
         return repeat_map
     out = dict(repeat_map)
-    for center_f, base in repeat_map.items():
-        _spread_repeat_to_neighbors(out, center_f, radius, base)
+    centers = np.fromiter(repeat_map.keys(), dtype=np.int64, count=len(repeat_map))
+    bases = np.fromiter(repeat_map.values(), dtype=np.int64, count=len(repeat_map))
+    offs = np.arange(-int(radius), int(radius) + 1, dtype=np.int64)
+    # Decrement nur in 5er-Schritten: 0..4 → 0, 5..9 → 1, 10..14 → 2, ...
+    frames = (centers[:, None] + offs[None, :]).ravel()
+    vals = (bases[:, None] - (np.abs(offs) // FADE_STEP_FRAMES)[None, :]).ravel()
+    keep = (frames >= 0) & (vals > 0)
+    frames, vals = frames[keep], vals[keep]
+    if not frames.size:
+        return out
+    lo = int(frames.min())
+    best = np.zeros(int(frames.max()) - lo + 1, dtype=np.int64)
+    np.maximum.at(best, frames - lo, vals)
+    for i in np.flatnonzero(best).tolist():
+        f, v = i + lo, int(best[i])
+        if v > out.get(f, 0):
+            out[f] = v
     return out
 
 
@@ -87,17 +90,17 @@ def _clip_end(clip: bpy.types.MovieClip, scn: bpy.types.Scene) -> int:
 def _find_clip_area(win) -> Tuple[Optional[bpy.types.Area], Optional[bpy.types.Region]]:
     if not win or not getattr(win, "screen", None):
         return None, None
-    for area in win.screen.areas:
-        if area.type == 'CLIP_EDITOR':
-            reg = next((r for r in area.regions if r.type == 'WINDOW'), None)
-            return area, reg
-    return None, None
+    ov = find_clip_editor(window=win)
+    if not ov:
+        return None, None
+    return ov["area"], ov["region"]
 
 
 # -----------------------------------------------------------------------------
 # Core
 # -----------------------------------------------------------------------------
 
+@traced()
 def run_jump_to_frame(
     context,
     *,
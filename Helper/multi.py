@@ -7,6 +7,12 @@ import bpy
 import math
 from typing import Iterable, Set, Dict, Any, Optional, Tuple, List
 
+from .clip_context import run_in_clip_context
+from .frame_ops import flush_view_layer
+from .update_coalescer import request_window_swap
+from .trace import traced
+from .rna_profile import profiled_clip
+
 __all__ = ["run_multi_pass"]
 
 # ------------------------------------------------------------
@@ -87,27 +93,7 @@ def _select_ptrs_at_frame(clip: bpy.types.MovieClip, frame: int, ptrs: Iterable[
 # Wiederholungszählers (count) unterschiedliche Pattern-Scans fahren.
 
 def _run_in_clip_context(op_callable, **kwargs):
-    wm = bpy.context.window_manager
-    if wm:
-        for window in wm.windows:
-            screen = window.screen
-            if not screen:
-                continue
-            for area in screen.areas:
-                if area.type == "CLIP_EDITOR":
-                    region = next((r for r in area.regions if r.type == "WINDOW"), None)
-                    space = area.spaces.active if hasattr(area, "spaces") else None
-                    if region and space:
-                        override = {
-                            "window": window,
-                            "area": area,
-                            "region": region,
-                            "space_data": space,
-                            "scene": bpy.context.scene,
-                        }
-                        with bpy.context.temp_override(**override):
-                            return op_callable(**kwargs)
-    return op_callable(**kwargs)
+    return run_in_clip_context(op_callable, **kwargs)
 
 def _set_pattern_size(tracking: bpy.types.MovieTracking, new_size: int) -> int:
     s = tracking.settings
@@ -289,10 +275,7 @@ def _run_multi_core(
     for t in tracking.tracks:
         t.select = (t.as_pointer() in new_ptrs)
 
-    try:
-        bpy.ops.wm.redraw_timer(type="DRAW_WIN_SWAP", iterations=1)
-    except Exception:
-        pass
+    request_window_swap()
 
     return {
         "status": "READY",
@@ -307,6 +290,7 @@ def _run_multi_core(
     }
 
 
+@traced()
 def run_multi_pass(context: bpy.types.Context, *, frame: Optional[int] = None, **kwargs) -> Dict[str, Any]:
     """
     Führt Multi aus, ohne den Detect-Cycle/Koordinator zu koppeln.
@@ -314,7 +298,7 @@ def run_multi_pass(context: bpy.types.Context, *, frame: Optional[int] = None, *
     - Delta der neu entstandenen Tracks ermitteln
     - Selektion @frame = (Detect-Snapshot ∪ Multi-Neuzugänge)
     """
-    clip = _resolve_clip(context)
+    clip = profiled_clip(_resolve_clip(context))
     if not clip:
         return {"status": "NO_CLIP"}
 
@@ -335,10 +319,7 @@ def run_multi_pass(context: bpy.types.Context, *, frame: Optional[int] = None, *
     _clear_selection_at_frame(clip, frame)
     _select_ptrs_at_frame(clip, frame, pre_selected_ptrs.union(new_multi_ptrs))
 
-    try:
-        context.view_layer.update()
-    except Exception:
-        pass
+    flush_view_layer(context)
 
     core_res.update({
         "status": core_res.get("status", "OK"),
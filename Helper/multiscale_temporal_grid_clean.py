@@ -2,6 +2,9 @@ import bpy
 import statistics
 import math
 
+from .track_snapshot import get_track_snapshot
+from .update_coalescer import request_redraw
+
 def multiscale_temporal_grid_clean(
     context, area, region, space, tracks, frame_range,
     width, height, grid=(6, 6),
@@ -40,15 +43,54 @@ def multiscale_temporal_grid_clean(
     frame_start, frame_end = int(frame_range[0]), int(frame_range[1])
 
     # --- Helpers (lokal) ---
+    # Markerpositionen aus dem Snapshot: pro Track ein Dict frame → Markerindex,
+    # das bei Löschungen mitgeführt wird (statt find_frame je Track/Frame).
+    snap = get_track_snapshot(clip)
+    co_arr = snap.co if snap is not None else None
+    frame_maps = {}
+
+    def fmap(t):
+        k = t.name
+        d = frame_maps.get(k)
+        if d is None:
+            d = {}
+            ti = snap.index_of(t.as_pointer()) if snap is not None else None
+            if ti is not None:
+                sl = snap.track_slice(ti)
+                d = dict(zip(snap.frame[sl].tolist(), range(sl.start, sl.stop)))
+            else:
+                d = None
+            frame_maps[k] = d
+        return d
+
+    def co_at(t, f):
+        d = fmap(t)
+        if d is None:
+            m = t.markers.find_frame(f)
+            return (m.co[0], m.co[1]) if m else None
+        j = d.get(f)
+        if j is None:
+            return None
+        return (float(co_arr[j, 0]), float(co_arr[j, 1]))
+
+    def delete_at(t, f):
+        if co_at(t, f) is None:
+            return False
+        t.markers.delete_frame(f)
+        d = fmap(t)
+        if d is not None:
+            d.pop(f, None)
+        return True
+
     pos_cache = {}
 
     def pos(t, f):
         k = (t.name, f)
         if k in pos_cache:
             return pos_cache[k]
-        m = t.markers.find_frame(f)
-        if m:
-            xy = (m.co[0] * width, m.co[1] * height)
+        c = co_at(t, f)
+        if c:
+            xy = (c[0] * width, c[1] * height)
             pos_cache[k] = xy
             return xy
         return None
@@ -135,13 +177,9 @@ def multiscale_temporal_grid_clean(
                 if not t:
                     continue
                 for f in sorted(frames):
-                    if t.markers.find_frame(f):
-                        t.markers.delete_frame(f)
+                    if delete_at(t, f):
                         deleted_coarse += 1
-            try:
-                region.tag_redraw()
-            except Exception:
-                pass
+            request_redraw(region)
 
     # --- Phase C: Micro-Pass (hypot + MAD) ---
     def _micro_outlier_pass():
@@ -159,17 +197,17 @@ def multiscale_temporal_grid_clean(
             for fi in range(frame_start + 1, frame_end - 1):
                 buckets = {}
                 for tr in tracks:
-                    m1 = tr.markers.find_frame(fi - 1)
-                    m2 = tr.markers.find_frame(fi)
-                    m3 = tr.markers.find_frame(fi + 1)
+                    m1 = co_at(tr, fi - 1)
+                    m2 = co_at(tr, fi)
+                    m3 = co_at(tr, fi + 1)
                     if not (m1 and m2 and m3):
                         continue
-                    x = m2.co[0] * width
-                    y = m2.co[1] * height
+                    x = m2[0] * width
+                    y = m2[1] * height
                     cx = min(gx - 1, max(0, int(x // cell_w)))
                     cy = min(gy - 1, max(0, int(y // cell_h)))
-                    vx = (m2.co[0] - m1.co[0]) + (m3.co[0] - m2.co[0])
-                    vy = (m2.co[1] - m1.co[1]) + (m3.co[1] - m2.co[1])
+                    vx = (m2[0] - m1[0]) + (m3[0] - m2[0])
+                    vy = (m2[1] - m1[1]) + (m3[1] - m2[1])
                     buckets.setdefault((cx, cy), []).append((tr, fi, vx, vy))
 
                 for _, items in buckets.items():
@@ -182,13 +220,9 @@ def multiscale_temporal_grid_clean(
                     for (tr, f, vx, vy), mag in zip(items, v_mags):
                         if mag > thr:
                             for ff in (f - 1, f, f + 1):
-                                if tr.markers.find_frame(ff):
-                                    tr.markers.delete_frame(ff)
+                                if delete_at(tr, ff):
                                     deleted += 1
-            try:
-                region.tag_redraw()
-            except Exception:
-                pass
+            request_redraw(region)
         return deleted
 
     deleted_micro = _micro_outlier_pass()
@@ -1,10 +1,19 @@
 # Helper/mute_ops.py
 from .segments import get_track_segments
+from .track_snapshot import invalidate_track_snapshot
 try:
     import bpy
 except Exception:
     bpy = None
 
+
+def _notify_snapshot(track):
+    """Mute ändert die Markeranzahl nicht → Snapshot-Eintrag des Tracks verwerfen."""
+    try:
+        invalidate_track_snapshot(track.id_data, (track.as_pointer(),))
+    except Exception:
+        pass
+
 def mute_marker_path(track, from_frame, direction, mute=True):
     """Mutes/unmutes markers on a track forward/backward from a frame."""
     try:
@@ -23,6 +32,8 @@ def mute_marker_path(track, from_frame, direction, mute=True):
             continue
         except Exception:
             continue
+    if cnt:
+        _notify_snapshot(track)
     # Debug-Logging entfernt.
 
 def mute_after_last_marker(track, scene_end):
@@ -34,6 +45,7 @@ def mute_after_last_marker(track, scene_end):
     for m in track.markers:
         if last_valid_frame <= m.frame <= scene_end:
             m.mute = True
+    _notify_snapshot(track)
 
 def mute_unassigned_markers(tracks):
     """Mute markers that are not part of a >=2-frames segment or are exactly at the track start."""
@@ -52,4 +64,6 @@ def mute_unassigned_markers(tracks):
             if f not in valid_frames or f == first_frame:
                 marker.mute = True
                 cnt += 1
+        if cnt:
+            _notify_snapshot(track)
         # Debug-Logging entfernt.
@@ -7,6 +7,10 @@ import bpy
 import math
 import time
 
+from .clip_context import find_clip_editor
+from .frame_ops import flush_view_layer
+from .trace import traced
+
 __all__ = ("run_projection_cleanup_builtin",)
 
 _STORE_TRACKS_KEY = "tco_proj_spike_tracks"  # Übergabe an projektion_spike_filter_cycle
@@ -16,15 +20,13 @@ _SCENE_ERROR_KEY  = "error_track"            # Basiswert aus Scene
 # Kontext
 # ---------------------------------------------------------------------
 def _find_clip_window(context) -> Tuple[Optional[bpy.types.Area], Optional[bpy.types.Region], Optional[bpy.types.Space]]:
-    win = context.window
+    win = getattr(context, "window", None)
     if not win or not getattr(win, "screen", None):
         return None, None, None
-    for area in win.screen.areas:
-        if area.type == 'CLIP_EDITOR':
-            region_window = next((r for r in area.regions if r.type == 'WINDOW'), None)
-            if region_window:
-                return area, region_window, area.spaces.active
-    return None, None, None
+    ov = find_clip_editor(context, window=win)
+    if not ov:
+        return None, None, None
+    return ov["area"], ov["region"], ov["space_data"]
 
 def _active_clip(context) -> Optional[bpy.types.MovieClip]:
     space = getattr(context, "space_data", None)
@@ -64,10 +66,7 @@ def _compute_track_errors(clip: bpy.types.MovieClip) -> list[tuple[str, float]]:
     Fallbacks: 'reprojection_error', 'error'. 0.0 ist zulässig.
     """
     out: list[tuple[str, float]] = []
-    try:
-        bpy.context.view_layer.update()
-    except Exception:
-        pass
+    flush_view_layer()
 
     candidates = ("average_error", "reprojection_error", "error")
     for obj in clip.tracking.objects:
@@ -94,6 +93,7 @@ def _compute_track_errors(clip: bpy.types.MovieClip) -> list[tuple[str, float]]:
 # ---------------------------------------------------------------------
 # Öffentliche API – selektiert nur, speichert Track-Namen
 # ---------------------------------------------------------------------
+@traced()
 def run_projection_cleanup_builtin(
     context: bpy.types.Context,
     *,
@@ -4,6 +4,8 @@ from typing import Optional, Tuple, Dict, Any, Iterable
 import math
 import bpy
 import time
+
+from .clip_context import find_clip_editor
 from ..Operator import tracking_coordinator as tco
 
 __all__ = (
@@ -16,19 +18,13 @@ __all__ = (
 
 
 def _find_clip_window(context) -> Tuple[Optional[bpy.types.Area], Optional[bpy.types.Region], Optional[bpy.types.Space]]:
-    win = context.window
+    win = getattr(context, "window", None)
     if not win or not getattr(win, "screen", None):
         return None, None, None
-    for area in win.screen.areas:
-        if area.type == 'CLIP_EDITOR':
-            region_window = None
-            for r in area.regions:
-                if r.type == 'WINDOW':
-                    region_window = r
-                    break
-            if region_window:
-                return area, region_window, area.spaces.active
-    return None, None, None
+    ov = find_clip_editor(context, window=win)
+    if not ov:
+        return None, None, None
+    return ov["area"], ov["region"], ov["space_data"]
 
 
 def _active_clip(context) -> Optional[bpy.types.MovieClip]:
@@ -3,6 +3,15 @@
 Utilities to reduce high-error tracks and inspect average reprojection error.
 Provides run_reduce_error_tracks and get_avg_reprojection_error with diagnostic
 logging.
+
+Solve-freie Vorhersage: Der Durchschnittsfehler der Rekonstruktion ist der
+markergewichtete Mittelwert der Track-Fehler. ``predict_avg_error`` schätzt ihn
+nach dem Entfernen einer Track-Menge, ``plan_error_reduction`` wählt die
+kleinste Menge, deren Vorhersage ``kc_error_track_target`` erreicht. Jede
+Vorhersage landet in ``scene["kc_reduce_predictions"]`` und wird beim nächsten
+Aufruf (bzw. ``record_reduce_outcome``) mit dem tatsächlichen Fehler des
+folgenden Solves ergänzt; der Median-Quotient tatsächlich/vorhergesagt
+kalibriert spätere Vorhersagen.
 """
 
 from __future__ import annotations
@@ -10,6 +19,13 @@ from typing import Dict, Any, List, Tuple, Optional
 import sys
 import bpy
 import time
+
+import numpy as np
+
+from .track_removal import remove_tracks
+from .track_snapshot import get_track_snapshot
+from .trace import traced
+from .rna_profile import profiled_clip, unwrap_rna
 try:
     # Einheitliche Fehler-Metrik wie in der Coordinator-Telemetrie
     from .count import error_value  # type: ignore
@@ -22,7 +38,17 @@ except Exception:
         except Exception:
             return -1.0
 
-__all__ = ("run_reduce_error_tracks", "get_avg_reprojection_error")
+__all__ = (
+    "run_reduce_error_tracks",
+    "get_avg_reprojection_error",
+    "predict_avg_error",
+    "plan_error_reduction",
+    "record_reduce_outcome",
+    "prediction_accuracy",
+)
+
+_PRED_KEY = "kc_reduce_predictions"
+_PRED_KEEP = 50
 
 
 def _name(tr):
@@ -40,6 +66,7 @@ def _has_marker_on_frame(tr, frame):
 
 
 def _peek_clip_context(ctx, clip):
+    clip = unwrap_rna(clip)
     win = getattr(ctx, "window", None)
     scr = getattr(ctx, "screen", None)
     area_ok = region_ok = space_ok = False
@@ -117,35 +144,6 @@ def _post_verify_exists(clip, target_names):
     except Exception:
         return []
 
-def _ensure_clip_context(context: bpy.types.Context) -> dict:
-    """
-    Liefert ein temp_override-Dict fuer den CLIP_EDITOR, damit bpy.ops.clip.* stabil laeuft.
-    Faellt auf leeres Dict zurueck, wenn kein gueltiges Fenster/Area gefunden wird.
-    """
-    wm = bpy.context.window_manager
-    if not wm:
-        return {}
-    for win in wm.windows:
-        scr = getattr(win, 'screen', None)
-        if not scr:
-            continue
-        for area in scr.areas:
-            if area.type != 'CLIP_EDITOR':
-                continue
-            region = next((r for r in area.regions if r.type == 'WINDOW'), None)
-            space = area.spaces.active if hasattr(area, 'spaces') else None
-            if region and space:
-                return {
-                    'window': win,
-                    'area': area,
-                    'region': region,
-                    'space_data': space,
-                    'scene': bpy.context.scene,
-                }
-    return {}
-
-
-
 def _resolve_clip(context: bpy.types.Context):
     clip = getattr(getattr(context, "space_data", None), "clip", None)
     if not clip:
@@ -155,6 +153,136 @@ def _resolve_clip(context: bpy.types.Context):
     return clip
 
 
+# ---------------------------------------------------------------------------
+# Vorhersage des Durchschnittsfehlers (ohne Solve)
+# ---------------------------------------------------------------------------
+
+def _marker_counts(clip, names: List[str]) -> np.ndarray:
+    """Ungemutete Marker je Track (Reihenfolge wie ``names``)."""
+    out = np.zeros(len(names), dtype=np.float64)
+    snap = get_track_snapshot(clip, use_active_object=False)
+    if snap is None or not snap.n_tracks:
+        return out
+    counts = np.bincount(snap.marker_track[~snap.mute], minlength=snap.n_tracks)
+    index = {n: i for i, n in enumerate(snap.track_names)}
+    for j, name in enumerate(names):
+        i = index.get(name)
+        if i is not None:
+            out[j] = counts[i]
+    return out
+
+
+def predict_avg_error(errors, counts, remove=None) -> Optional[float]:
+    """Markergewichteter Durchschnittsfehler, optional ohne die Tracks in ``remove`` (Bool-Maske)."""
+    e = np.asarray(errors, dtype=np.float64)
+    n = np.asarray(counts, dtype=np.float64)
+    keep = (e >= 0.0) & (n > 0)
+    if remove is not None:
+        keep &= ~np.asarray(remove, dtype=bool)
+    total = float(n[keep].sum())
+    if total <= 0.0:
+        return None
+    return float((e[keep] * n[keep]).sum() / total)
+
+
+def plan_error_reduction(errors, counts, target: float, candidates) -> Tuple[Optional[int], List[int]]:
+    """Kleinste Teilmenge von ``candidates`` (Indizes), deren Entfernen den
+    gewichteten Mittelwert auf ≤ ``target`` senkt.
+
+    Entfernen von Track t senkt den Überschuss Σ n·(e − target) um
+    n_t·(e_t − target); die größten Beiträge zuerst ergeben die kleinste Menge.
+    Rückgabe ``(k, Reihenfolge)``; ``k`` = None, wenn das Ziel mit allen
+    Kandidaten nicht erreichbar ist.
+    """
+    e = np.asarray(errors, dtype=np.float64)
+    n = np.asarray(counts, dtype=np.float64)
+    valid = (e >= 0.0) & (n > 0)
+    excess = float((n[valid] * (e[valid] - float(target))).sum())
+    cand = np.asarray([i for i in candidates if valid[i]], dtype=np.int64)
+    if excess <= 0.0:
+        return 0, []
+    gain = n[cand] * (e[cand] - float(target))
+    # Tracks mit e ≤ target senken den Mittelwert nicht; ohne sie bleibt die
+    # kumulierte Summe monoton (searchsorted setzt das voraus)
+    cand, gain = cand[gain > 0.0], gain[gain > 0.0]
+    if not cand.size:
+        return None, []
+    order = cand[np.argsort(-gain, kind="stable")]
+    cum = np.cumsum(np.sort(gain)[::-1])
+    k = int(np.searchsorted(cum, excess)) + 1
+    # Alle Tracks entfernen ergibt keinen Mittelwert mehr
+    if k > len(order) or cum[k - 1] < excess or k >= int(valid.sum()):
+        return None, order.tolist()
+    return k, order.tolist()
+
+
+def _prediction_log(scn) -> List[Dict[str, Any]]:
+    try:
+        return [dict(e) for e in scn.get(_PRED_KEY, [])]
+    except Exception:
+        return []
+
+
+def _store_prediction_log(scn, log: List[Dict[str, Any]]) -> None:
+    """Log in die Szene schreiben (ID-Properties kennen kein None → Keys weglassen)."""
+    try:
+        scn[_PRED_KEY] = [
+            {k: v for k, v in e.items() if v is not None} for e in log[-_PRED_KEEP:]
+        ]
+    except Exception as ex:
+        print(f"[ReduceDBG] prediction log write failed: {ex!r}")
+
+
+def _calibration(log: List[Dict[str, Any]]) -> float:
+    """Median tatsächlich/vorhergesagt der letzten aufgelösten Vorhersagen."""
+    ratios = [
+        float(e["actual"]) / float(e["predicted"])
+        for e in log[-10:]
+        if e.get("actual") is not None and float(e.get("predicted") or 0.0) > 0.0
+    ]
+    return float(np.median(ratios)) if ratios else 1.0
+
+
+def record_reduce_outcome(context: bpy.types.Context, actual: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Offene Vorhersage mit dem Fehler des inzwischen gelaufenen Solves ergänzen.
+
+    Aufgelöst wird nur, wenn sich der Fehler gegenüber ``before`` geändert hat
+    (sonst gab es noch keinen neuen Solve).
+    """
+    scn = context.scene
+    log = _prediction_log(scn)
+    if not log or log[-1].get("actual") is not None:
+        return None
+    if actual is None:
+        actual = get_avg_reprojection_error(context)
+    entry = log[-1]
+    if actual is None or abs(float(actual) - float(entry.get("before", -1.0))) < 1e-9:
+        return None
+    entry["actual"] = float(actual)
+    entry["abs_error"] = abs(float(actual) - float(entry["predicted"]))
+    _store_prediction_log(scn, log)
+    print(
+        f"[ReduceDBG] prediction check: predicted={entry['predicted']:.4f} "
+        f"actual={entry['actual']:.4f} |Δ|={entry['abs_error']:.4f}"
+    )
+    return entry
+
+
+def prediction_accuracy(scene) -> Dict[str, Any]:
+    """Kennzahlen des Schätzers über alle aufgelösten Vorhersagen."""
+    done = [e for e in _prediction_log(scene) if e.get("actual") is not None]
+    if not done:
+        return {"n": 0, "mae": None, "bias": None, "calibration": 1.0}
+    diff = np.array([float(e["actual"]) - float(e["predicted"]) for e in done])
+    return {
+        "n": len(done),
+        "mae": float(np.abs(diff).mean()),
+        "bias": float(diff.mean()),
+        "calibration": _calibration(done),
+    }
+
+
+@traced()
 def run_reduce_error_tracks(
     context: bpy.types.Context,
     *,
@@ -179,16 +307,23 @@ def run_reduce_error_tracks(
             },
             "candidates": [],
         }
-    clip = _resolve_clip(context)
+    clip = profiled_clip(_resolve_clip(context))
     trk = getattr(clip, "tracking", None) if clip else None
     tracks = list(getattr(trk, "tracks", [])) if trk else []
+    # Vorherige Vorhersage gegen den inzwischen gelaufenen Solve prüfen
+    before = get_avg_reprojection_error(context)
+    record_reduce_outcome(context, before)
 
     cand: List[Tuple[str, float]] = []
+    all_names: List[str] = []
+    all_errors: List[float] = []
     for t in tracks:
         try:
             if getattr(t, "mute", False):
                 continue
             ev = float(error_value(t))
+            all_names.append(t.name)
+            all_errors.append(ev if getattr(t, "has_bundle", True) else -1.0)
             if ev >= thr:
                 cand.append((t.name, ev))
         except Exception:
@@ -196,11 +331,6 @@ def run_reduce_error_tracks(
     cand.sort(key=lambda x: x[1], reverse=True)
     print(f"[ReduceDBG] reducer candidates: count={len(cand)} top10={[(n, round(e,4)) for n,e in cand[:10]]}")
     _summarize_candidates(cand, thr, max_to_delete if max_to_delete is not None else 0)
-    # Dynamische Default-Batchgröße, falls nicht vorgegeben:
-    # 20 % der Kandidaten, min 5, max 50 (konservativ gegen Overkill)
-    if max_to_delete is None:
-        import math
-        max_to_delete = max(5, min(50, math.ceil(len(cand) * 0.20)))
 
     require_selected = bool(scn.get("reduce_only_selected", False))
     if require_selected:
@@ -209,8 +339,46 @@ def run_reduce_error_tracks(
     else:
         print(f"[ReduceDBG] reducer policy: require_selected=False")
 
+    # Kleinste Löschmenge, die das Ziel laut Vorhersage in EINEM Schritt erreicht.
+    # Modell (gewichteter Mittelwert) wird auf den live Fehler skaliert und mit
+    # der bisherigen Trefferquote kalibriert.
+    target = float(scn.get("kc_error_track_target", thr))
+    counts = _marker_counts(clip, all_names) if clip else np.zeros(len(all_names))
+    model_before = predict_avg_error(all_errors, counts)
+    scale = (float(before) / model_before) if (before and model_before) else 1.0
+    calib = _calibration(_prediction_log(scn))
+    pos = {n: i for i, n in enumerate(all_names)}
+    k_plan, order = plan_error_reduction(
+        all_errors, counts, target / max(scale * calib, 1e-9), [pos[n] for n, _e in cand]
+    )
+    if k_plan is not None:
+        cand = [(all_names[i], all_errors[i]) for i in order]
+        k_plan = k_plan if max_to_delete is None else min(k_plan, int(max_to_delete))
+        max_to_delete = k_plan
+    elif max_to_delete is None:
+        # Ziel nicht erreichbar → Dynamische Default-Batchgröße:
+        # 20 % der Kandidaten, min 5, max 50 (konservativ gegen Overkill)
+        import math
+        max_to_delete = max(5, min(50, math.ceil(len(cand) * 0.20)))
+    print(
+        f"[ReduceDBG] prediction: before={before} target={target:.4f} scale={scale:.4f} "
+        f"calib={calib:.4f} plan_k={k_plan} max_to_delete={max_to_delete}"
+    )
+    if k_plan == 0:
+        print("[ReduceDBG] reducer: target already met by prediction → nothing to do")
+        return {
+            "deleted": 0,
+            "names": [],
+            "thr": thr,
+            "policy": {
+                "require_selected": require_selected,
+                "mute_instead_delete": bool(scn.get("reduce_mute_instead_delete", False)),
+            },
+            "candidates": cand[:50],
+            "prediction": {"before": before, "predicted": before, "target": target, "k": 0},
+        }
+
     do_mute = bool(scn.get("reduce_mute_instead_delete", False))
-    use_clean_tracks = bool(scn.get("reduce_use_clean_tracks", True)) and (not do_mute) and (not require_selected)
     print(f"[ReduceDBG] reducer action: {'MUTE' if do_mute else 'DELETE'} thr={thr} max_to_delete={max_to_delete}")
 
     deleted_names: List[str] = []
@@ -243,93 +411,25 @@ def run_reduce_error_tracks(
                 count += 1
             except Exception as _exc:
                 print(f"[ReduceDBG] reducer failed (mute) for {name}: {_exc}")
-    elif use_clean_tracks:
-        # — Variante: targeted DELETE via bpy.ops.clip.clean_tracks (ein Aufruf, kontext-sicher)
-        # Ziel: genau k Top-Error-Tracks treffen, ohne Container mehrfach umzubauen.
-        # 1) Schwelle zwischen k und k+1 (oder knapp unter err_k) berechnen
-        errs_sorted = [e for (_n, e) in to_process]  # top-k errors (desc)
-        err_k = float(errs_sorted[-1])  # kleinster der Top-K
-        has_kp1 = len(cand) > k
-        if has_kp1:
-            err_kp1 = float(cand[k][1])  # erster nach den Top-K
-            thr_clean = 0.5 * (err_k + err_kp1)  # Midpoint trennt exakt K vs. K+1 (bei !=)
-        else:
-            thr_clean = err_k - 1e-6  # knapp darunter → trifft nur Top-K
-        print(f"[ReduceDBG] clean_tracks threshold -> {thr_clean:.6f} (err_k={err_k:.6f}{' err_k+1='+str(err_kp1) if has_kp1 else ''})")
-        # 2) Operator im CLIP-Override aufrufen
-        try:
-            override = _ensure_clip_context(context)
-            if override:
-                with bpy.context.temp_override(**override):
-                    bpy.ops.clip.clean_tracks(frames=0, error=float(thr_clean), action='DELETE_TRACK')
-            else:
-                bpy.ops.clip.clean_tracks(frames=0, error=float(thr_clean), action='DELETE_TRACK')
-        except Exception as _op_exc:
-            print(f"[ReduceDBG] operator clean_tracks failed: {_op_exc}")
-        # 3) Ergebnis prüfen (Namen, Count)
-        try:
-            try:
-                bpy.context.view_layer.update()
-            except Exception:
-                pass
-            # Alle, die vorab >= thr_clean lagen (d.h. Zielmenge), als gelöscht zählen
-            goal_set = {n for (n, e) in cand if e >= thr_clean}
-            for name in list(goal_set):
-                still_there = bool(trk.tracks.get(name)) if trk else False
-                if not still_there:
-                    deleted_names.append(name)
-            count = len(deleted_names)
-        except Exception as _chk_exc:
-            print(f"[ReduceDBG] post-clean_tracks check failed: {_chk_exc}")
-        # Hinweis: Bei gleichen Fehlerwerten um err_k kann es >k werden (Tie-Case).
-        if count > k:
-            print(f"[ReduceDBG] NOTE: deleted={count} > k={k} (ties at threshold)")
     else:
-        # — Variante: DELETE via Operator (kontext-sicher)
-        # 1) Auswahl vorbereiten
-        try:
-            for t in tracks:
-                try:
-                    t.select = False
-                except Exception:
-                    pass
-            for t in tracks:
-                if t.name in target_names:
-                    try:
-                        t.select = True
-                    except Exception:
-                        pass
-        except Exception as _sel_exc:
-            print(f"[ReduceDBG] selection prep failed: {_sel_exc}")
-        # 2) Operator aufrufen (mit Override, falls möglich)
-        op_ok = False
-        try:
-            override = _ensure_clip_context(context)
-            if override:
-                with bpy.context.temp_override(**override):
-                    bpy.ops.clip.delete_track()
-            else:
-                bpy.ops.clip.delete_track()
-            op_ok = True
-        except Exception as _op_exc:
-            print(f"[ReduceDBG] operator delete_track failed: {_op_exc}")
-        # 3) Ergebnis prüfen & zählen; ggf. Fallback auf MUTE
-        try:
-            # Layer refresh, dann Existenz prüfen
+        # — Variante: DELETE über die gemeinsame Lösch-Engine (genau die Top-K,
+        #   keine Schwellwert-Tricks, keine Selektionsänderung)
+        target_ptrs = []
+        for t in target_tracks:
             try:
-                bpy.context.view_layer.update()
+                target_ptrs.append(int(t.as_pointer()))
             except Exception:
                 pass
-            for name in list(target_names):
-                still_there = bool(trk.tracks.get(name)) if trk else False
-                if not still_there:
-                    deleted_names.append(name)
-                    count += 1
-        except Exception as _chk_exc:
-            print(f"[ReduceDBG] post-delete check failed: {_chk_exc}")
-        # Falls der Operator nichts gelöscht hat, auf MUTE ausweichen (damit der Zyklus vorankommt).
+        res = remove_tracks(clip, target_ptrs)
+        print(f"[ReduceDBG] remove_tracks: status={res['status']} removed={res['removed']} failed={res['failed']}")
+        for name in list(target_names):
+            still_there = bool(trk.tracks.get(name)) if trk else False
+            if not still_there:
+                deleted_names.append(name)
+                count += 1
+        # Falls nichts gelöscht wurde, auf MUTE ausweichen (damit der Zyklus vorankommt).
         if count == 0:
-            print("[ReduceDBG] operator deletion had no effect -> fallback to MUTE for targets")
+            print("[ReduceDBG] deletion had no effect -> fallback to MUTE for targets")
             for name in list(target_names):
                 t = trk.tracks.get(name) if trk else None
                 if not t:
@@ -356,6 +456,24 @@ def run_reduce_error_tracks(
     except Exception as ex:
         print(f"[VerifyDBG] post-op verification failed: {ex!r}")
     print(f"[ReduceDBG] reducer summary: affected={count}")
+    prediction = None
+    if count and model_before is not None:
+        gone = set(deleted_names)
+        after = predict_avg_error(all_errors, counts, [n in gone for n in all_names])
+        if after is not None:
+            prediction = {
+                "before": float(before) if before is not None else None,
+                "predicted": float(after * scale * calib),
+                "target": target,
+                "k": count,
+                "planned": k_plan is not None,
+                "actual": None,
+                "t": time.time(),
+            }
+            log = _prediction_log(scn)
+            log.append(prediction)
+            _store_prediction_log(scn, log)
+            print(f"[ReduceDBG] prediction: after={prediction['predicted']:.4f} (awaiting next solve)")
     return {
         "deleted": count,  # Anzahl betroffener Tracks (deleted oder mute-fallback)
         "names": deleted_names,
@@ -363,9 +481,9 @@ def run_reduce_error_tracks(
         "policy": {
             "require_selected": require_selected,
             "mute_instead_delete": do_mute,
-            "use_clean_tracks": use_clean_tracks,
         },
         "candidates": cand[:50],
+        "prediction": prediction,
     }
 
 
@@ -398,3 +516,39 @@ def get_avg_reprojection_error(context: bpy.types.Context) -> Optional[float]:
     except Exception:
         pass
     return None
+
+
+# -----------------------------------------------------------------------------
+# Simple self tests (run inside Blender's console/text editor)
+# -----------------------------------------------------------------------------
+
+def _test_plan_error_reduction(cases: int = 3000, seed: int = 0) -> None:
+    """Brute-Force-Abgleich: ``plan_error_reduction`` liefert die kleinste Menge."""
+    from itertools import combinations
+
+    rng = np.random.default_rng(seed)
+    for _ in range(int(cases)):
+        m = int(rng.integers(1, 7))
+        e = rng.uniform(0.0, 3.0, m)
+        n = rng.integers(1, 30, m).astype(np.float64)
+        target = float(rng.uniform(0.2, 2.5))
+        cand = sorted(rng.choice(m, size=int(rng.integers(1, m + 1)), replace=False).tolist())
+        best = None
+        for k in range(0, len(cand) + 1):
+            for sub in combinations(cand, k):
+                mask = np.zeros(m, dtype=bool)
+                mask[list(sub)] = True
+                avg = predict_avg_error(e, n, mask)
+                if avg is not None and avg <= target:
+                    best = k
+                    break
+            if best is not None:
+                break
+        k_plan, _order = plan_error_reduction(e, n, target, cand)
+        assert k_plan == best, (
+            f"plan_error_reduction: e={e.tolist()} n={n.tolist()} target={target} "
+            f"cand={cand} → {k_plan}, brute force {best}"
+        )
+    e, n = [1.97, 1.82, 0.095], [13, 9, 17]
+    assert plan_error_reduction(e, n, 1.02, [1, 2])[0] == 1
+    print(f"[ReduceDBG] _test_plan_error_reduction: OK ({cases} cases)")
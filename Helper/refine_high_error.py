@@ -8,6 +8,10 @@ from typing import List, Optional, Dict, Tuple
 import bpy
 from bpy.types import Context, Operator
 
+from .completion import expect, resolve
+from .frame_ops import count_avoided, flush_view_layer, frame_free_enabled, sync_frame
+from .update_coalescer import request_redraw, request_window_swap
+
 
 # ------------------------- Kontext & Mapping ---------------------------------
 
@@ -48,8 +52,8 @@ def _scene_to_clip_frame(context: Context, clip: bpy.types.MovieClip, scene_fram
 
 def _force_visible_playhead(context: Context, ovr: dict, clip: bpy.types.MovieClip,
                             scene_frame: int, *, sleep_s: float = 0.04) -> None:
-    # 1) Szene-Frame
-    context.scene.frame_set(int(scene_frame))
+    # 1) Szene-Frame (echtes frame_set: refine liest den Clip-User-Frame)
+    sync_frame(context.scene, int(scene_frame), need_depsgraph=True)
     # 2) Clip-User-Frame synchronisieren
     try:
         cf = _scene_to_clip_frame(context, clip, int(scene_frame))
@@ -58,19 +62,16 @@ def _force_visible_playhead(context: Context, ovr: dict, clip: bpy.types.MovieCl
             space.clip_user.frame_current = int(cf)
     except Exception:
         pass
-    # 3) View-Layer & Redraw
-    try:
-        bpy.context.view_layer.update()
-    except Exception:
-        pass
-    try:
-        area = ovr.get("area", None)
-        if area:
-            area.tag_redraw()
-        with context.temp_override(**ovr):
-            bpy.ops.wm.redraw_timer(type="DRAW_WIN_SWAP", iterations=1)
-    except Exception:
-        pass
+    if frame_free_enabled(context.scene):
+        # View-Layer-Update, Redraw und UI-Pause entfallen
+        count_avoided()
+        return
+    # 3) View-Layer & Redraw (im Pipeline-Lauf gebündelt)
+    flush_view_layer(context)
+    area = ovr.get("area", None)
+    if area:
+        request_redraw(area)
+    request_window_swap()
     # 4) kleine Atempause für die UI
     if sleep_s > 0.0:
         try:
@@ -309,16 +310,21 @@ class CLIP_OT_refine_high_error_modal(Operator):
                         if v is not None:
                             baseline_err += float(v)
 
+                # Frame-frei: Marker werden per Clip-Frame gelesen → kein Redraw/Warten
+                frame_free = frame_free_enabled(context.scene)
+
                 # refine vorwärts
                 if self._ops_left > 0:
                     with context.temp_override(**self._ovr):
                         bpy.ops.clip.refine_markers("EXEC_DEFAULT", backwards=False)
                     self._ops_left -= 1
-                    with context.temp_override(**self._ovr):
-                        bpy.ops.wm.redraw_timer(type="DRAW_WIN_SWAP", iterations=1)
+                    if frame_free:
+                        count_avoided()
+                    else:
+                        request_window_swap()
 
                 # optionale kurze Pause
-                if float(self.wait_seconds) > 0.0:
+                if float(self.wait_seconds) > 0.0 and not frame_free:
                     time.sleep(min(0.2, float(self.wait_seconds)))
 
                 # refine rückwärts (nur wenn noch Budget)
@@ -326,8 +332,10 @@ class CLIP_OT_refine_high_error_modal(Operator):
                     with context.temp_override(**self._ovr):
                         bpy.ops.clip.refine_markers("EXEC_DEFAULT", backwards=True)
                     self._ops_left -= 1
-                    with context.temp_override(**self._ovr):
-                        bpy.ops.wm.redraw_timer(type="DRAW_WIN_SWAP", iterations=1)
+                    if frame_free:
+                        count_avoided()
+                    else:
+                        request_window_swap()
 
                 # --- Bewertung nach Refine + Rollback bei Verschlechterung ---
                 new_err = 0.0
@@ -401,6 +409,7 @@ class CLIP_OT_refine_high_error_modal(Operator):
             context.scene["refine_active"] = False
         except Exception:
             pass
+        resolve("refine", "CANCELLED" if cancelled else "FINISHED")
         return {"CANCELLED" if cancelled else "FINISHED"}
 
 
@@ -426,7 +435,8 @@ def start_refine_modal(
          - Priorisierung nach Score = aktive Marker / Fehler-Summe
          - Mindestabstand von frames_track/2 (keine Obergrenze der Anzahl)
          Danach Refine (vorwärts + rückwärts) mit Rollback-Guard.
-    Rückgabe: {'status': 'STARTED'|'BUSY'|'FAILED'}.
+    Rückgabe: {'status': 'STARTED'|'BUSY'|'FAILED', 'completion': Completion}.
+    Die Completion ("refine") wird beim Beenden des Operators aufgelöst.
     """
     scn = context.scene
     if scn.get("refine_active"):
@@ -445,6 +455,10 @@ def start_refine_modal(
         max_refine_calls=int(max_refine_calls),
         tracking_object_name=str(tracking_object_name or ""),
     )
+    done = expect("refine")
     with context.temp_override(**ovr):
-        bpy.ops.clip.refine_high_error_modal("INVOKE_DEFAULT", **kwargs)
-    return {"status": "STARTED", **kwargs}
+        res = bpy.ops.clip.refine_high_error_modal("INVOKE_DEFAULT", **kwargs)
+    if "RUNNING_MODAL" not in res:
+        # invoke() hat abgelehnt → kein _finish, Completion hier schließen
+        resolve("refine", "CANCELLED")
+    return {"status": "STARTED", "completion": done, **kwargs}
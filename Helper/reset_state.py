@@ -25,6 +25,7 @@ RUNTIME_KEYS: Iterable[str] = (
     "kc_log_rows",
     "kc_last_frames_checked",
     "kc_error_solves",        # Liste aller Solve-Errors → beim Reset leeren
+    "kc_reduce_predictions",  # Fehler-Vorhersagen des Reducers (+ tatsächlicher Wert)
     # Mappings/Dicts
     "kc_repeat_frame",
 )
@@ -89,6 +90,7 @@ def _set_default(scene: bpy.types.Scene, key: str) -> None:
         "kc_log_rows",
         "kc_last_frames_checked",
         "kc_error_solves",
+        "kc_reduce_predictions",
     }:
         if not _clear_list_in_place(scene, key):
             scene[key] = []         # Fallback: ersetzen
@@ -0,0 +1,272 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/rna_profile.py
+---------------------
+Debug-Modus: zählt Python↔RNA-Zugriffe der Helfer je Coordinator-Phase.
+
+cProfile ordnet RNA-Kosten der aufrufenden Zeile zu, nicht der Zugriffsart.
+Hier wird der Clip eines Helfers (``profiled_clip(clip)``) in zählende
+Proxies gehüllt; jeder Zugriff über ``clip.tracking`` → Objects/Tracks/
+Track/Markers/Marker wird klassifiziert:
+
+  - ``marker_lookup``  ``markers.find_frame(f)``, ``markers[i]``
+  - ``marker_edit``    ``markers.insert_frame`` / ``delete_frame``
+  - ``track_iter``     je über ``tracks`` iteriertem Track
+  - ``marker_iter``    je über ``markers`` iteriertem Marker
+  - ``name_lookup``    ``tracks.get(name)``, ``tracks[name]``, ``name in tracks``
+  - ``prop_read``      Attribut-Lesezugriffe (``track.name``, ``marker.co`` …)
+  - ``prop_write``     Attribut-Schreibzugriffe (``track.select = …``)
+  - ``bulk_read`` / ``bulk_write``  ``foreach_get`` / ``foreach_set``
+  - ``call``           übrige RNA-Funktionen (``as_pointer`` …)
+
+Zusätzlich je Phase die häufigsten ``Typ.attribut``-Zugriffe (``top``).
+
+Aktiv nur zwischen ``start_rna_profile``/``stop_rna_profile`` (Coordinator:
+Scene-Key ``tco_rna_profile``) bzw. im Scope ``rna_profiling()``; sonst gibt
+``profiled_clip`` den Clip unverändert zurück. Proxies sind für Helfer
+transparent (Vergleich/Hash/``as_pointer`` wie das Original); an
+RNA-Grenzen (``temp_override``, ``space.clip = …``) ``unwrap_rna`` nutzen.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+__all__ = (
+    "start_rna_profile",
+    "stop_rna_profile",
+    "is_rna_profiling",
+    "rna_profiling",
+    "set_rna_phase",
+    "profiled_clip",
+    "unwrap_rna",
+    "rna_profile_stats",
+    "reset_rna_profile",
+)
+
+CATEGORIES = (
+    "marker_lookup",
+    "marker_edit",
+    "track_iter",
+    "marker_iter",
+    "name_lookup",
+    "prop_read",
+    "prop_write",
+    "bulk_read",
+    "bulk_write",
+    "call",
+)
+
+_STATE: Dict[str, Any] = {"on": False, "phase": "IDLE"}
+# Phase → Counter(Kategorie) bzw. Counter("Typ.attr")
+_COUNTS: Dict[str, Counter] = {}
+_DETAIL: Dict[str, Counter] = {}
+
+_METHOD_CAT = {
+    ("Markers", "find_frame"): "marker_lookup",
+    ("Markers", "insert_frame"): "marker_edit",
+    ("Markers", "delete_frame"): "marker_edit",
+    "get": "name_lookup",
+    "find": "name_lookup",
+    "foreach_get": "bulk_read",
+    "foreach_set": "bulk_write",
+}
+_ITER_CAT = {"Tracks": "track_iter", "Markers": "marker_iter"}
+# Collections ohne eigenen RNA-Typnamen: Kind über den Attributnamen
+_COLL_KIND = {"tracks": "Tracks", "markers": "Markers", "objects": "Objects",
+              "plane_tracks": "PlaneTracks", "cameras": "Cameras"}
+
+
+def is_rna_profiling() -> bool:
+    return bool(_STATE["on"])
+
+
+def start_rna_profile() -> None:
+    reset_rna_profile()
+    _STATE["on"] = True
+
+
+def stop_rna_profile() -> None:
+    _STATE["on"] = False
+
+
+def reset_rna_profile() -> None:
+    _COUNTS.clear()
+    _DETAIL.clear()
+    _STATE["phase"] = "IDLE"
+
+
+@contextmanager
+def rna_profiling() -> Iterator[None]:
+    """Scope für Messungen außerhalb des Coordinators (z. B. vorher/nachher)."""
+    outer = is_rna_profiling()
+    if not outer:
+        start_rna_profile()
+    try:
+        yield
+    finally:
+        if not outer:
+            stop_rna_profile()
+
+
+def set_rna_phase(phase: str) -> None:
+    """Phasenlabel für die Zählung (vom Coordinator je Schritt gesetzt)."""
+    _STATE["phase"] = str(phase)
+
+
+def _count(cat: str, kind: str, name: str, n: int = 1) -> None:
+    if not _STATE["on"]:
+        return
+    phase = _STATE["phase"]
+    c = _COUNTS.get(phase)
+    if c is None:
+        c = _COUNTS[phase] = Counter()
+        _DETAIL[phase] = Counter()
+    c[cat] += n
+    _DETAIL[phase][f"{kind}.{name}"] += n
+
+
+# ---------------------------------------------------------------------------
+# Proxies
+# ---------------------------------------------------------------------------
+
+def _struct_kind(value) -> str | None:
+    tn = type(value).__name__
+    if tn.startswith("MovieTracking"):
+        return tn[len("MovieTracking"):] or "Tracking"
+    if tn == "MovieClip":
+        return "Clip"
+    return None
+
+
+def _wrap(value, attr: str = ""):
+    if isinstance(value, (_RNAProxy, int, float, str, bool)) or value is None:
+        return value
+    tn = type(value).__name__
+    if tn.startswith("bpy_prop_collection"):
+        kind = _COLL_KIND.get(attr)
+        if kind is None:
+            try:
+                ident = str(value.bl_rna.identifier)
+                kind = ident[len("MovieTracking"):] if ident.startswith("MovieTracking") else ident
+            except Exception:
+                kind = attr or "Collection"
+        return _RNACollection(value, kind)
+    kind = _struct_kind(value)
+    if kind is not None:
+        return _RNAProxy(value, kind)
+    return value
+
+
+def unwrap_rna(obj):
+    """Original-RNA-Objekt eines Proxys (sonst ``obj`` unverändert)."""
+    return object.__getattribute__(obj, "_rna") if isinstance(obj, _RNAProxy) else obj
+
+
+def _method(kind: str, name: str, fn):
+    cat = _METHOD_CAT.get((kind, name)) or _METHOD_CAT.get(name, "call")
+
+    def call(*args, **kwargs):
+        _count(cat, kind, name)
+        res = fn(*(unwrap_rna(a) for a in args), **{k: unwrap_rna(v) for k, v in kwargs.items()})
+        return _wrap(res)
+    return call
+
+
+class _RNAProxy:
+    """Zählender Stellvertreter eines RNA-Structs (Clip/Tracking/Track/Marker)."""
+
+    __slots__ = ("_rna", "_kind")
+
+    def __init__(self, rna, kind: str) -> None:
+        object.__setattr__(self, "_rna", rna)
+        object.__setattr__(self, "_kind", kind)
+
+    def __getattr__(self, name: str):
+        value = getattr(self._rna, name)
+        if callable(value):
+            return _method(self._kind, name, value)
+        _count("prop_read", self._kind, name)
+        return _wrap(value, name)
+
+    def __setattr__(self, name: str, value) -> None:
+        _count("prop_write", self._kind, name)
+        setattr(self._rna, name, unwrap_rna(value))
+
+    def __eq__(self, other) -> bool:
+        return self._rna == unwrap_rna(other)
+
+    def __ne__(self, other) -> bool:
+        return self._rna != unwrap_rna(other)
+
+    def __hash__(self) -> int:
+        return hash(self._rna)
+
+    def __repr__(self) -> str:
+        return f"<rna_profile {self._kind} {self._rna!r}>"
+
+
+class _RNACollection(_RNAProxy):
+    """Zählender Stellvertreter einer RNA-Collection (Tracks/Markers/Objects)."""
+
+    __slots__ = ()
+
+    def __iter__(self):
+        cat = _ITER_CAT.get(self._kind, "call")
+        kind = self._kind
+        for item in self._rna:
+            _count(cat, kind, "__iter__")
+            yield _wrap(item)
+
+    def __len__(self) -> int:
+        _count("call", self._kind, "__len__")
+        return len(self._rna)
+
+    def __bool__(self) -> bool:
+        return len(self._rna) > 0
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            _count("name_lookup", self._kind, "__getitem__")
+        elif self._kind == "Markers":
+            _count("marker_lookup", self._kind, "__getitem__")
+        else:
+            _count("call", self._kind, "__getitem__")
+        res = self._rna[key]
+        if isinstance(res, list):
+            return [_wrap(r) for r in res]
+        return _wrap(res)
+
+    def __contains__(self, key) -> bool:
+        _count("name_lookup", self._kind, "__contains__")
+        return unwrap_rna(key) in self._rna
+
+    def values(self):
+        cat = _ITER_CAT.get(self._kind, "call")
+        items = self._rna.values()
+        _count(cat, self._kind, "values", len(items))
+        return [_wrap(v) for v in items]
+
+
+def profiled_clip(clip):
+    """Clip in Zähl-Proxies hüllen (nur bei aktivem Profiling)."""
+    if clip is None or not _STATE["on"] or isinstance(clip, _RNAProxy):
+        return clip
+    return _RNAProxy(clip, "Clip")
+
+
+# ---------------------------------------------------------------------------
+# Auswertung
+# ---------------------------------------------------------------------------
+
+def rna_profile_stats(top: int = 10) -> Dict[str, Any]:
+    """Zählungen je Phase (+ Gesamt) und die häufigsten Zugriffe je Phase."""
+    total: Counter = Counter()
+    phases: Dict[str, Any] = {}
+    for phase, c in _COUNTS.items():
+        total.update(c)
+        entry = {cat: int(c.get(cat, 0)) for cat in CATEGORIES}
+        entry["top"] = {k: int(v) for k, v in _DETAIL[phase].most_common(int(top))}
+        phases[phase] = entry
+    return {"phases": phases, "total": {cat: int(total.get(cat, 0)) for cat in CATEGORIES}}
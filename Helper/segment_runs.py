@@ -0,0 +1,164 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/segment_runs.py
+----------------------
+Vektorisierte Lauflängen-Segmentierung von Markern.
+
+Eingabe sind flache Marker-Arrays (pro Track nach Frame sortiert), wahlweise
+aus einem einzelnen Track (``track_marker_arrays``) oder aus dem
+``TrackSnapshot``. Segmentgrenzen werden per ``np.diff`` bestimmt; Ergebnis
+sind Arrays je Segment (``SegmentRuns``).
+
+Regeln:
+    "ALL"           – Bruch bei Frame-Lücke (dt != 1); Mute wird ignoriert
+                      (wie ``get_track_segments``).
+    "UNMUTED"       – nur ungemutete (und nicht 'estimated') Marker; Bruch bei
+                      Frame-Lücke (wie ``_segments_by_consecutive_frames_unmuted``).
+    "GAP_OR_MUTED"  – alle Marker; Bruch bei Frame-Lücke ODER wenn einer der
+                      beiden Nachbarn gemutet ist (wie ``clean_short_segments``).
+"""
+from __future__ import annotations
+
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+__all__ = (
+    "SegmentRuns",
+    "segment_runs",
+    "snapshot_segment_runs",
+    "track_marker_arrays",
+    "track_segment_runs",
+    "count_in_runs",
+    "max_length_per_track",
+)
+
+RULES = ("ALL", "UNMUTED", "GAP_OR_MUTED")
+
+
+class SegmentRuns(NamedTuple):
+    """Segmente als parallele Arrays (S,)."""
+    track: np.ndarray    # Track-Index
+    start: np.ndarray    # erster Frame
+    end: np.ndarray      # letzter Frame (inklusive)
+    length: np.ndarray   # Anzahl Marker im Segment
+    first: np.ndarray    # Index des ersten Markers in den Eingabe-Arrays
+    last: np.ndarray     # Index des letzten Markers in den Eingabe-Arrays
+
+    def __len__(self) -> int:  # type: ignore[override]
+        return int(self.start.shape[0])
+
+    def frame_lists(self) -> List[List[int]]:
+        """Segmente als Frame-Listen (nur sinnvoll bei lückenlosen Regeln)."""
+        return [list(range(int(s), int(e) + 1)) for s, e in zip(self.start.tolist(), self.end.tolist())]
+
+
+def _empty() -> SegmentRuns:
+    z = np.empty(0, dtype=np.int64)
+    return SegmentRuns(z, z, z, z, z, z)
+
+
+def segment_runs(
+    frame: np.ndarray,
+    marker_track: Optional[np.ndarray] = None,
+    *,
+    mute: Optional[np.ndarray] = None,
+    estimated: Optional[np.ndarray] = None,
+    rule: str = "ALL",
+) -> SegmentRuns:
+    """Segmentiert flache Marker-Arrays nach ``rule`` (siehe Modul-Docstring)."""
+    if rule not in RULES:
+        raise ValueError(f"unknown segmentation rule: {rule!r}")
+    frame = np.asarray(frame, dtype=np.int64)
+    n = frame.shape[0]
+    if not n:
+        return _empty()
+    track = np.zeros(n, dtype=np.int64) if marker_track is None else np.asarray(marker_track, dtype=np.int64)
+    mute = np.zeros(n, dtype=bool) if mute is None else np.asarray(mute, dtype=bool)
+
+    if rule == "UNMUTED":
+        keep = ~mute
+        if estimated is not None:
+            keep &= ~np.asarray(estimated, dtype=bool)
+        idx = np.flatnonzero(keep)
+    else:
+        idx = np.arange(n)
+    if not idx.size:
+        return _empty()
+
+    f = frame[idx]
+    t = track[idx]
+    brk = np.ones(idx.size, dtype=bool)
+    brk[1:] = (t[1:] != t[:-1]) | (np.diff(f) != 1)
+    if rule == "GAP_OR_MUTED":
+        m = mute[idx]
+        brk[1:] |= m[1:] | m[:-1]
+
+    starts = np.flatnonzero(brk)
+    ends = np.append(starts[1:], idx.size) - 1
+    return SegmentRuns(
+        track=t[starts],
+        start=f[starts],
+        end=f[ends],
+        length=ends - starts + 1,
+        first=idx[starts],
+        last=idx[ends],
+    )
+
+
+def snapshot_segment_runs(snap, rule: str = "ALL", *, estimated: Optional[np.ndarray] = None) -> SegmentRuns:
+    """Segmente aller Tracks eines ``TrackSnapshot``."""
+    return segment_runs(snap.frame, snap.marker_track, mute=snap.mute, estimated=estimated, rule=rule)
+
+
+def track_marker_arrays(track) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """(frame, mute, estimated|None) eines Tracks per ``foreach_get``, nach Frame sortiert."""
+    markers = getattr(track, "markers", None)
+    n = len(markers) if markers is not None else 0
+    frame = np.empty(n, dtype=np.int32)
+    mute = np.zeros(n, dtype=bool)
+    est: Optional[np.ndarray] = None
+    if n:
+        markers.foreach_get("frame", frame)
+        try:
+            markers.foreach_get("mute", mute)
+        except Exception:
+            pass
+        try:
+            est = np.empty(n, dtype=bool)
+            markers.foreach_get("is_estimated", est)
+        except Exception:
+            est = None
+        if np.any(np.diff(frame) <= 0):
+            order = np.argsort(frame, kind="stable")
+            frame = frame[order]
+            mute = mute[order]
+            if est is not None:
+                est = est[order]
+    return frame, mute, est
+
+
+def track_segment_runs(track, rule: str = "ALL") -> SegmentRuns:
+    """Segmente eines einzelnen Tracks."""
+    try:
+        frame, mute, est = track_marker_arrays(track)
+    except Exception:
+        return _empty()
+    return segment_runs(frame, mute=mute, estimated=est, rule=rule)
+
+
+def count_in_runs(runs: SegmentRuns, mask: np.ndarray) -> np.ndarray:
+    """Anzahl der ``mask``-Marker je Segment (Segmente aus denselben Arrays)."""
+    mask = np.asarray(mask, dtype=bool)
+    if not len(runs):
+        return np.zeros(0, dtype=np.int64)
+    csum = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+    return csum[runs.last + 1] - csum[runs.first]
+
+
+def max_length_per_track(runs: SegmentRuns, n_tracks: int, lengths: Optional[np.ndarray] = None) -> np.ndarray:
+    """Längstes Segment je Track (T,); Tracks ohne Segment → 0."""
+    out = np.zeros(int(n_tracks), dtype=np.int64)
+    if len(runs):
+        np.maximum.at(out, runs.track, runs.length if lengths is None else lengths)
+    return out
@@ -1,24 +1,19 @@
 # Helper/segments.py
+import numpy as np
+
+from .segment_runs import track_marker_arrays, track_segment_runs
+
+
 def track_has_internal_gaps(track) -> bool:
     """True, wenn im Track mind. eine Lücke von >=1 fehlenden Frames existiert (O(n))."""
     try:
-        markers = getattr(track, "markers", None)
-        if not markers:
+        if not getattr(track, "markers", None):
             return False
-
-        # Einmalig sortierte, deduplizierte Frames (als int)
-        frames = sorted({int(getattr(m, "frame", -1)) for m in markers})
+        frames, _mute, _est = track_marker_arrays(track)
         if len(frames) <= 1:  # <3 ist unnötig restriktiv
             return False
-
-        prev = frames[0]
-        for f in frames[1:]:
-            diff = int(f) - int(prev)
-            missing = diff - 1               # Anzahl fehlender Frames zwischen prev und f
-            if missing >= 1:                 # schon 1 fehlender Frame ⇒ interne Lücke
-                return True
-            prev = f
-        return False
+        # Anzahl fehlender Frames zwischen Nachbarn; schon 1 fehlender Frame ⇒ interne Lücke
+        return bool(np.any(np.diff(frames) > 1))
     except Exception as e:
         return False
 
@@ -26,22 +21,6 @@ def track_has_internal_gaps(track) -> bool:
 def get_track_segments(track):
     """Liefert zusammenhängende Frame-Segmente (defensiv).
     Segmentbruch, sobald >=1 Frame fehlt (Gap)."""
-    markers = getattr(track, "markers", None)
-    if not markers:
-        return []
-
-    frames = sorted({int(getattr(m, "frame", -1)) for m in markers})
-    if not frames:
+    if not getattr(track, "markers", None):
         return []
-
-    segments, current = [], [frames[0]]
-    for i in range(1, len(frames)):
-        diff = frames[i] - frames[i - 1]
-        missing = diff - 1
-        if missing >= 1:                     # ein fehlender Frame reicht für Segmentbruch
-            segments.append(current)
-            current = [frames[i]]
-        else:
-            current.append(frames[i])
-    segments.append(current)
-    return segments
+    return track_segment_runs(track, "ALL").frame_lists()
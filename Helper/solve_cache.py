@@ -0,0 +1,231 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/solve_cache.py
+---------------------
+Memoisierung von Kamera-Solves über einen Fingerprint der Solve-Eingaben.
+
+``solve_fingerprint(clip)`` hasht alles, was das Ergebnis von
+``clip.solve_camera`` bestimmt:
+
+  - Markerdaten aller Tracks (``frame``/``co``/``mute`` per ``foreach_get``),
+  - Track-Einstellungen, die in den Solve eingehen (Gewicht, Offset, Mute),
+  - Kamera-Intrinsics (Brennweite, Hauptpunkt, Distortion-Modell + Koeffizienten),
+  - Solver-Flags (Refine-Intrinsics, Tripod, Keyframe-Auswahl) + Keyframes.
+
+Der Cache (pro Clip, LRU) bildet Fingerprint → Eintrag ab. Ein Eintrag enthält
+die Rohmetriken, die gelösten Intrinsics (``read_intrinsics``) und eine
+Kurzfassung der Rekonstruktion (``recon_summary``). Rekonstruierte Kameras und
+Bundles sind in RNA schreibgeschützt; sie gelten nur dann als wiederhergestellt,
+wenn die live Rekonstruktion noch der gespeicherten Kurzfassung entspricht.
+
+``fingerprint_seed(fp)`` liefert einen deterministischen RNG-Seed (Hold-out-Wahl),
+damit ein Cache-Treffer dieselben Hold-outs wie der ursprüngliche Lauf nutzt.
+"""
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+__all__ = (
+    "INTRINSIC_ATTRS",
+    "solve_fingerprint",
+    "fingerprint_seed",
+    "read_intrinsics",
+    "restore_intrinsics",
+    "recon_summary",
+    "cache_get",
+    "cache_put",
+    "cache_stats",
+    "clear_solve_cache",
+)
+
+# Intrinsics, die vor einem Solve zurückgesetzt bzw. nach einem Treffer
+# wiederhergestellt werden (Reihenfolge = Hash-Reihenfolge)
+INTRINSIC_ATTRS = (
+    "distortion_model",
+    "focal_length",
+    "k1", "k2", "k3",
+    "division_k1", "division_k2",
+    "brown_k1", "brown_k2", "brown_k3", "brown_k4",
+    "brown_p1", "brown_p2",
+)
+_CAMERA_ATTRS = INTRINSIC_ATTRS + (
+    "principal_point",
+    "pixel_aspect",
+    "sensor_width",
+    "units",
+    "nuke_k1", "nuke_k2",
+)
+_SOLVER_ATTRS = (
+    "refine_intrinsics",
+    "refine_intrinsics_focal_length",
+    "refine_intrinsics_principal_point",
+    "refine_intrinsics_radial_distortion",
+    "refine_intrinsics_tangential_distortion",
+    "use_keyframe_selection",
+    "use_tripod_solver",
+)
+
+_CACHE_SIZE = 32
+_CACHE: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+_STATS = {"hits": 0, "misses": 0}
+
+
+# ---------------------------------------------------------------------------
+# Fingerprint
+# ---------------------------------------------------------------------------
+
+def _norm(value: Any) -> Any:
+    """RNA-Werte (Vektoren, Enum-Sets) in hashbare, stabile Form bringen."""
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if isinstance(value, float):
+        return round(value, 9)
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        try:
+            return tuple(round(float(v), 9) for v in value)
+        except Exception:
+            return repr(value)
+    return value
+
+
+def _hash_attrs(h, owner, attrs) -> None:
+    vals = []
+    for attr in attrs:
+        try:
+            vals.append((attr, _norm(getattr(owner, attr))))
+        except Exception:
+            vals.append((attr, None))
+    h.update(repr(vals).encode("utf-8"))
+
+
+def _tracks_of(clip):
+    tr = clip.tracking
+    obj = tr.objects.active or (tr.objects[0] if len(tr.objects) else None)
+    return obj, (obj.tracks if obj else tr.tracks)
+
+
+def solve_fingerprint(clip, *, solver_flags: bool = True, extra: Any = None) -> str:
+    """Inhalts-Hash der Solve-Eingaben von ``clip`` (Hex, 32 Zeichen).
+
+    ``solver_flags=False`` lässt die Solver-Flags weg (für Aufrufer, die die
+    Flags vor jedem Solve selbst setzen). ``extra`` fließt per ``repr`` ein.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    obj, tracks = _tracks_of(clip)
+    for t in tracks:
+        markers = t.markers
+        n = len(markers)
+        frame = np.empty(n, dtype=np.int32)
+        co = np.empty(2 * n, dtype=np.float32)
+        mute = np.empty(n, dtype=bool)
+        if n:
+            markers.foreach_get("frame", frame)
+            markers.foreach_get("co", co)
+            markers.foreach_get("mute", mute)
+        offset = tuple(getattr(t, "offset", (0.0, 0.0)))
+        h.update(repr((t.name, n, float(getattr(t, "weight", 1.0)), bool(t.mute), offset)).encode("utf-8"))
+        h.update(frame.tobytes())
+        h.update(co.tobytes())
+        h.update(mute.tobytes())
+    _hash_attrs(h, clip.tracking.camera, _CAMERA_ATTRS)
+    if solver_flags:
+        _hash_attrs(h, clip.tracking.settings, _SOLVER_ATTRS)
+    if obj is not None:
+        h.update(repr((int(obj.keyframe_a), int(obj.keyframe_b))).encode("utf-8"))
+    if extra is not None:
+        h.update(repr(extra).encode("utf-8"))
+    return h.hexdigest()
+
+
+def fingerprint_seed(fp: str) -> int:
+    """Deterministischer RNG-Seed aus einem Fingerprint."""
+    return int(fp[:16], 16)
+
+
+# ---------------------------------------------------------------------------
+# Intrinsics / Rekonstruktion
+# ---------------------------------------------------------------------------
+
+def read_intrinsics(cam) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for attr in INTRINSIC_ATTRS:
+        try:
+            val = getattr(cam, attr)
+        except Exception:
+            continue
+        out[attr] = val if isinstance(val, str) else float(val)
+    return out
+
+
+def restore_intrinsics(cam, values: Optional[Dict[str, Any]]) -> None:
+    """Intrinsics zurückschreiben; das Distortion-Modell zuerst (Koeffizienten je Modell)."""
+    values = dict(values or {})
+    model = values.pop("distortion_model", None)
+    if model is not None:
+        try:
+            cam.distortion_model = model
+        except Exception:
+            pass
+    for attr, val in values.items():
+        try:
+            setattr(cam, attr, val)
+        except Exception:
+            pass
+
+
+def recon_summary(clip) -> Dict[str, Any]:
+    """Kurzfassung der live Rekonstruktion (Gültigkeit, Kameras, Bundles, Fehler)."""
+    tr = clip.tracking
+    obj, tracks = _tracks_of(clip)
+    rec = obj.reconstruction if obj is not None else tr.reconstruction
+    bundles = 0
+    for t in tracks:
+        if getattr(t, "has_bundle", False):
+            bundles += 1
+    return {
+        "valid": bool(getattr(rec, "is_valid", False)),
+        "cameras": int(len(getattr(rec, "cameras", []))),
+        "bundles": bundles,
+        "average_error": round(float(getattr(rec, "average_error", 0.0)), 6),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def cache_get(clip, fp: str) -> Optional[Dict[str, Any]]:
+    entries = _CACHE.get(clip.name)
+    entry = entries.get(fp) if entries is not None else None
+    if entry is None:
+        _STATS["misses"] += 1
+        return None
+    entries.move_to_end(fp)
+    _STATS["hits"] += 1
+    return entry
+
+
+def cache_put(clip, fp: str, entry: Dict[str, Any]) -> None:
+    entries = _CACHE.setdefault(clip.name, OrderedDict())
+    entries[fp] = dict(entry)
+    entries.move_to_end(fp)
+    while len(entries) > _CACHE_SIZE:
+        entries.popitem(last=False)
+
+
+def cache_stats() -> Dict[str, int]:
+    return {"hits": _STATS["hits"], "misses": _STATS["misses"],
+            "entries": sum(len(e) for e in _CACHE.values())}
+
+
+def clear_solve_cache(clip=None) -> None:
+    """Cache eines Clips (oder komplett) verwerfen."""
+    if clip is None:
+        _CACHE.clear()
+        _STATS["hits"] = _STATS["misses"] = 0
+    else:
+        _CACHE.pop(clip.name, None)
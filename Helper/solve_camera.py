@@ -2,6 +2,9 @@ from __future__ import annotations
 import bpy
 from typing import Optional
 
+from .clip_context import find_clip_editor
+from .trace import traced
+
 __all__ = ("solve_camera_only",)
 
 
@@ -9,41 +12,37 @@ __all__ = ("solve_camera_only",)
 
 def _find_clip_window(context) -> tuple[Optional[bpy.types.Area], Optional[bpy.types.Region], Optional[bpy.types.Space]]:
     win = getattr(context, "window", None)
-    screen = getattr(win, "screen", None)
-    if not screen:
+    if not win or not getattr(win, "screen", None):
+        return None, None, None
+    ov = find_clip_editor(context, window=win)
+    if not ov:
         return None, None, None
-    for area in screen.areas:
-        if area.type == 'CLIP_EDITOR':
-            region_window = None
-            for r in area.regions:
-                if r.type == 'WINDOW':
-                    region_window = r
-                    break
-            if region_window:
-                return area, region_window, area.spaces.active
-    return None, None, None
+    return ov["area"], ov["region"], ov["space_data"]
 
 
 # -- öffentliche API ----------------------------------------------------------
 
-def solve_camera_only(context):
+@traced()
+def solve_camera_only(context, *, blocking: bool = False):
     """Löst nur den Kamera-Solve aus – kein Cleanup, kein Warten.
 
     Versucht, falls möglich, einen Kontext-Override auf einen CLIP_EDITOR zu
     setzen, damit der Operator zuverlässig läuft. Fällt ansonsten auf den
-    globalen Kontext zurück.
+    globalen Kontext zurück. ``blocking=True`` löst synchron per
+    ``EXEC_DEFAULT`` (Headless, ohne Job/Timer).
 
     Returns
     -------
     set | dict
         Das Operator-Resultat (z. B. {'RUNNING_MODAL'} oder {'CANCELLED'}).
     """
+    mode = 'EXEC_DEFAULT' if blocking else 'INVOKE_DEFAULT'
     area, region, space = _find_clip_window(context)
     try:
         if area and region and space:
             with context.temp_override(area=area, region=region, space_data=space):
-                return bpy.ops.clip.solve_camera('INVOKE_DEFAULT')
-        return bpy.ops.clip.solve_camera('INVOKE_DEFAULT')
+                return bpy.ops.clip.solve_camera(mode)
+        return bpy.ops.clip.solve_camera(mode)
     except Exception as e:
         return {"CANCELLED"}
 
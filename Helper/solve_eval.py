@@ -1,6 +1,12 @@
 from dataclasses import dataclass
-from typing import Literal, Sequence
-import bpy, statistics as st, random
+from typing import Any, Literal, Optional, Sequence, Tuple
+import bpy, math, random, time
+import numpy as np
+
+try:
+    from .track_snapshot import get_track_snapshot
+except ImportError:  # Farm-Worker lädt dieses Modul per Dateipfad (ohne Paket)
+    get_track_snapshot = None
 
 DistModel = Literal["POLYNOMIAL", "DIVISION", "BROWN"]
 
@@ -15,6 +21,10 @@ class SolveConfig:
     center_box: float = 0.6             # 60% zentrales Rechteck
     fov_warn_pct: float = 0.15
     score_w: dict[str, float] | None = None
+    time_budget_sec: float = 10.0       # steuert Successive Halving (Überlebende je Runde)
+    halving_eta: int = 2                # je Runde überlebt ceil(n / eta)
+    warm_start: bool = True             # Kandidaten mit Intrinsics des besten Vorlaufs starten
+    feasibility_check: bool = True      # Epipolar-Vorprüfung der Keyframes (Helper/epipolar.py)
 
 
 @dataclass
@@ -29,7 +39,14 @@ class SolveMetrics:
     score: float
 
 
-__all__ = ("run_solve_eval", "SolveConfig", "SolveMetrics", "DistModel")
+__all__ = (
+    "run_solve_eval",
+    "select_survivors",
+    "warm_start_intrinsics",
+    "SolveConfig",
+    "SolveMetrics",
+    "DistModel",
+)
 
 
 # --------- Clip/Objekt/Frames ----------
@@ -64,51 +81,171 @@ def _clip_frame_range(clip):
     return int(getattr(scn, "frame_start", 1)), int(getattr(scn, "frame_end", 1))
 
 
+# --------- Marker-Arrays ----------
+class _MarkerArrays:
+    """Flache Markerdaten der aktiven Tracks (ragged über ``offsets``).
+
+    Bevorzugt der gecachte ``TrackSnapshot``; ohne Paketkontext (Farm-Worker)
+    wird direkt per ``foreach_get`` gelesen. ``tracks[i]`` gehört zu
+    ``[offsets[i], offsets[i+1])``; Marker je Track nach Frame sortiert.
+    """
+
+    __slots__ = ("tracks", "coll", "offsets", "frame", "co")
+
+    def __init__(self, clip):
+        tr = clip.tracking
+        coll = tr.objects.active.tracks if tr.objects.active else tr.tracks
+        self.coll = coll
+        snap = get_track_snapshot(clip, use_active_object=True) if get_track_snapshot else None
+        if snap is not None:
+            by_ptr = {}
+            for t in coll:
+                try:
+                    by_ptr[int(t.as_pointer())] = t
+                except Exception:
+                    pass
+            tracks = [by_ptr.get(int(p)) for p in snap.track_ptrs]
+            if all(t is not None for t in tracks):
+                self.tracks = tracks
+                self.offsets = snap.offsets
+                self.frame = snap.frame
+                self.co = snap.co
+                return
+        self.tracks = list(coll)
+        counts = np.fromiter((len(t.markers) for t in self.tracks), dtype=np.int64, count=len(self.tracks))
+        self.offsets = np.zeros(len(self.tracks) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        n = int(self.offsets[-1])
+        self.frame = np.empty(n, dtype=np.int32)
+        co = np.empty(2 * n, dtype=np.float32)
+        for i, t in enumerate(self.tracks):
+            lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+            if hi > lo:
+                t.markers.foreach_get("frame", self.frame[lo:hi])
+                t.markers.foreach_get("co", co[2 * lo:2 * hi])
+        self.co = co.reshape(n, 2)
+
+    def counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def track_floats(self, attr: str, default: float = 0.0) -> np.ndarray:
+        """Track-Attribut als (T,)-Array (``foreach_get``, sonst per Track)."""
+        out = np.empty(len(self.tracks), dtype=np.float64)
+        try:
+            if len(self.coll) == len(self.tracks):
+                buf = np.empty(len(self.tracks), dtype=np.float64)
+                self.coll.foreach_get(attr, buf)
+                if all(a == b for a, b in zip(self.coll, self.tracks)):
+                    out[:] = buf
+                    return out
+        except Exception:
+            pass
+        for i, t in enumerate(self.tracks):
+            out[i] = float(getattr(t, attr, default))
+        return out
+
+
+def _median(values: np.ndarray) -> float:
+    return float(np.median(values))
+
+
+def _quantile_exclusive(sorted_vals: np.ndarray, i: int, n: int) -> float:
+    """Wie ``statistics.quantiles(data, n=n)[i-1]`` (Methode 'exclusive')."""
+    m = len(sorted_vals) + 1
+    j = min(max(i * m // n, 1), len(sorted_vals) - 1)
+    delta = i * m - j * n
+    return float((sorted_vals[j - 1] * (n - delta) + sorted_vals[j] * delta) / n)
+
+
 # --------- Parallaxe ----------
+def _parallax_pairs(arr, d2):
+    """Marker-Paare (i, j) desselben Tracks mit ``frame[j] - frame[i] == d2``.
+
+    Lückenlose Tracks: Partner liegt genau ``d2`` Marker weiter (ein Slice-
+    Vergleich über alle Marker). Nur Tracks mit Lücken werden zusätzlich über
+    ein Fenster der nächsten ``d2`` Marker abgesucht.
+    Rückgabe: (ok-Maske über ``[0, n - d2)``, i_extra, j_extra).
+    """
+    n = int(arr.offsets[-1])
+    frame = arr.frame
+    counts = arr.counts()
+    ok = np.zeros(max(0, n - d2), dtype=bool)
+    if n > d2:
+        np.equal(frame[d2:] - frame[:-d2], d2, out=ok)
+        # Paare über die Track-Grenze hinweg verwerfen
+        ends = arr.offsets[1:]
+        cross = (ends[:, None] - np.arange(1, d2 + 1)[None, :]).ravel()
+        ok[cross[(cross >= 0) & (cross < ok.size)]] = False
+    lo, hi = arr.offsets[:-1], arr.offsets[1:]
+    has = counts > 0
+    span = np.zeros(len(counts), dtype=np.int64)
+    span[has] = frame[hi[has] - 1].astype(np.int64) - frame[lo[has]] + 1
+    gap_tracks = np.flatnonzero(has & (span != counts))
+    if not gap_tracks.size:
+        return ok, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    sub = np.concatenate([np.arange(lo[t], hi[t]) for t in gap_tracks])
+    end = np.repeat(hi[gap_tracks], counts[gap_tracks])
+    found = np.zeros(sub.size, dtype=bool)
+    found[sub < ok.size] = ok[sub[sub < ok.size]]
+    sub, end = sub[~found], end[~found]
+    win = np.minimum(sub[:, None] + np.arange(1, d2)[None, :], end[:, None] - 1)
+    hit = frame[win] == (frame[sub] + d2)[:, None]
+    m = hit.any(axis=1)
+    return ok, sub[m], win[m, hit[m].argmax(axis=1)]
+
+
 def compute_parallax_scores(clip, delta=5):
-    tr = clip.tracking
-    tracks = tr.objects.active.tracks if tr.objects.active else tr.tracks
     fs, fe = _clip_frame_range(clip)
     f0, f1 = int(fs + delta), int(fe - delta)
     if f1 <= f0:
         return []
-    out = []
-    for f in range(f0, f1 + 1):
-        vecs = []
-        for t in tracks:
-            m0 = t.markers.find_frame(f - delta, exact=True)
-            m1 = t.markers.find_frame(f + delta, exact=True)
-            if m0 and m1:
-                vecs.append((m1.co[0] - m0.co[0], m1.co[1] - m0.co[1]))
-        if len(vecs) > 8:
-            mx = sum(v[0] for v in vecs) / len(vecs)
-            my = sum(v[1] for v in vecs) / len(vecs)
-            resid = [((vx - mx) ** 2 + (vy - my) ** 2) ** 0.5 for vx, vy in vecs]
-            mu = sum(resid) / len(resid)
-            std = (sum((r - mu) ** 2 for r in resid) / len(resid)) ** 0.5
-            out.append((f, std))
-    return sorted(out, key=lambda x: x[1], reverse=True)
+    arr = _MarkerArrays(clip)
+    d2 = 2 * int(delta)
+    ok, i_x, j_x = _parallax_pairs(arr, d2)
+    nb = f1 - f0 + 1
+    # Bin je Mittelframe f = frame_i + delta; ungültige Paare → Sammel-Bin nb
+    c = arr.frame[: ok.size].astype(np.int64) + (int(delta) - f0)
+    v = arr.co[d2:] - arr.co[: ok.size] if ok.size else np.zeros((0, 2), dtype=np.float32)
+    if i_x.size:
+        c = np.concatenate((c, arr.frame[i_x].astype(np.int64) + (int(delta) - f0)))
+        v = np.concatenate((v, arr.co[j_x] - arr.co[i_x]))
+        ok = np.concatenate((ok, np.ones(i_x.size, dtype=bool)))
+    ok &= (c >= 0) & (c < nb)
+    c[~ok] = nb
+    vx = v[:, 0].astype(np.float64)
+    vy = v[:, 1].astype(np.float64)
+    cnt = np.bincount(c, minlength=nb + 1)[:nb]
+    safe = np.maximum(cnt, 1)
+    mx = np.bincount(c, weights=vx, minlength=nb + 1)[:nb] / safe
+    my = np.bincount(c, weights=vy, minlength=nb + 1)[:nb] / safe
+    mx, my = np.append(mx, 0.0), np.append(my, 0.0)
+    dx, dy = vx - mx[c], vy - my[c]
+    resid = np.sqrt(dx * dx + dy * dy)
+    mu = np.bincount(c, weights=resid, minlength=nb + 1)[:nb] / safe
+    dev = resid - np.append(mu, 0.0)[c]
+    var = np.bincount(c, weights=dev * dev, minlength=nb + 1)[:nb] / safe
+    keep = np.flatnonzero(cnt > 8)
+    std = np.sqrt(var[keep])
+    order = np.argsort(-std, kind="stable")
+    return [(int(keep[k]) + f0, float(std[k])) for k in order]
 
 
 # --------- Hold-outs ----------
-def choose_holdouts(clip, ratio=0.15, grid=(3, 3), edge_boost=1.4):
-    tr = clip.tracking
-    tracks = tr.objects.active.tracks if tr.objects.active else tr.tracks
-    items = []
-    for t in tracks:
-        if not t.markers:
-            continue
-        mk = max(t.markers, key=lambda m: m.frame)
-        x, y = mk.co
-        items.append((t, x, y))
-    if not items:
+def choose_holdouts(clip, ratio=0.15, grid=(3, 3), edge_boost=1.4, seed=None):
+    # seed (z. B. solve_cache.fingerprint_seed) → reproduzierbare Auswahl
+    rng = random.Random(seed) if seed is not None else random
+    arr = _MarkerArrays(clip)
+    has = np.flatnonzero(arr.counts() > 0)
+    if not has.size:
         return set()
     gx, gy = grid
+    last = arr.co[arr.offsets[has + 1] - 1].astype(np.float64)
+    ix = np.clip((last[:, 0] * gx).astype(np.int64), 0, gx - 1)
+    iy = np.clip((last[:, 1] * gy).astype(np.int64), 0, gy - 1)
+    items = [arr.tracks[i] for i in has]
     buckets = {}
-    for t, x, y in items:
-        ix = min(gx - 1, max(0, int(x * gx)))
-        iy = min(gy - 1, max(0, int(y * gy)))
-        buckets.setdefault((ix, iy), []).append((t, x, y))
+    for t, cx, cy in zip(items, ix.tolist(), iy.tolist()):
+        buckets.setdefault((cx, cy), []).append(t)
 
     def cell_weight(ix, iy):
         edge_x = (ix == 0 or ix == gx - 1)
@@ -122,14 +259,12 @@ def choose_holdouts(clip, ratio=0.15, grid=(3, 3), edge_boost=1.4):
     weight_sum = sum(weights.values()) or 1.0
     quota = {k: max(0, int(target * (w / weight_sum))) for k, w in weights.items()}
     for k, q in quota.items():
-        random.shuffle(buckets[k])
-        for i in range(min(q, len(buckets[k]))):
-            selected.add(buckets[k][i][0])
+        rng.shuffle(buckets[k])
+        selected.update(buckets[k][:q])
     if len(selected) < target:
-        rest = [t for t, _, _ in items if t not in selected]
-        random.shuffle(rest)
-        for t in rest[: target - len(selected)]:
-            selected.add(t)
+        rest = [t for t in items if t not in selected]
+        rng.shuffle(rest)
+        selected.update(rest[: target - len(selected)])
     return selected
 
 
@@ -143,37 +278,31 @@ def set_holdout_weights(tracks: set, w: float):
 
 # --------- Metriken & Score ----------
 def collect_metrics(clip, holdouts: set, center_box=0.6):
-    hs = [t.average_error for t in holdouts if getattr(t, "average_error", 0) > 0]
-    hold_med = st.median(hs) if hs else 999.0
+    hs = np.fromiter((float(getattr(t, "average_error", 0)) for t in holdouts), dtype=np.float64)
+    hs = np.sort(hs[hs > 0])
+    hold_med = _median(hs) if hs.size else 999.0
     hold_p95 = (
-        st.quantiles(hs, n=20)[-1] if len(hs) >= 20 else (max(hs) if hs else 999.0)
+        _quantile_exclusive(hs, 19, 20) if hs.size >= 20 else (float(hs[-1]) if hs.size else 999.0)
     )
     cx0 = cy0 = (1 - center_box) / 2.0
     cx1 = cy1 = 1 - cx0
-    edge_errs, center_errs = [], []
-    tr = clip.tracking
-    tracks = tr.objects.active.tracks if tr.objects.active else tr.tracks
-    for t in tracks:
-        mk = max(t.markers, key=lambda m: m.frame, default=None)
-        if not mk:
-            continue
-        x, y = mk.co
-        (edge_errs if (x < cx0 or x > cx1 or y < cy0 or y > cy1) else center_errs).append(
-            getattr(t, "average_error", 0)
-        )
+    arr = _MarkerArrays(clip)
+    counts = arr.counts()
+    has = np.flatnonzero(counts > 0)
+    err = arr.track_floats("average_error")[has]
+    last = arr.co[arr.offsets[has + 1] - 1].astype(np.float64)
+    x, y = last[:, 0], last[:, 1]
+    edge = (x < cx0) | (x > cx1) | (y < cy0) | (y > cy1)
     edge_gap = (
-        st.median(edge_errs) - st.median(center_errs)
-        if edge_errs and center_errs
+        _median(err[edge]) - _median(err[~edge])
+        if edge.any() and (~edge).any()
         else 0.0
     )
     fs, fe = _clip_frame_range(clip)
     total = max(1, fe - fs + 1)
-    lens = [
-        (t.markers[-1].frame - t.markers[0].frame + 1)
-        for t in tracks
-        if len(t.markers) >= 2
-    ]
-    persist = (sum(lens) / len(lens) / total) if lens else 0.0
+    multi = np.flatnonzero(counts >= 2)
+    lens = arr.frame[arr.offsets[multi + 1] - 1].astype(np.int64) - arr.frame[arr.offsets[multi]] + 1
+    persist = float(lens.mean() / total) if lens.size else 0.0
     return hold_med, hold_p95, edge_gap, persist
 
 
@@ -189,6 +318,97 @@ def score_metrics(med, p95, edge_gap, persist, fov_dev_norm, w=None):
     )
 
 
+# --------- Successive Halving ----------
+def select_survivors(
+    scored: Sequence[Tuple[float, Any]],
+    *,
+    eta: int = 2,
+    budget_sec: Optional[float] = None,
+    elapsed_sec: float = 0.0,
+    solve_sec: Optional[float] = None,
+) -> list:
+    """Top-k Kandidaten (kleinster Score zuerst) für die nächste Runde.
+
+    k = ceil(n / eta); zusätzlich begrenzt auf die Anzahl Solves, die im
+    Rest-Budget ``budget_sec - elapsed_sec`` bei ``solve_sec`` je Solve noch
+    Platz haben. Mindestens ein Kandidat überlebt; Gleichstand → Eingabereihenfolge.
+    """
+    ranked = sorted(scored, key=lambda x: x[0])
+    if not ranked:
+        return []
+    k = max(1, math.ceil(len(ranked) / max(1, int(eta))))
+    if budget_sec is not None and solve_sec and solve_sec > 0:
+        fit = int(max(0.0, float(budget_sec) - float(elapsed_sec)) // float(solve_sec))
+        k = max(1, min(k, fit))
+    return [cand for _score, cand in ranked[:k]]
+
+
+# --------- Warm-Start zwischen Linsenmodellen ----------
+_MODEL_COEFFS = {
+    "POLYNOMIAL": ("k1", "k2", "k3"),
+    "DIVISION": ("division_k1", "division_k2"),
+    "BROWN": ("brown_k1", "brown_k2", "brown_k3", "brown_k4", "brown_p1", "brown_p2"),
+}
+
+
+def _radial_poly(values: dict) -> tuple:
+    """Radiale Koeffizienten (k1, k2, k3) im POLYNOMIAL-Sinn.
+
+    Polynomial/Brown: x_d = x_u (1 + k1 r² + k2 r⁴ + k3 r⁶) – identisch.
+    Division (libmv): x_u = x_d / (1 + d1 r² + d2 r⁴); Reihenentwicklung bis r⁴
+    gegen die Polynom-Inverse → k1 = d1, k2 = d2 + 2 d1².
+    """
+    model = values.get("distortion_model")
+    if model == "DIVISION":
+        d1 = float(values.get("division_k1", 0.0))
+        d2 = float(values.get("division_k2", 0.0))
+        return d1, d2 + 2.0 * d1 * d1, 0.0
+    if model == "BROWN":
+        return tuple(float(values.get(k, 0.0)) for k in ("brown_k1", "brown_k2", "brown_k3"))
+    return tuple(float(values.get(k, 0.0)) for k in ("k1", "k2", "k3"))
+
+
+# Koeffizienten, die ``_set_refine_stage`` je Stufe verfeinert (RADIAL_K1/K2)
+_STAGE_COEFFS = {
+    "POLYNOMIAL": ("k1", "k2"),
+    "DIVISION": ("division_k1", "division_k2"),
+    "BROWN": ("brown_k1", "brown_k2"),
+}
+
+
+def warm_start_intrinsics(values: dict, model: str, stage: Optional[int] = None) -> dict:
+    """Startwerte für ``model`` aus gelösten Intrinsics eines anderen Laufs.
+
+    Brennweite wird übernommen; Verzeichnung in das Zielmodell umgerechnet
+    (siehe ``_radial_poly``; Brown-k4/Tangential → 0, Polynom-k3 entfällt
+    bei Division). Gleiches Modell → Koeffizienten unverändert.
+
+    Mit ``stage`` werden nur die in dieser Refine-Stufe verfeinerten
+    Koeffizienten übernommen, alle übrigen auf 0 gesetzt – sonst blieben
+    umgerechnete Werte fest und der Stufen-Score hinge davon ab, welches
+    Modell zuerst gelöst wurde.
+    """
+    out = {"distortion_model": model}
+    if "focal_length" in values:
+        out["focal_length"] = float(values["focal_length"])
+    if values.get("distortion_model") == model:
+        out.update({k: float(values[k]) for k in _MODEL_COEFFS.get(model, ()) if k in values})
+    else:
+        k1, k2, k3 = _radial_poly(values)
+        if model == "POLYNOMIAL":
+            out.update(k1=k1, k2=k2, k3=k3)
+        elif model == "DIVISION":
+            out.update(division_k1=k1, division_k2=k2 - 2.0 * k1 * k1)
+        elif model == "BROWN":
+            out.update(brown_k1=k1, brown_k2=k2, brown_k3=k3, brown_k4=0.0, brown_p1=0.0, brown_p2=0.0)
+    if stage is not None:
+        refined = _STAGE_COEFFS.get(model, ())[: max(0, min(int(stage), 2))]
+        for k in _MODEL_COEFFS.get(model, ()):
+            if k not in refined:
+                out[k] = 0.0
+    return out
+
+
 # --------- Solve (mit UI-Invoke) ----------
 def _invoke_solve_ui(context):
     """Nutzt Helper, der INVOKE_DEFAULT triggert."""
@@ -216,6 +436,8 @@ def _set_refine_stage(tr_settings, stage: int):
 
 # --------- Hauptfunktion ----------
 def run_solve_eval(context, config: SolveConfig):
+    from .solve_cache import fingerprint_seed, read_intrinsics, restore_intrinsics, solve_fingerprint
+
     clip, tr, obj = _get_clip_and_objects(context)
     tr_settings = tr.settings
     fs, fe = _clip_frame_range(clip)
@@ -233,13 +455,24 @@ def run_solve_eval(context, config: SolveConfig):
         mid = (fs + fe) // 2
         obj.keyframe_a = max(fs, mid - config.parallax_delta)
         obj.keyframe_b = min(fe, mid + config.parallax_delta)
-
-    # 2) Hold-outs wählen & setzen
+    # Aussichtslose Paare (Rotation/zu wenig Parallaxe) vor dem Solve umgehen
+    if config.feasibility_check:
+        from .epipolar import check_solve_feasibility, find_feasible_keyframes
+        feas = check_solve_feasibility(clip, obj.keyframe_a, obj.keyframe_b)
+        if feas["status"] != "OK":
+            feas = find_feasible_keyframes(clip, scores, config.parallax_delta, (fs, fe))
+        if feas["status"] != "OK":
+            tr_settings.use_keyframe_selection = auto_prev
+            raise RuntimeError(f"Solve not feasible ({feas['status']}): {feas['reason']}")
+        obj.keyframe_a, obj.keyframe_b = feas["keyframes"]
+
+    # 2) Hold-outs wählen & setzen (Seed aus dem Solve-Fingerprint)
     holdouts = choose_holdouts(
         clip,
         ratio=config.holdout_ratio,
         grid=config.holdout_grid,
         edge_boost=config.holdout_edge_boost,
+        seed=fingerprint_seed(solve_fingerprint(clip, solver_flags=False)),
     )
     orig_w = {t: getattr(t, "weight", 1.0) for t in holdouts}
     set_holdout_weights(holdouts, 0.0)
@@ -250,13 +483,36 @@ def run_solve_eval(context, config: SolveConfig):
 
     cam = clip.tracking.camera
     f_nom = float(getattr(cam, "focal_length", 0.0)) or 0.0
+    cam_defaults = read_intrinsics(cam)
+    solved: list[tuple[float, dict]] = []  # (score, gelöste Intrinsics)
 
+    t0 = time.perf_counter()
+    solve_secs: list[float] = []
     try:
-        for model in models:
-            cam.distortion_model = model
-            for stage in range(1, config.refine_rounds + 1):
+        # Successive Halving: alle Modelle in Stufe 1, danach nur die Top-k
+        # (score_metrics) der Vorstufe; k schrumpft zusätzlich mit dem Budget.
+        survivors: list = list(models)
+        for stage in range(1, config.refine_rounds + 1):
+            if stage > 1:
+                prev = [(m.score, m.model) for m in all_metrics if m.refine_stage == stage - 1]
+                survivors = select_survivors(
+                    prev,
+                    eta=config.halving_eta,
+                    budget_sec=config.time_budget_sec,
+                    elapsed_sec=time.perf_counter() - t0,
+                    solve_sec=(sum(solve_secs) / len(solve_secs)) if solve_secs else None,
+                )
+                print(f"[SolveEval] stage={stage} survivors={survivors}")
+            for model in survivors:
+                # Kalt: Ausgangs-Intrinsics; warm: bester bisheriger Solve (umgerechnet)
+                restore_intrinsics(cam, cam_defaults)
+                if config.warm_start and solved:
+                    restore_intrinsics(cam, warm_start_intrinsics(min(solved, key=lambda x: x[0])[1], model, stage))
+                cam.distortion_model = model
                 _set_refine_stage(tr_settings, stage)
+                ts = time.perf_counter()
                 _invoke_solve_ui(context)
+                solve_secs.append(time.perf_counter() - ts)
 
                 hold_med, hold_p95, edge_gap, persist = collect_metrics(
                     clip, holdouts, center_box=config.center_box
@@ -271,6 +527,7 @@ def run_solve_eval(context, config: SolveConfig):
                     fov_dev_norm,
                     config.score_w,
                 )
+                solved.append((score, read_intrinsics(cam)))
                 print(
                     f"[SolveEval] model={model} stage={stage} score={score:.4f} "
                     f"hold_med={hold_med:.4f} hold_p95={hold_p95:.4f} edge_gap={edge_gap:.4f}"
@@ -0,0 +1,183 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/solve_farm.py
+--------------------
+Parallele Solve-Evaluation über Background-Blender-Prozesse.
+
+Die (Modell, Refine-Stufe)-Kandidaten der SOLVE_EVAL sind voneinander
+unabhängig. Statt sie nacheinander im Live-Clip zu lösen, wird die Datei
+(nach ``_prepare_eval``: Keyframes + Holdout-Gewichte gesetzt) einmal als
+Kopie gespeichert und jeder Kandidat in einem eigenen
+``blender -b --factory-startup`` gelöst (``solve_farm_worker.py``). Die
+Worker liefern Rohmetriken als JSON; Score und Gewinnerwahl bleiben im
+Coordinator, der Gewinner wird danach auf den Live-Clip angewendet.
+
+Opt-in: nur aktiv mit ``scene["tco_solve_farm"] = True``; sonst bleibt es
+beim sequentiellen In-Process-Pfad.
+
+``SolveFarm.poll()`` ist nicht-blockierend (Timer-Tick), ``wait()`` blockiert
+(Headless-Lauf).
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import bpy
+
+__all__ = (
+    "SolveFarm",
+    "farm_available",
+    "farm_worker_count",
+)
+
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solve_farm_worker.py")
+_JOB_TIMEOUT_DEFAULT = 300.0
+
+
+def farm_available() -> bool:
+    """Blender-Binary und Worker-Skript vorhanden?"""
+    binary = getattr(bpy.app, "binary_path", "") or ""
+    return bool(binary) and os.path.isfile(binary) and os.path.isfile(_WORKER_SCRIPT)
+
+
+def farm_worker_count(n_jobs: int, requested: int = 0) -> int:
+    """Anzahl paralleler Worker (0 = automatisch: Kerne − 1, max. Jobs)."""
+    cores = os.cpu_count() or 2
+    n = int(requested) if int(requested) > 0 else max(1, cores - 1)
+    return max(1, min(int(n_jobs), n))
+
+
+class SolveFarm:
+    """Pool aus ``blender -b``-Prozessen für eine Liste von Solve-Jobs."""
+
+    def __init__(
+        self,
+        clip,
+        candidates: Iterable[Tuple[str, int]],
+        *,
+        cam_defaults: Optional[Dict[str, Any]] = None,
+        seeds: Optional[Dict[Tuple[str, int], Dict[str, Any]]] = None,
+        holdouts: Iterable[str] = (),
+        center_box: float = 0.6,
+        workers: int = 0,
+        job_timeout: float = _JOB_TIMEOUT_DEFAULT,
+    ) -> None:
+        self.clip_name = clip.name
+        self.candidates: List[Tuple[str, int]] = list(candidates)
+        self.cam_defaults = dict(cam_defaults or {})
+        # Warm-Start-Intrinsics je Kandidat (nach den Defaults gesetzt)
+        self.seeds = dict(seeds or {})
+        self.holdouts = sorted(holdouts)
+        self.center_box = float(center_box)
+        self.workers = farm_worker_count(len(self.candidates), workers)
+        self.job_timeout = float(job_timeout)
+        self.tmpdir: Optional[str] = None
+        self.snapshot: Optional[str] = None
+        self._queue: List[Dict[str, Any]] = []
+        self._running: List[Tuple[subprocess.Popen, Dict[str, Any], float]] = []
+        self.results: List[Dict[str, Any]] = []
+        self.t0 = 0.0
+
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Snapshot schreiben, Jobs anlegen, erste Worker starten."""
+        self.t0 = time.perf_counter()
+        self.tmpdir = tempfile.mkdtemp(prefix="kt_solve_farm_")
+        self.snapshot = os.path.join(self.tmpdir, "snapshot.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=self.snapshot, copy=True, check_existing=False)
+        for i, (model, stage) in enumerate(self.candidates):
+            job = {
+                "clip": self.clip_name,
+                "model": model,
+                "stage": int(stage),
+                "cam_defaults": self.cam_defaults,
+                "warm": self.seeds.get((model, int(stage))) or {},
+                "holdouts": self.holdouts,
+                "center_box": self.center_box,
+                "out": os.path.join(self.tmpdir, f"result_{i}.json"),
+            }
+            job_path = os.path.join(self.tmpdir, f"job_{i}.json")
+            with open(job_path, "w", encoding="utf-8") as fh:
+                json.dump(job, fh)
+            job["path"] = job_path
+            self._queue.append(job)
+        self._fill()
+
+    def _spawn(self, job: Dict[str, Any]) -> subprocess.Popen:
+        threads = max(1, (os.cpu_count() or 2) // self.workers)
+        cmd = [
+            bpy.app.binary_path, "-b", "--factory-startup", "-noaudio",
+            "-t", str(threads),
+            self.snapshot, "--python", _WORKER_SCRIPT, "--", job["path"],
+        ]
+        return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def _fill(self) -> None:
+        while self._queue and len(self._running) < self.workers:
+            job = self._queue.pop(0)
+            try:
+                proc = self._spawn(job)
+            except Exception as exc:
+                self.results.append(self._failed(job, f"spawn: {exc!r}"))
+                continue
+            self._running.append((proc, job, time.perf_counter()))
+
+    @staticmethod
+    def _failed(job: Dict[str, Any], reason: str) -> Dict[str, Any]:
+        return {"model": job["model"], "stage": job["stage"], "ok": False, "error": reason}
+
+    def _collect(self, job: Dict[str, Any], returncode: Optional[int]) -> Dict[str, Any]:
+        try:
+            with open(job["out"], encoding="utf-8") as fh:
+                return json.load(fh)
+        except Exception:
+            return self._failed(job, f"no result (exit={returncode})")
+
+    # ------------------------------------------------------------------
+    def poll(self) -> bool:
+        """Beendete Worker einsammeln, neue starten; True, wenn alles fertig ist."""
+        now = time.perf_counter()
+        still: List[Tuple[subprocess.Popen, Dict[str, Any], float]] = []
+        for proc, job, started in self._running:
+            rc = proc.poll()
+            if rc is None and (now - started) > self.job_timeout:
+                proc.kill()
+                proc.wait()
+                self.results.append(self._failed(job, "timeout"))
+            elif rc is None:
+                still.append((proc, job, started))
+            else:
+                self.results.append(self._collect(job, rc))
+        self._running = still
+        self._fill()
+        return not self._running and not self._queue
+
+    def wait(self, interval: float = 0.1) -> List[Dict[str, Any]]:
+        while not self.poll():
+            time.sleep(interval)
+        return self.results
+
+    def wall_sec(self) -> float:
+        return time.perf_counter() - self.t0 if self.t0 else 0.0
+
+    def cancel(self) -> None:
+        for proc, _job, _t in self._running:
+            try:
+                proc.kill()
+                proc.wait()
+            except Exception:
+                pass
+        self._running = []
+        self._queue = []
+        self.cleanup()
+
+    def cleanup(self) -> None:
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+            self.tmpdir = None
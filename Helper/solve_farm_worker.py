@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/solve_farm_worker.py
+---------------------------
+Worker-Skript für ``Helper/solve_farm.py`` – läuft in einem eigenen
+``blender -b <snapshot.blend> --python solve_farm_worker.py -- <job.json>``.
+
+Ein Job = ein (Modell, Refine-Stufe)-Kandidat:
+  1. Kamera-Defaults zurücksetzen, Distortion-Modell, optionale Warm-Start-
+     Intrinsics (``job["warm"]``) + Refine-Stufe setzen
+     (wie ``CLIP_OT_tracking_coordinator._setup_model_refine``),
+  2. ``clip.solve_camera`` synchron (``EXEC_DEFAULT``) im Headless-Override,
+  3. Rohmetriken per ``solve_eval.collect_metrics`` + gelöste Intrinsics
+     (``solve_cache.read_intrinsics``) → JSON (``job["out"]``).
+
+Wird NICHT vom Add-on importiert; die Helfer werden per Dateipfad geladen,
+damit das Add-on im Worker nicht aktiviert sein muss (``--factory-startup``).
+"""
+import importlib.util
+import json
+import os
+import sys
+import time
+import traceback
+
+import bpy
+
+
+def _load(name: str):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"_kt_farm_{name}", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _job_path() -> str:
+    argv = sys.argv
+    if "--" not in argv:
+        raise SystemExit("solve_farm_worker: job path missing (… -- job.json)")
+    return argv[argv.index("--") + 1]
+
+
+def run_job(job: dict) -> dict:
+    solve_eval = _load("solve_eval")
+    headless = _load("headless")
+    solve_cache = _load("solve_cache")
+
+    clip = bpy.data.movieclips[job["clip"]]
+    tr = clip.tracking
+    cam = tr.camera
+    solve_cache.restore_intrinsics(cam, job.get("cam_defaults"))
+    cam.distortion_model = job["model"]
+    solve_cache.restore_intrinsics(cam, job.get("warm"))
+    solve_eval._set_refine_stage(tr.settings, int(job["stage"]))
+
+    t0 = time.perf_counter()
+    with headless.headless_clip_override(bpy.context, clip):
+        bpy.ops.clip.solve_camera('EXEC_DEFAULT')
+    dt = time.perf_counter() - t0
+
+    rec = tr.reconstruction
+    ok = bool(getattr(rec, "is_valid", False)) and len(getattr(rec, "cameras", [])) > 0
+    out = {
+        "model": job["model"],
+        "stage": int(job["stage"]),
+        "ok": ok,
+        "solve_sec": round(dt, 3),
+        "focal_length": float(getattr(cam, "focal_length", 0.0)),
+        "average_error": float(getattr(rec, "average_error", 0.0)),
+    }
+    if ok:
+        tracks = tr.objects.active.tracks if tr.objects.active else tr.tracks
+        names = set(job.get("holdouts") or ())
+        holdouts = {t for t in tracks if t.name in names}
+        hold_med, hold_p95, edge_gap, persist = solve_eval.collect_metrics(
+            clip, holdouts, center_box=float(job.get("center_box", 0.6))
+        )
+        out.update(hold_med=hold_med, hold_p95=hold_p95, edge_gap=edge_gap, persist=persist)
+        out["intrinsics"] = solve_cache.read_intrinsics(cam)
+    return out
+
+
+def main() -> None:
+    with open(_job_path(), encoding="utf-8") as fh:
+        job = json.load(fh)
+    try:
+        result = run_job(job)
+    except Exception as exc:
+        result = {"model": job.get("model"), "stage": job.get("stage"), "ok": False,
+                  "error": repr(exc), "trace": traceback.format_exc()}
+    with open(job["out"], "w", encoding="utf-8") as fh:
+        json.dump(result, fh)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,14 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List
 import bpy
-import math
+import numpy as np
+
+from .spike_kernel import spike_outliers, apply_spike_action, SpikeThresholdPlanner
+from .track_snapshot import get_track_snapshot, invalidate_track_snapshot
+from .trace import traced
+from .rna_profile import profiled_clip
 
 # Zwingend: segmentweises Cleanup (vom Nutzer gefordert)
 try:
@@ -15,7 +20,7 @@ except Exception as _ex:
 else:
     _CSS_IMPORT_ERR = None
 
-__all__ = ["run_marker_spike_filter_cycle"]
+__all__ = ["run_marker_spike_filter_cycle", "plan_spike_threshold"]
 
 
 # ---------------------------------------------------------------------------
@@ -32,73 +37,6 @@ def _get_active_clip(context) -> Optional[bpy.types.MovieClip]:
         return None
 
 
-def _get_tracks_collection(clip) -> Optional[bpy.types.bpy_prop_collection]:
-    try:
-        obj = clip.tracking.objects.active
-        if obj and getattr(obj, "tracks", None):
-            return obj.tracks
-    except Exception:
-        pass
-    try:
-        return clip.tracking.tracks
-    except Exception:
-        return None
-
-def _to_pixel(vec01, size_xy) -> Tuple[float, float]:
-    """Koordinate [0..1] → Pixel."""
-    return float(vec01[0]) * float(size_xy[0]), float(vec01[1]) * float(size_xy[1])
-
-
-def _collect_frame_velocities(
-    clip: bpy.types.MovieClip,
-) -> Dict[int, List[Tuple[bpy.types.MovieTrackingTrack,
-                          bpy.types.MovieTrackingMarker,
-                          bpy.types.MovieTrackingMarker,
-                          Tuple[float, float]]]]:
-    """
-    Pro Ziel-Frame f1: Liste (track, prev_marker, curr_marker, v=(dx/dt, dy/dt)).
-    - Gemutete Marker werden ignoriert.
-    - Lücken (dt>1) sind erlaubt; Geschwindigkeit wird auf dt normiert.
-    """
-    result: Dict[int, List[Tuple[bpy.types.MovieTrackingTrack,
-                                 bpy.types.MovieTrackingMarker,
-                                 bpy.types.MovieTrackingMarker,
-                                 Tuple[float, float]]]] = {}
-    size = getattr(clip, "size", (1.0, 1.0))
-    tracks = _get_tracks_collection(clip) or []
-
-    for tr in tracks:
-        markers: List[bpy.types.MovieTrackingMarker] = list(tr.markers)
-        if len(markers) < 2:
-            continue
-
-        prev = markers[0]
-        for i in range(1, len(markers)):
-            curr = markers[i]
-
-            # gemutete Marker nicht verwerten
-            if getattr(curr, "mute", False) or getattr(prev, "mute", False):
-                prev = curr
-                continue
-
-            f0 = int(getattr(prev, "frame", -10))
-            f1 = int(getattr(curr, "frame", -10))
-            dt = f1 - f0
-            if dt <= 0:
-                prev = curr
-                continue
-
-            x0, y0 = _to_pixel(prev.co, size)
-            x1, y1 = _to_pixel(curr.co, size)
-            vx = (x1 - x0) / float(dt)
-            vy = (y1 - y0) / float(dt)
-
-            result.setdefault(f1, []).append((tr, prev, curr, (vx, vy)))
-            prev = curr
-
-    return result
-
-
 def _apply_marker_outlier_filter(
     context: bpy.types.Context,
     *,
@@ -106,78 +44,29 @@ def _apply_marker_outlier_filter(
     action: str = "DELETE",
 ) -> int:
     """
-    Marker-Filter pro Frame:
-      - v_avg = Durchschnitt der Geschwindigkeiten
+    Marker-Filter pro Frame (vektorisiert, siehe ``spike_kernel``):
+      - v_avg = Durchschnitt der Geschwindigkeiten je Ziel-Frame
       - Kandidaten: Distanz zu v_avg > threshold_px
     action: "DELETE" (Default) | "MUTE" | "SELECT"
     Rückgabe: Anzahl betroffener Marker.
     """
-    clip = _get_active_clip(context)
+    clip = profiled_clip(_get_active_clip(context))
     if not clip:
         return 0
 
-    frame_map = _collect_frame_velocities(clip)
-    affected = 0
+    snap = get_track_snapshot(clip, use_active_object=True)
+    if snap is None:
+        return 0
+    size = getattr(clip, "size", (1.0, 1.0))
+    track_idx, frames, marker_idx = spike_outliers(snap, size, threshold_px)
+    if not track_idx.size:
+        return 0
 
     act = action.upper().strip()
-    do_delete = act == "DELETE"
-    do_mute   = act == "MUTE"
-    do_select = act == "SELECT"
-
-    # Pro Frame erst Kandidaten sammeln, dann **in Reverse** löschen → stabile Indizes.
-    for frame, entries in frame_map.items():
-        if not entries:
-            continue
-
-        # v_avg
-        sum_vx = 0.0
-        sum_vy = 0.0
-        for _, _, _, v in entries:
-            sum_vx += v[0]
-            sum_vy += v[1]
-        inv_n = 1.0 / float(len(entries))
-        v_avg = (sum_vx * inv_n, sum_vy * inv_n)
-
-        # Kandidaten bestimmen
-        to_handle: List[Tuple[bpy.types.MovieTrackingTrack, bpy.types.MovieTrackingMarker, float]] = []
-        for tr, m_prev, m_curr, v in entries:
-            dvx = v[0] - v_avg[0]
-            dvy = v[1] - v_avg[1]
-            dev = math.hypot(dvx, dvy)
-            if dev > threshold_px:
-                to_handle.append((tr, m_curr, dev))
-
-        if not to_handle:
-            continue
-
-        if do_delete:
-            for tr, m_curr, dev in reversed(to_handle):
-                try:
-                    # Sicherer Pfad: über Frame löschen (robuster als remove(marker))
-                    f = int(getattr(m_curr, "frame", -10))
-                    tr.markers.delete_frame(f)
-                    affected += 1
-                except Exception as ex:
-                    pass
-        elif do_mute:
-            for tr, m_curr, dev in to_handle:
-                try:
-                    m_curr.mute = True
-                    affected += 1
-                except Exception as ex:
-                    pass
-        elif do_select:
-            for tr, m_curr, dev in to_handle:
-                try:
-                    m_curr.select = True
-                    try:
-                        tr.select = True
-                    except Exception:
-                        pass
-                    affected += 1
-                except Exception as ex:
-                    pass
-
+    affected, touched = apply_spike_action(snap, track_idx, frames, marker_idx, act)
+    if act in ("MUTE", "SELECT") and touched:
+        # Mute/Select ändern die Markeranzahl nicht → Snapshot explizit informieren
+        invalidate_track_snapshot(clip, touched)
     return affected
 
 
@@ -185,6 +74,48 @@ def _apply_marker_outlier_filter(
 # Öffentliche API
 # ---------------------------------------------------------------------------
 
+def plan_spike_threshold(context: bpy.types.Context, schedule: List[float]) -> Dict[str, Any]:
+    """Quantil-Modus des SPIKE_CYCLE: wählt die Schwelle aus ``schedule``,
+    bei der ``run_find_max_marker_frame`` voraussichtlich FOUND meldet.
+
+    Rückgabe: {"status": "OK", "threshold": thr, "predicted_found": bool,
+               "simulated_deletions": n} | {"status": "FAILED", "reason": ...}
+    Ohne vorhergesagten Treffer wird die letzte Stufe der Folge geliefert.
+    """
+    if not schedule:
+        return {"status": "FAILED", "reason": "empty schedule"}
+    clip = profiled_clip(_get_active_clip(context))
+    if not clip:
+        return {"status": "FAILED", "reason": "no active MovieClip"}
+    scene = context.scene
+    try:
+        marker_frame = int(getattr(scene, "marker_frame", 0) or scene.get("marker_frame", 0) or 0)
+    except Exception:
+        marker_frame = 0
+    s_start = max(1, int(getattr(scene, "frame_start", 1) or 1))
+    s_end = int(getattr(scene, "frame_end", s_start) or s_start)
+    if s_end < s_start:
+        s_start, s_end = s_end, s_start
+    try:
+        snap = get_track_snapshot(clip, use_active_object=True)
+        planner = SpikeThresholdPlanner(
+            snap,
+            getattr(clip, "size", (1.0, 1.0)),
+            marker_frame=marker_frame,
+            scene_range=(s_start, s_end),
+        )
+        thr = planner.plan(schedule)
+    except Exception as ex:
+        return {"status": "FAILED", "reason": str(ex)}
+    return {
+        "status": "OK",
+        "threshold": float(thr if thr is not None else schedule[-1]),
+        "predicted_found": thr is not None,
+        "simulated_deletions": int(planner.simulated_deletions),
+    }
+
+
+@traced()
 def run_marker_spike_filter_cycle(
     context: bpy.types.Context,
     *,
@@ -260,7 +191,7 @@ def run_marker_spike_filter_cycle(
             break
 
         # 2) Prüfen, ob es noch Frames mit übermäßig vielen aktiven Markern gibt
-        clip = _get_active_clip(context)
+        clip = profiled_clip(_get_active_clip(context))
         scene = getattr(context, "scene", None)
         # Basiswert für das erlaubte Marker‑Limit: Szene.marker_frame
         marker_frame_value: float = 0.0
@@ -287,40 +218,23 @@ def run_marker_spike_filter_cycle(
             # Es gibt keine zuverlässige Grenze → Schleife beenden
             break
 
-        # Zähle aktive Marker pro Frame
-        frame_counts: Dict[int, int] = {}
+        # Zähle aktive Marker pro Frame (Snapshot statt Marker-Walk)
+        frame_counts = None
         try:
-            tracks = _get_tracks_collection(clip) or []
-            for tr in tracks:
-                try:
-                    markers = getattr(tr, "markers", [])
-                except Exception:
-                    markers = []
-                for m in markers:
-                    try:
-                        # ignoriere gemutete Marker
-                        if getattr(m, "mute", False):
-                            continue
-                        f = int(getattr(m, "frame", -10))
-                        frame_counts[f] = frame_counts.get(f, 0) + 1
-                    except Exception:
-                        pass
+            snap = get_track_snapshot(clip, use_active_object=True)
+            if snap is not None:
+                frames = snap.frame[~snap.mute]
+                if frames.size:
+                    frame_counts = np.bincount(frames - int(frames.min()))
         except Exception:
-            frame_counts = {}
+            frame_counts = None
 
         # Erlaubte Höchstgrenze
         threshold_limit = marker_frame_value * 1.5
 
         # Prüfen, ob mindestens ein Frame die Höchstgrenze überschreitet
-        too_many = False
-        for cnt in frame_counts.values():
-            try:
-                if float(cnt) > threshold_limit:
-                    too_many = True
-                    break
-            except Exception:
-                # Bei Fehlern lieber abbrechen
-                break
+        too_many = bool(frame_counts is not None and frame_counts.size
+                        and float(frame_counts.max()) > threshold_limit)
 
         # Wenn keine Frames die Grenze überschreiten → Schleife beenden
         if not too_many:
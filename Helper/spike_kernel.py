@@ -0,0 +1,328 @@
+# SPDX-License-Identifier: MIT
+"""
+Helper/spike_kernel.py
+----------------------
+Vektorisierter Kern des Marker-Spike-Filters.
+
+Arbeitet auf dem ``TrackSnapshot`` statt auf RNA-Markerlisten:
+  - Geschwindigkeiten (Pixel/Frame, auf dt normiert) für ALLE aufeinander-
+    folgenden Markerpaare eines Tracks in einem Schritt
+  - Mittelwert je Ziel-Frame f1 per ``np.bincount``
+  - Abweichung |v - v_avg(f1)| je Paar
+
+Semantik wie bisher in ``_collect_frame_velocities``: Paare mit gemutetem
+Marker sowie dt ≤ 0 werden verworfen, Lücken (dt > 1) sind erlaubt.
+Ausreißer werden als (Track-Index, Frame, Markerindex)-Arrays geliefert, damit
+der Aufrufer sie gebündelt löschen/muten/selektieren kann.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from .track_snapshot import TrackSnapshot
+
+__all__ = (
+    "SpikePairs",
+    "pair_velocities",
+    "pair_deviations",
+    "spike_outliers",
+    "apply_spike_action",
+    "SpikeThresholdPlanner",
+)
+
+
+class SpikePairs:
+    """Gültige Markerpaare (prev → curr) als parallele Arrays."""
+
+    __slots__ = ("curr", "track", "frame", "vx", "vy")
+
+    def __init__(self, curr: np.ndarray, track: np.ndarray, frame: np.ndarray,
+                 vx: np.ndarray, vy: np.ndarray) -> None:
+        self.curr = curr      # globaler Markerindex des Ziel-Markers
+        self.track = track    # Track-Index
+        self.frame = frame    # Ziel-Frame f1
+        self.vx = vx
+        self.vy = vy
+
+    def __len__(self) -> int:
+        return int(self.curr.size)
+
+
+def pair_velocities(snap: TrackSnapshot, size: Tuple[float, float]) -> SpikePairs:
+    """Geschwindigkeiten aller gültigen Paare aufeinanderfolgender Marker."""
+    n = snap.n_markers
+    if n < 2:
+        e = np.empty(0, dtype=np.int64)
+        return SpikePairs(e, e.astype(np.int32), e.astype(np.int32),
+                          np.empty(0, np.float64), np.empty(0, np.float64))
+    prev = np.arange(n - 1, dtype=np.int64)
+    curr = prev + 1
+    mt = snap.marker_track
+    fr = snap.frame.astype(np.int64)
+    dt = fr[curr] - fr[prev]
+    ok = (mt[prev] == mt[curr]) & ~snap.mute[prev] & ~snap.mute[curr] & (dt > 0)
+    prev, curr, dt = prev[ok], curr[ok], dt[ok]
+
+    w, h = float(size[0]), float(size[1])
+    co = snap.co.astype(np.float64)
+    vx = (co[curr, 0] - co[prev, 0]) * w / dt
+    vy = (co[curr, 1] - co[prev, 1]) * h / dt
+    return SpikePairs(curr, mt[curr], snap.frame[curr], vx, vy)
+
+
+def pair_deviations(pairs: SpikePairs) -> np.ndarray:
+    """|v - v_avg(f1)| je Paar; v_avg über alle Paare desselben Ziel-Frames."""
+    if not len(pairs):
+        return np.empty(0, dtype=np.float64)
+    f = pairs.frame.astype(np.int64)
+    f = f - int(f.min())
+    cnt = np.bincount(f)
+    cnt_safe = np.maximum(cnt, 1)
+    mx = np.bincount(f, weights=pairs.vx) / cnt_safe
+    my = np.bincount(f, weights=pairs.vy) / cnt_safe
+    return np.hypot(pairs.vx - mx[f], pairs.vy - my[f])
+
+
+def spike_outliers(
+    snap: TrackSnapshot,
+    size: Tuple[float, float],
+    threshold_px: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(Track-Indizes, Frames, Markerindizes) aller Marker mit dev > threshold_px."""
+    pairs = pair_velocities(snap, size)
+    dev = pair_deviations(pairs)
+    hit = dev > float(threshold_px)
+    return pairs.track[hit], pairs.frame[hit], pairs.curr[hit]
+
+
+def _group_by_track(track_idx: np.ndarray, values: np.ndarray) -> Dict[int, np.ndarray]:
+    if not track_idx.size:
+        return {}
+    order = np.argsort(track_idx, kind="stable")
+    t_sorted = track_idx[order]
+    v_sorted = values[order]
+    starts = np.flatnonzero(np.r_[True, t_sorted[1:] != t_sorted[:-1]])
+    ends = np.r_[starts[1:], t_sorted.size]
+    return {int(t_sorted[s]): v_sorted[s:e] for s, e in zip(starts, ends)}
+
+
+def apply_spike_action(
+    snap: TrackSnapshot,
+    track_idx: np.ndarray,
+    frames: np.ndarray,
+    marker_idx: np.ndarray,
+    action: str = "DELETE",
+) -> Tuple[int, Iterable[int]]:
+    """Wendet ``action`` gebündelt je Track an.
+
+    DELETE: ``markers.delete_frame`` je Frame (absteigend, ein Track-Lookup)
+    MUTE/SELECT: ein ``foreach_set`` je Track
+    Rückgabe: (Anzahl betroffener Marker, Pointer der angefassten Tracks).
+    """
+    act = str(action or "DELETE").upper().strip()
+    by_track = _group_by_track(track_idx, frames if act == "DELETE" else marker_idx)
+    if not by_track:
+        return 0, ()
+    ptrs = {int(snap.track_ptrs[t]): t for t in by_track}
+    rna = snap.resolve_tracks(ptrs)
+    affected = 0
+    for ptr, tr in rna.items():
+        vals = by_track[ptrs[ptr]]
+        try:
+            if act == "DELETE":
+                for f in np.sort(vals)[::-1].tolist():
+                    try:
+                        tr.markers.delete_frame(int(f))
+                        affected += 1
+                    except Exception:
+                        pass
+            elif act in ("MUTE", "SELECT"):
+                attr = "mute" if act == "MUTE" else "select"
+                sl = snap.track_slice(ptrs[ptr])
+                flags = (snap.mute if act == "MUTE" else snap.select)[sl].copy()
+                flags[vals - sl.start] = True
+                tr.markers.foreach_set(attr, flags)
+                if act == "SELECT":
+                    try:
+                        tr.select = True
+                    except Exception:
+                        pass
+                affected += int(vals.size)
+        except Exception:
+            continue
+    return affected, tuple(rna.keys())
+
+
+# ---------------------------------------------------------------------------
+# Schwellwert-Planung für den SPIKE_CYCLE (Quantil-Modus)
+# ---------------------------------------------------------------------------
+
+class SpikeThresholdPlanner:
+    """Simuliert die Spike-Schwellenfolge auf Arrays, ohne RNA anzufassen.
+
+    Alle Abweichungen werden einmal berechnet und absteigend sortiert; Stufen
+    der Schwellenfolge, oberhalb derer keine Abweichung liegt, werden ohne
+    Simulation übersprungen. Beim simulierten Löschen werden nur die
+    Nachfolger gelöschter Marker (neues Paar über die Lücke) und die Frames,
+    deren Mittelwert sich dadurch ändert, neu berechnet.
+
+    Nicht simuliert wird die Kaskade aus clean_short_segments /
+    clean_short_tracks / Split-Cleanup; diese löscht zusätzlich, sodass der
+    reale FOUND-Zeitpunkt eher früher (bei höherer Schwelle) liegt.
+    """
+
+    def __init__(
+        self,
+        snap: TrackSnapshot,
+        size: Tuple[float, float],
+        *,
+        marker_frame: int,
+        scene_range: Tuple[int, int],
+    ) -> None:
+        n = snap.n_markers
+        self.n = n
+        self.marker_frame = int(marker_frame)
+        self.found_threshold = max(0, int(marker_frame) - 1)
+        self.limit = float(marker_frame) * 1.5
+        self.scene_range = (int(scene_range[0]), int(scene_range[1]))
+
+        self.track = snap.marker_track.astype(np.int64)
+        self.mute = snap.mute.copy()
+        self.track_mute = snap.track_mute[self.track] if n else np.zeros(0, dtype=bool)
+        self.alive = np.ones(n, dtype=bool)
+        fr = snap.frame.astype(np.int64)
+        self.f0 = min(int(fr.min()) if n else self.scene_range[0], self.scene_range[0])
+        f1 = max(int(fr.max()) if n else self.scene_range[1], self.scene_range[1])
+        self.nf = f1 - self.f0 + 1
+        self.fo = fr - self.f0
+        w, h = float(size[0]), float(size[1])
+        self.px = snap.co[:, 0].astype(np.float64) * w if n else np.zeros(0)
+        self.py = snap.co[:, 1].astype(np.float64) * h if n else np.zeros(0)
+
+        prev = np.arange(n, dtype=np.int64) - 1
+        starts = snap.offsets[:-1][np.diff(snap.offsets) > 0]
+        prev[starts] = -1
+        self.prev = prev
+        self.valid = np.zeros(n, dtype=bool)
+        self.vx = np.zeros(n)
+        self.vy = np.zeros(n)
+        self._set_pairs(np.arange(n, dtype=np.int64))
+
+        v = self.valid
+        self.sx = np.bincount(self.fo[v], weights=self.vx[v], minlength=self.nf)
+        self.sy = np.bincount(self.fo[v], weights=self.vy[v], minlength=self.nf)
+        self.sc = np.bincount(self.fo[v], minlength=self.nf).astype(np.float64)
+        self.dev = np.full(n, -np.inf)
+        self._recompute_dev(np.flatnonzero(v))
+        # Einmalig sortiert: absteigende Abweichungen (Sprungziel-Vorauswahl)
+        self.sorted_dev = np.sort(self.dev[v])[::-1]
+
+        unmuted = ~self.mute
+        self.cnt_unmuted = np.bincount(self.fo[unmuted], minlength=self.nf)
+        active = unmuted & ~self.track_mute
+        self.cnt_active = np.bincount(self.fo[active], minlength=self.nf)
+        self.simulated_deletions = 0
+
+    # -- Paare -----------------------------------------------------------
+
+    def _set_pairs(self, curr: np.ndarray) -> None:
+        p = self.prev[curr]
+        has = p >= 0
+        ps = np.where(has, p, 0)
+        dt = self.fo[curr] - self.fo[ps]
+        ok = has & ~self.mute[curr] & ~self.mute[ps] & (dt > 0)
+        self.valid[curr] = ok
+        dts = np.where(ok, dt, 1)
+        self.vx[curr] = np.where(ok, (self.px[curr] - self.px[ps]) / dts, 0.0)
+        self.vy[curr] = np.where(ok, (self.py[curr] - self.py[ps]) / dts, 0.0)
+
+    def _recompute_dev(self, idx: np.ndarray) -> None:
+        if not idx.size:
+            return
+        f = self.fo[idx]
+        c = np.maximum(self.sc[f], 1.0)
+        self.dev[idx] = np.hypot(self.vx[idx] - self.sx[f] / c, self.vy[idx] - self.sy[f] / c)
+
+    def _accumulate(self, idx: np.ndarray, sign: float) -> None:
+        idx = idx[self.valid[idx]]
+        if not idx.size:
+            return
+        f = self.fo[idx]
+        np.add.at(self.sx, f, sign * self.vx[idx])
+        np.add.at(self.sy, f, sign * self.vy[idx])
+        np.add.at(self.sc, f, sign)
+
+    # -- Simulation --------------------------------------------------------
+
+    def _delete(self, dead: np.ndarray) -> None:
+        self.alive[dead] = False
+        alive_idx = np.flatnonzero(self.alive)
+        pos = np.searchsorted(alive_idx, dead)
+        has_next = pos < alive_idx.size
+        nxt = alive_idx[pos[has_next]]
+        nxt = np.unique(nxt[self.track[nxt] == self.track[dead[has_next]]])
+
+        # alte Beiträge (gelöschte Marker + deren Nachfolger) austragen
+        self._accumulate(dead, -1.0)
+        self._accumulate(nxt, -1.0)
+        self.valid[dead] = False
+        self.dev[dead] = -np.inf
+
+        # Nachfolger bilden ein neues Paar über die Lücke
+        if nxt.size:
+            ppos = np.searchsorted(alive_idx, nxt) - 1
+            cand = alive_idx[np.maximum(ppos, 0)]
+            self.prev[nxt] = np.where((ppos >= 0) & (self.track[cand] == self.track[nxt]), cand, -1)
+            self._set_pairs(nxt)
+            self._accumulate(nxt, +1.0)
+
+        # Abweichungen nur in Frames mit geändertem Mittelwert neu berechnen
+        touched = np.zeros(self.nf, dtype=bool)
+        touched[self.fo[dead]] = True
+        touched[self.fo[nxt]] = True
+        redo = np.flatnonzero(self.valid & touched[self.fo])
+        self._recompute_dev(redo)
+
+        unmuted = dead[~self.mute[dead]]
+        np.subtract.at(self.cnt_unmuted, self.fo[unmuted], 1)
+        active = unmuted[~self.track_mute[unmuted]]
+        np.subtract.at(self.cnt_active, self.fo[active], 1)
+        self.simulated_deletions += int(dead.size)
+
+    def _simulate_pass(self, thr: float) -> None:
+        """Bildet die innere Schleife von ``run_marker_spike_filter_cycle`` nach."""
+        thr = max(2.0, float(thr))
+        while True:
+            dead = np.flatnonzero(self.valid & (self.dev > thr))
+            if not dead.size:
+                return
+            self._delete(dead)
+            if self.marker_frame <= 0 or not (self.cnt_unmuted.max(initial=0) > self.limit):
+                return
+
+    def _predict_found(self) -> bool:
+        s, e = self.scene_range
+        lo, hi = max(0, s - self.f0), min(self.nf - 1, e - self.f0)
+        if hi < lo:
+            return False
+        return bool((self.cnt_active[lo:hi + 1] <= self.found_threshold).any())
+
+    def plan(self, schedule) -> Optional[float]:
+        """Erste Schwelle der Folge, bei der FIND_MAX voraussichtlich FOUND meldet.
+
+        Stufen oberhalb der größten Abweichung löschen nichts und werden ohne
+        Simulation übersprungen. Liefert None, wenn keine Stufe FOUND erreicht.
+        """
+        if self._predict_found():
+            return float(schedule[0]) if len(schedule) else None
+        for thr in schedule:
+            top = self.dev[self.valid].max(initial=-np.inf) if self.simulated_deletions else (
+                self.sorted_dev[0] if self.sorted_dev.size else -np.inf)
+            if top <= max(2.0, float(thr)):
+                continue
+            self._simulate_pass(thr)
+            if self._predict_found():
+                return float(thr)
+        return None
@@ -2,11 +2,16 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 import bpy
-from typing import Iterable, List, Tuple, Set, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional
 
 from .naming import _safe_name
 from .segments import get_track_segments, track_has_internal_gaps
+from .segment_runs import count_in_runs, segment_runs, track_marker_arrays, track_segment_runs
 from .mute_ops import mute_marker_path, mute_unassigned_markers
+from .track_removal import remove_tracks
+from .track_split import split_tracks_by_segments
+from .clip_context import find_clip_editor
+from .trace import traced
 
 # --------------------------------------------------------------------------
 # Console logging
@@ -76,40 +81,13 @@ def _segments_by_consecutive_frames_unmuted(track) -> List[List[int]]:
     Dope-Sheet-konforme Segmentierung über ungemutete Markerframes.
     Segmentbruch, wenn Frame-Lücke (f != last+1) vorliegt.
     """
-    try:
-        frames = sorted({
-            int(m.frame)
-            for m in getattr(track, "markers", [])
-            if (
-                hasattr(m, "frame") and m.frame is not None
-                and not getattr(m, "mute", False)
-                and not getattr(m, "is_estimated", False)  # NEW: Estimated als Lücke behandeln
-            )
-        })
-    except Exception:
-        frames = []
-
-    if not frames:
-        return []
-
-    segs: List[List[int]] = []
-    curr: List[int] = [frames[0]]
-    for f in frames[1:]:
-        diff = int(f) - int(curr[-1])
-        missing = diff - 1
-        if missing >= 1:
-            segs.append(curr)
-            curr = [f]
-        else:
-            curr.append(f)
-    if curr:
-        segs.append(curr)
+    segs = track_segment_runs(track, "UNMUTED").frame_lists()
     if _dbg_enabled():
         try:
             # Silence console output via the no-op logger.
             _log(
                 f"[SegDBG][unmuted_segments] track={track.name} "
-                f"unmuted_frames={len(frames)} segs={len(segs)} "
+                f"unmuted_frames={sum(len(s) for s in segs)} segs={len(segs)} "
                 f"sample0={segs[0][:8] if segs else []}"
             )
         except Exception:
@@ -117,106 +95,40 @@ def _segments_by_consecutive_frames_unmuted(track) -> List[List[int]]:
     return segs
 
 
-def _keep_exact_frames(
-    track: bpy.types.MovieTrackingTrack,
-    keep_frames: Set[int],
-    *, area, region, space, window
-) -> None:
-    """
-    Harter Zuschnitt auf eine exakte Frame-Menge:
-    - Löscht alle Marker, deren Frame **nicht** in keep_frames liegt.
-    - Unmutet die verbleibenden Marker zur Sichtbarkeitskonsistenz.
-    """
-    if not keep_frames:
-        return
-    with bpy.context.temp_override(
-        window=window, screen=window.screen if window else None,
-        area=area, region=region, space_data=space
-    ):
-        if _dbg_enabled():
-            snap_before = _snapshot_track(track)
-            # Silence console output via the no-op logger.
-            _log(
-                f"[SplitDBG][keep_exact] track={track.name} keep={len(keep_frames)} "
-                f"keep_head={sorted(list(keep_frames))[:8]}"
-            )
-        for m in list(track.markers)[::-1]:
-            try:
-                f = int(getattr(m, "frame", -10))
-                if f not in keep_frames:
-                    track.markers.delete_frame(f)
-            except Exception:
-                pass
-        for m in getattr(track, "markers", []):
-            try:
-                if int(getattr(m, "frame", -10)) in keep_frames:
-                    m.mute = False
-            except Exception:
-                pass
-        if _dbg_enabled():
-            segs_all = list(get_track_segments(track))
-            segs_unm = _segments_by_consecutive_frames_unmuted(track)
-            snap_after = _snapshot_track(track)
-            # Silence console output via the no-op logger.
-            _log(
-                f"[SplitDBG][keep_exact][post] track={track.name} "
-                f"segs_all={len(segs_all)} segs_unmuted={len(segs_unm)} "
-                f"snapshot_before={snap_before} snapshot_after={snap_after}"
-            )
-
-
 def _segment_lengths_unmuted(track: bpy.types.MovieTrackingTrack) -> List[int]:
     """Ermittelt Längen aller un-gemuteten, zusammenhängenden Segmente in Markeranzahl."""
-    segs = list(get_track_segments(track))
-    fb = _segments_by_consecutive_frames_unmuted(track)
+    try:
+        frame, mute, est = track_marker_arrays(track)
+    except Exception:
+        return []
+    live = ~mute if est is None else ~(mute | est)
+    segs = segment_runs(frame, rule="ALL")
+    fb = segment_runs(frame, mute=mute, estimated=est, rule="UNMUTED")
     if len(fb) > len(segs):
-        segs = fb
-
-    lengths: List[int] = []
-    for seg in segs:
-        count = 0
-        for m in getattr(track, "markers", []):
-            try:
-                # NEW: Estimated/Muted grundsätzlich nicht zählen
-                if getattr(m, "mute", False) or getattr(m, "is_estimated", False):
-                    continue
-                f = getattr(m, "frame", None)
-                if f is None:
-                    continue
-                if isinstance(seg, (list, tuple)):
-                    if len(seg) and isinstance(seg[0], int):
-                        if int(f) in seg:
-                            count += 1
-                    else:
-                        if m in seg:
-                            count += 1
-            except Exception:
-                pass
-        lengths.append(count)
-    return lengths
+        return fb.length.tolist()
+    # Estimated/Muted grundsätzlich nicht zählen
+    return count_in_runs(segs, live).tolist()
 
 
 def _delete_tracks_by_max_unmuted_seg_len(
     context, tracks: Iterable[bpy.types.MovieTrackingTrack], min_len: int
 ) -> int:
-    """Löscht Tracks, deren längstes un-gemutetes Segment < min_len ist."""
+    """Löscht Tracks, deren längstes un-gemutetes Segment < min_len ist (ein Durchgang)."""
     clip = getattr(getattr(context, "space_data", None), "clip", None)
     if clip is None:
         return 0
 
-    deleted = 0
-    survivors = []
+    doomed: List[int] = []
     for t in list(tracks):
         try:
             max_len = max(_segment_lengths_unmuted(t)) if t else 0
             if max_len < int(min_len):
-                clip.tracking.tracks.remove(t)
-                deleted += 1
-            else:
-                survivors.append(t)
+                doomed.append(int(t.as_pointer()))
         except Exception:
-            survivors.append(t)
-    return deleted
+            pass
+    if not doomed:
+        return 0
+    return int(remove_tracks(clip, doomed)["removed"])
 
 
 def _apply_keep_only_segment(
@@ -362,118 +274,14 @@ def _delete_first_segment(
             )
 
 
-def _dup_once_with_ui(context, area, region, space, track) -> bpy.types.MovieTrackingTrack | None:
-    """Dupliziert **einmal** via copy/paste und liefert die neue Kopie (oder None)."""
-    clip = space.clip
-    window = context.window
-    with context.temp_override(
-        window=window, screen=window.screen if window else None,
-        area=area, region=region, space_data=space
-    ):
-        try:
-            for t in clip.tracking.tracks:
-                t.select = False
-            track.select = True
-            names_before = {t.name for t in clip.tracking.tracks}
-            bpy.ops.clip.copy_tracks()
-            bpy.ops.clip.paste_tracks()
-            new_track = None
-            for t in clip.tracking.tracks:
-                if t.name not in names_before:
-                    new_track = t
-                    break
-        except Exception:
-            new_track = None
-        if _dbg_enabled():
-            # Silence console output via the no-op logger.
-            _log(f"[SplitDBG][dup] base={track.name} new={(new_track.name if new_track else None)}")
-        try:
-            deps = context.evaluated_depsgraph_get()
-            deps.update()
-            bpy.context.view_layer.update()
-            region.tag_redraw()
-        except Exception:
-            pass
-        return new_track
-
-
-# ------------------------------------------------------------
-# Deterministischer One-Pass Split pro Track
-# ------------------------------------------------------------
-
-def _split_track_by_all_segments(
-    context, area, region, space, track: bpy.types.MovieTrackingTrack
-) -> None:
-    """
-    Nicht-iterativer, deterministischer Split:
-    - Ermittelt alle Segmente **auf Gesamtsicht** (get_track_segments).
-    - Dupliziert (k-1)× für k Segmente.
-    - Schneidet Original + Duplikate jeweils auf **exakt** ihr Zielsegment (harte Frame-Menge).
-    """
-    clip = space.clip
-    window = context.window
-    segs_all = list(get_track_segments(track))  # zählt ALLE Marker (auch muted/estimated)
-    if len(segs_all) <= 1:
-        return
-    if _dbg_enabled():
-        # Silence console output via the no-op logger.
-        _log(
-            f"[SplitDBG][split_by_all] track={track.name} segs={len(segs_all)} "
-            f"heads={[s[:3] for s in segs_all[:3]]}"
-        )
-    # Duplikate erzeugen (für Segmente 1..k-1)
-    dup_list: List[bpy.types.MovieTrackingTrack] = []
-    for _ in range(1, len(segs_all)):
-        new_tr = _dup_once_with_ui(context, area, region, space, track)
-        if new_tr:
-            dup_list.append(new_tr)
-    # Zuordnen: Original → seg[0], Duplikate → seg[1], seg[2], ...
-    targets: List[Tuple[bpy.types.MovieTrackingTrack, Set[int]]] = []
-    targets.append((track, {int(f) for f in segs_all[0]}))
-    for i, d in enumerate(dup_list, start=1):
-        if i < len(segs_all):
-            targets.append((d, {int(f) for f in segs_all[i]}))
-    # Harte Zuschnitte
-    for trk, keep in targets:
-        _keep_exact_frames(trk, keep, area=area, region=region, space=space, window=window)
-        if _dbg_enabled():
-            segs_now = list(get_track_segments(trk))
-            # Silence console output via the no-op logger.
-            _log(
-                f"[SplitDBG][split_by_all][post] track={trk.name} segs_now={len(segs_now)}"
-            )
-    # Depsgraph/UI refresh (defensiv)
-    try:
-        deps = context.evaluated_depsgraph_get()
-        deps.update()
-        bpy.context.view_layer.update()
-        region.tag_redraw()
-    except Exception:
-        pass
-
-
 # ------------------------------------------------------------
 # Öffentliche Hauptfunktion
 # ------------------------------------------------------------
 
 def _find_clip_editor_override() -> Dict[str, Any]:
-    """Suche eine CLIP_EDITOR-Area und baue ein temp_override-Dict.
+    """temp_override-Dict eines CLIP_EDITOR (gecacht, siehe ``clip_context``).
     Liefert ggf. {} wenn nichts gefunden wird."""
-    wm = getattr(bpy.context, "window_manager", None)
-    if not wm:
-        return {}
-    for win in wm.windows:
-        scr = getattr(win, "screen", None)
-        if not scr:
-            continue
-        for area in scr.areas:
-            if area.type != "CLIP_EDITOR":
-                continue
-            region = next((r for r in area.regions if r.type == "WINDOW"), None)
-            space = area.spaces.active if hasattr(area, "spaces") else None
-            if region and space:
-                return {"window": win, "area": area, "region": region, "space_data": space, "scene": bpy.context.scene}
-    return {}
+    return find_clip_editor() or {}
 
 def _resolve_clip(context: bpy.types.Context, space: Optional[Any]) -> Optional[Any]:
     """Robuste Clip-Auflösung."""
@@ -495,6 +303,7 @@ def _to_list(value) -> list:
     except Exception:
         return []
 
+@traced()
 def recursive_split_cleanup(context,
                             area: Optional[Any] = None,
                             region: Optional[Any] = None,
@@ -551,10 +360,15 @@ def recursive_split_cleanup(context,
                 f"segs_unmuted={len(_segments_by_consecutive_frames_unmuted(t))} snapshot={snap}"
             )
 
-    # Deterministischer One-Pass-Split pro Track
+    # Deterministischer One-Pass-Split aller Tracks (ein Depsgraph-Update)
     try:
-        for t in list(tracks_list):
-            _split_track_by_all_segments(context, area, region, space, t)
+        split_res = split_tracks_by_segments(context, tracks_list)
+        if _dbg_enabled():
+            # Silence console output via the no-op logger.
+            _log(
+                f"[SplitDBG][split_by_all] split={split_res['tracks_split']} "
+                f"created={split_res['tracks_created']} trimmed={split_res['markers_removed']}"
+            )
     except Exception:
         pass
 
@@ -0,0 +1,339 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/trace.py
+---------------
+Strukturiertes Span-Tracing für Coordinator-Läufe (Chrome-Trace-Export).
+
+Ein Span (``span(name, cat=...)`` bzw. Dekorator ``traced``) erfasst:
+
+  - Wandzeit (``perf_counter_ns``) und CPU-Zeit (``process_time_ns``),
+  - Track- und Markeranzahl des aktiven Clips davor/danach,
+  - Anzahl ``bpy.ops``-Aufrufe innerhalb des Spans (inklusive Kinder).
+
+Kategorien: ``phase`` (Coordinator-Schritt), ``helper`` (Helper-Aufrufe),
+``ops`` (jeder ``bpy.ops``-Aufruf; per ``patch_ops`` um den Operator-Aufruf
+gelegt), ``log`` (Instant-Events aus ``trace_log``).
+
+Die Events liegen in einem Ringpuffer (``deque(maxlen=...)``); der Export
+``export_chrome_trace(path)`` schreibt JSON im Trace-Event-Format für
+chrome://tracing bzw. Perfetto. Optional sammelt ``profile_phase`` je Phase
+ein ``cProfile`` (``dump_profiles(dir)`` → ``<phase>.prof``).
+
+Außerhalb von ``start_trace``/``stop_trace`` kosten Spans nur einen Flag-Test.
+"""
+from __future__ import annotations
+
+import cProfile
+import functools
+import json
+import os
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+import bpy
+
+__all__ = (
+    "start_trace",
+    "stop_trace",
+    "is_tracing",
+    "span",
+    "traced",
+    "trace_log",
+    "profile_phase",
+    "patch_ops",
+    "unpatch_ops",
+    "export_chrome_trace",
+    "dump_profiles",
+    "trace_stats",
+    "clear_trace",
+)
+
+_DEFAULT_CAPACITY = 50000
+
+_STATE: Dict[str, Any] = {
+    "on": False,
+    "t0": 0,
+    "ops": 0,          # laufender Zähler aller bpy.ops-Aufrufe
+    "dropped": 0,
+    "profile": False,
+}
+_EVENTS: Deque[Dict[str, Any]] = deque(maxlen=_DEFAULT_CAPACITY)
+_PROFILES: Dict[str, cProfile.Profile] = {}
+_OPS_PATCH: Dict[str, Any] = {}
+
+
+def is_tracing() -> bool:
+    return bool(_STATE["on"])
+
+
+def start_trace(*, capacity: int = _DEFAULT_CAPACITY, profile: bool = False, ops: bool = True) -> None:
+    """Tracing einschalten (Ringpuffer neu anlegen)."""
+    global _EVENTS
+    _EVENTS = deque(maxlen=max(1000, int(capacity)))
+    _PROFILES.clear()
+    _STATE.update(on=True, t0=time.perf_counter_ns(), ops=0, dropped=0, profile=bool(profile))
+    if ops:
+        patch_ops()
+
+
+def stop_trace() -> None:
+    _STATE["on"] = False
+    unpatch_ops()
+
+
+def clear_trace() -> None:
+    stop_trace()
+    _EVENTS.clear()
+    _PROFILES.clear()
+
+
+# ---------------------------------------------------------------------------
+# Zählungen
+# ---------------------------------------------------------------------------
+
+def _current_clip():
+    ctx = bpy.context
+    clip = getattr(ctx, "edit_movieclip", None)
+    if clip is None:
+        clip = getattr(getattr(ctx, "space_data", None), "clip", None)
+    if clip is None:
+        try:
+            clip = next(iter(bpy.data.movieclips), None)
+        except Exception:
+            clip = None
+    return clip
+
+
+def _counts(clip) -> Optional[List[int]]:
+    if clip is None:
+        return None
+    try:
+        tr = clip.tracking
+        tracks = tr.objects.active.tracks if tr.objects.active else tr.tracks
+        return [len(tracks), sum(len(t.markers) for t in tracks)]
+    except Exception:
+        return None
+
+
+def _push(ev: Dict[str, Any]) -> None:
+    if len(_EVENTS) == _EVENTS.maxlen:
+        _STATE["dropped"] += 1
+    _EVENTS.append(ev)
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def span(name: str, *, cat: str = "helper", clip=None, counts: bool = True,
+         args: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Dict[str, Any]]]:
+    """Zeitspanne als Chrome-"X"-Event; liefert das Arg-Dict (ergänzbar) bzw. None."""
+    if not _STATE["on"]:
+        yield None
+        return
+    c = (clip if clip is not None else _current_clip()) if counts else None
+    before = _counts(c)
+    extra: Dict[str, Any] = dict(args or {})
+    ops0 = _STATE["ops"]
+    cpu0 = time.process_time_ns()
+    t0 = time.perf_counter_ns()
+    try:
+        yield extra
+    except BaseException as exc:
+        extra["error"] = repr(exc)
+        raise
+    finally:
+        t1 = time.perf_counter_ns()
+        cpu1 = time.process_time_ns()
+        extra["cpu_ms"] = round((cpu1 - cpu0) / 1e6, 3)
+        extra["ops_calls"] = _STATE["ops"] - ops0
+        if before is not None:
+            after = _counts(c)
+            extra["tracks_before"], extra["markers_before"] = before
+            if after is not None:
+                extra["tracks_after"], extra["markers_after"] = after
+        _push({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (t0 - _STATE["t0"]) / 1000.0,
+            "dur": (t1 - t0) / 1000.0,
+            "args": extra,
+        })
+
+
+def traced(name: Optional[str] = None, *, cat: str = "helper", counts: bool = True) -> Callable:
+    """Dekorator: Helper-Aufruf als Span (nur bei aktivem Tracing)."""
+    def deco(fn: Callable) -> Callable:
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not _STATE["on"]:
+                return fn(*a, **kw)
+            with span(label, cat=cat, counts=counts):
+                return fn(*a, **kw)
+        return wrapper
+    return deco
+
+
+def trace_log(*args: Any, **kwargs: Any) -> None:
+    """Instant-Event (ersetzt No-Op-Logger, solange Tracing aktiv ist)."""
+    if not _STATE["on"]:
+        return
+    _push({
+        "name": " ".join(str(a) for a in args)[:200],
+        "cat": "log",
+        "ph": "i",
+        "s": "t",
+        "ts": (time.perf_counter_ns() - _STATE["t0"]) / 1000.0,
+    })
+
+
+@contextmanager
+def profile_phase(phase: str) -> Iterator[None]:
+    """cProfile je Phase akkumulieren (nur mit ``start_trace(profile=True)``)."""
+    if not (_STATE["on"] and _STATE["profile"]):
+        yield
+        return
+    prof = _PROFILES.get(phase)
+    if prof is None:
+        prof = _PROFILES[phase] = cProfile.Profile()
+    try:
+        prof.enable()
+    except Exception:
+        # anderer Profiler aktiv → ohne Profil weiter
+        yield
+        return
+    try:
+        yield
+    finally:
+        prof.disable()
+
+
+# ---------------------------------------------------------------------------
+# bpy.ops-Patch
+# ---------------------------------------------------------------------------
+
+def _op_class():
+    try:
+        return type(bpy.ops.clip.detect_features)
+    except Exception:
+        return None
+
+
+def patch_ops() -> bool:
+    """Operator-Aufruf (``_BPyOpsSubModOp.__call__``) zählen und als Span erfassen."""
+    if _OPS_PATCH:
+        return True
+    cls = _op_class()
+    orig = getattr(cls, "__call__", None) if cls is not None else None
+    if orig is None:
+        return False
+
+    def __call__(self, *args, **kwargs):
+        if not _STATE["on"]:
+            return orig(self, *args, **kwargs)
+        try:
+            idname = self.idname_py()
+        except Exception:
+            idname = "ops"
+        with span(f"ops.{idname}", cat="ops", counts=False):
+            _STATE["ops"] += 1
+            return orig(self, *args, **kwargs)
+
+    try:
+        cls.__call__ = __call__
+    except Exception:
+        return False
+    _OPS_PATCH.update(cls=cls, orig=orig)
+    return True
+
+
+def unpatch_ops() -> None:
+    if not _OPS_PATCH:
+        return
+    try:
+        _OPS_PATCH["cls"].__call__ = _OPS_PATCH["orig"]
+    except Exception:
+        pass
+    _OPS_PATCH.clear()
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _abspath(path: str) -> str:
+    target = bpy.path.abspath(path)
+    if target.startswith("//"):
+        target = os.path.join(os.getcwd(), target[2:])
+    return target
+
+
+def export_chrome_trace(path: str, *, metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Ringpuffer als Trace-Event-JSON schreiben (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    events = []
+    for ev in list(_EVENTS):
+        out = dict(ev)
+        out["pid"] = pid
+        out["tid"] = 1
+        events.append(out)
+    events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 1,
+                   "args": {"name": "Kaiserlich Tracker"}})
+    data = {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"dropped": _STATE["dropped"], "ops_calls": _STATE["ops"], **(metadata or {})},
+    }
+    target = _abspath(path)
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        with open(target, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, default=str)
+    except Exception as exc:
+        print(f"[Trace] Export fehlgeschlagen: {exc!r}")
+        return None
+    return target
+
+
+def dump_profiles(directory: str) -> List[str]:
+    """Je Phase ``<phase>.prof`` (pstats-Format) nach ``directory`` schreiben."""
+    out: List[str] = []
+    if not _PROFILES:
+        return out
+    base = _abspath(directory)
+    try:
+        os.makedirs(base, exist_ok=True)
+    except Exception:
+        return out
+    for phase, prof in _PROFILES.items():
+        fn = os.path.join(base, re.sub(r"[^A-Za-z0-9_.-]+", "_", phase) + ".prof")
+        try:
+            prof.dump_stats(fn)
+            out.append(fn)
+        except Exception:
+            pass
+    return out
+
+
+def trace_stats() -> Dict[str, Any]:
+    """Aggregat je Span-Name (Anzahl, Wand-/CPU-Zeit, Ops) für Summary/Log."""
+    agg: Dict[str, Dict[str, Any]] = {}
+    for ev in _EVENTS:
+        if ev.get("ph") != "X":
+            continue
+        a = agg.setdefault(ev["name"], {"n": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "ops_calls": 0, "cat": ev["cat"]})
+        a["n"] += 1
+        a["wall_ms"] += ev["dur"] / 1000.0
+        a["cpu_ms"] += ev["args"].get("cpu_ms", 0.0)
+        a["ops_calls"] += ev["args"].get("ops_calls", 0)
+    for a in agg.values():
+        a["wall_ms"] = round(a["wall_ms"], 3)
+        a["cpu_ms"] = round(a["cpu_ms"], 3)
+    return {"events": len(_EVENTS), "dropped": _STATE["dropped"], "spans": agg}
@@ -0,0 +1,190 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/track_removal.py
+-----------------------
+Gemeinsame Lösch-Engine für ganze Tracks.
+
+``remove_tracks(clip, ptrs)`` entfernt eine komplette Menge von Tracks in
+einem Durchgang:
+
+  - Existiert ``tracks.remove`` (neuere Blender-APIs), wird direkt über RNA
+    gelöscht – ohne Selektion und ohne UI-Override.
+  - Sonst (``MovieTrackingTracks`` bietet nur ``new()``) erfolgt EIN
+    ``clip.delete_track``-Aufruf: Selektion wird per ``foreach_get`` gesichert,
+    die Zielmenge per ``foreach_set`` angewählt und die Selektion der
+    verbliebenen Tracks anschließend wiederhergestellt. Netto ändert sich die
+    Selektion also nicht.
+
+Das Ergebnis wird über die Pointer verifiziert (removed/failed).
+
+``hull_track_mask(snap)`` erkennt "Hüllen" (Tracks ohne Marker oder mit
+ausschließlich gemuteten Markern) vektoriell aus dem ``TrackSnapshot``.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import bpy
+import numpy as np
+
+from .track_snapshot import TrackSnapshot, invalidate_track_snapshot
+from .clip_context import find_clip_editor
+from .rna_profile import unwrap_rna
+from .trace import traced
+
+__all__ = (
+    "remove_tracks",
+    "hull_track_mask",
+    "hull_track_ptrs",
+)
+
+
+# ---------------------------------------------------------------------------
+# Hüllen-Erkennung
+# ---------------------------------------------------------------------------
+
+def hull_track_mask(snap: TrackSnapshot) -> np.ndarray:
+    """Bool-Maske (T,) der Tracks ohne einen einzigen ungemuteten Marker."""
+    t = snap.n_tracks
+    if not t:
+        return np.zeros(0, dtype=bool)
+    live = np.bincount(snap.marker_track[~snap.mute], minlength=t)
+    return live == 0
+
+
+def hull_track_ptrs(snap: TrackSnapshot) -> List[int]:
+    return snap.track_ptrs[hull_track_mask(snap)].tolist()
+
+
+# ---------------------------------------------------------------------------
+# Interna
+# ---------------------------------------------------------------------------
+
+def _track_ptrs(tracks) -> np.ndarray:
+    return np.fromiter((int(t.as_pointer()) for t in tracks), dtype=np.int64)
+
+
+def _clip_editor_override(clip) -> Optional[Dict[str, Any]]:
+    """Override für einen CLIP_EDITOR; bevorzugt einen, der ``clip`` zeigt."""
+    return find_clip_editor(clip=clip)
+
+
+def _remove_via_rna(tracks, targets: List[Any]) -> None:
+    for tr in targets:
+        try:
+            tracks.remove(tr)
+        except Exception:
+            pass
+
+
+def _remove_via_operator(clip, tracks, want: np.ndarray) -> None:
+    """Ein ``delete_track``-Aufruf; Selektion wird gesichert und restauriert."""
+    ptrs = _track_ptrs(tracks)
+    n = len(ptrs)
+    saved = np.zeros(n, dtype=bool)
+    try:
+        tracks.foreach_get("select", saved)
+    except Exception:
+        pass
+    saved_by_ptr = dict(zip(ptrs.tolist(), saved.tolist()))
+    tracks.foreach_set("select", np.isin(ptrs, want))
+
+    ov = _clip_editor_override(clip)
+    space = ov.get("space_data") if ov else None
+    prev_clip = getattr(space, "clip", None) if space else None
+    try:
+        if ov:
+            if prev_clip != clip:
+                # Nur der hier angewählte Clip darf betroffen sein
+                space.clip = clip
+            with bpy.context.temp_override(**ov):
+                bpy.ops.clip.delete_track()
+        else:
+            bpy.ops.clip.delete_track()
+    finally:
+        if space is not None and prev_clip != clip:
+            try:
+                space.clip = prev_clip
+            except Exception:
+                pass
+        try:
+            rest = _track_ptrs(tracks)
+            tracks.foreach_set(
+                "select",
+                np.fromiter((saved_by_ptr.get(p, False) for p in rest.tolist()), dtype=bool, count=len(rest)),
+            )
+        except Exception:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+@traced()
+def remove_tracks(
+    clip: Optional[bpy.types.MovieClip],
+    ptrs: Iterable[int],
+    *,
+    tracks=None,
+) -> Dict[str, Any]:
+    """Entfernt alle Tracks mit den gegebenen ``as_pointer()``-Werten.
+
+    Rückgabe::
+        {"status": "OK"|"PARTIAL"|"NOOP"|"FAILED",
+         "removed": int, "failed": int,
+         "removed_ptrs": [...], "failed_ptrs": [...]}
+    """
+    want = np.unique(np.fromiter((int(p) for p in ptrs), dtype=np.int64))
+    # Löschen läuft über RNA/Operator-Grenzen → keine Profiling-Proxies
+    clip, tracks = unwrap_rna(clip), unwrap_rna(tracks)
+    out: Dict[str, Any] = {
+        "status": "NOOP",
+        "removed": 0,
+        "failed": 0,
+        "removed_ptrs": [],
+        "failed_ptrs": [],
+    }
+    if clip is None:
+        out["status"] = "FAILED" if want.size else "NOOP"
+        out["failed"] = int(want.size)
+        out["failed_ptrs"] = want.tolist()
+        return out
+    if tracks is None:
+        tracks = clip.tracking.tracks
+
+    try:
+        before = _track_ptrs(tracks)
+    except Exception:
+        before = np.empty(0, dtype=np.int64)
+    present = want[np.isin(want, before)]
+    if not present.size:
+        return out
+
+    try:
+        if hasattr(tracks, "remove"):
+            hit = set(present.tolist())
+            _remove_via_rna(tracks, [t for t in tracks if int(t.as_pointer()) in hit])
+        else:
+            _remove_via_operator(clip, tracks, present)
+    except Exception as exc:
+        print(f"[TrackRemoval] remove failed: {exc!r}")
+
+    try:
+        after = _track_ptrs(tracks)
+    except Exception:
+        after = before
+    gone = ~np.isin(present, after)
+    # Freigegebene Pointer werden wiederverwendet → Snapshot-Blöcke verwerfen
+    invalidate_track_snapshot(clip, present.tolist())
+    out["removed_ptrs"] = present[gone].tolist()
+    out["failed_ptrs"] = present[~gone].tolist()
+    out["removed"] = len(out["removed_ptrs"])
+    out["failed"] = len(out["failed_ptrs"])
+    if out["failed"] == 0:
+        out["status"] = "OK"
+    elif out["removed"]:
+        out["status"] = "PARTIAL"
+    else:
+        out["status"] = "FAILED"
+    return out
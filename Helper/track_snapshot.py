@@ -0,0 +1,364 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/track_snapshot.py
+------------------------
+Spaltenorientierter NumPy-Snapshot aller Marker eines Tracks-Containers.
+
+Statt pro Frame über ``clip.tracking.tracks`` zu laufen und ``find_frame`` bzw.
+``list(tr.markers)`` aufzurufen, liest ``TrackSnapshot`` die Markerdaten per
+``foreach_get`` in flache Arrays:
+
+    frame    (N,)   int32   – Marker-Frame (pro Track aufsteigend sortiert)
+    co       (N, 2) float32 – normalisierte Koordinate
+    mute     (N,)   bool    – Marker gemutet
+    select   (N,)   bool    – Marker selektiert
+    is_keyed (N,)   bool    – Marker gekeyt (nicht getrackt)
+
+Die Zuordnung Marker → Track erfolgt über ``offsets`` (T+1, ragged Layout):
+die Marker von Track ``i`` liegen in ``[offsets[i], offsets[i+1])``.
+
+``refresh()`` arbeitet inkrementell: neu gelesen werden nur Tracks, deren
+Pointer, Markeranzahl oder Identität (Name, erster/letzter Marker-Frame) sich
+geändert hat – ``as_pointer()``-Werte gelöschter Tracks werden wiederverwendet.
+Änderungen, die weder Anzahl noch Identität verändern (Mute, Koordinaten),
+meldet der Aufrufer über ``invalidate_track_snapshot(clip, ptrs)``; das
+Löschen (``track_removal.remove_tracks``) tut das selbst.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import bpy
+import numpy as np
+
+__all__ = (
+    "TrackSnapshot",
+    "get_track_snapshot",
+    "invalidate_track_snapshot",
+    "clear_track_snapshots",
+)
+
+
+class _TrackBlock:
+    """Markerdaten eines Tracks (intern; bei Änderungen ersetzt, nur die Selektion wird nachgeladen)."""
+
+    __slots__ = ("ptr", "name", "count", "frame", "co", "mute", "select", "is_keyed")
+
+    def __init__(self, track) -> None:
+        markers = track.markers
+        n = len(markers)
+        self.ptr = int(track.as_pointer())
+        self.name = str(track.name)
+        self.count = n
+        self.frame = np.empty(n, dtype=np.int32)
+        co = np.empty(2 * n, dtype=np.float32)
+        self.mute = np.empty(n, dtype=bool)
+        self.select = np.empty(n, dtype=bool)
+        self.is_keyed = np.empty(n, dtype=bool)
+        if n:
+            markers.foreach_get("frame", self.frame)
+            markers.foreach_get("co", co)
+            markers.foreach_get("mute", self.mute)
+            markers.foreach_get("select", self.select)
+            markers.foreach_get("is_keyed", self.is_keyed)
+        self.co = co.reshape(n, 2)
+
+
+def _same_track(blk: _TrackBlock, track, n: int) -> bool:
+    """Billiger Identitätsabgleich: Anzahl, Name, erster/letzter Marker-Frame."""
+    if blk.count != n or blk.name != track.name:
+        return False
+    if not n:
+        return True
+    markers = track.markers
+    return int(markers[0].frame) == int(blk.frame[0]) and int(markers[n - 1].frame) == int(blk.frame[-1])
+
+
+def _concat(parts: List[np.ndarray], dtype, shape_tail: Tuple[int, ...] = ()) -> np.ndarray:
+    if not parts:
+        return np.empty((0,) + shape_tail, dtype=dtype)
+    return np.concatenate(parts).astype(dtype, copy=False)
+
+
+class TrackSnapshot:
+    """Flache Marker-Arrays für einen Tracks-Container (siehe Modul-Docstring)."""
+
+    def __init__(self, tracks) -> None:
+        self.tracks = tracks
+        self._blocks: Dict[int, _TrackBlock] = {}
+        self._dirty: set = set()
+        self._order: Tuple[int, ...] = ()
+
+        self.track_ptrs = np.empty(0, dtype=np.int64)
+        self.track_names: List[str] = []
+        self.track_mute = np.empty(0, dtype=bool)
+        self.track_select = np.empty(0, dtype=bool)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.marker_track = np.empty(0, dtype=np.int32)
+        self.frame = np.empty(0, dtype=np.int32)
+        self.co = np.empty((0, 2), dtype=np.float32)
+        self.mute = np.empty(0, dtype=bool)
+        self.select = np.empty(0, dtype=bool)
+        self.is_keyed = np.empty(0, dtype=bool)
+        self._ptr_index: Dict[int, int] = {}
+
+    # ------------------------------------------------------------------
+    # Aktualisierung
+    # ------------------------------------------------------------------
+
+    def invalidate(self, ptrs: Optional[Iterable[int]] = None) -> None:
+        """Markiert Tracks (oder alle) zum Neulesen beim nächsten ``refresh``."""
+        if ptrs is None:
+            self._blocks.clear()
+            self._order = ()
+            return
+        for p in ptrs:
+            try:
+                self._dirty.add(int(p))
+            except Exception:
+                pass
+
+    def refresh(self) -> int:
+        """Gleicht den Snapshot mit RNA ab. Rückgabe: Anzahl neu gelesener Tracks."""
+        tracks = list(self.tracks) if self.tracks is not None else []
+        order: List[int] = []
+        readable = []
+        blocks: Dict[int, _TrackBlock] = {}
+        reread = 0
+        for tr in tracks:
+            try:
+                ptr = int(tr.as_pointer())
+                blk = self._blocks.get(ptr)
+                if blk is None or ptr in self._dirty or not _same_track(blk, tr, len(tr.markers)):
+                    blk = _TrackBlock(tr)
+                    reread += 1
+            except Exception:
+                continue
+            blocks[ptr] = blk
+            order.append(ptr)
+            readable.append(tr)
+        self._dirty.clear()
+
+        # Track-Flags sind billig und werden immer vektoriell gelesen
+        t = len(tracks)
+        t_mute = np.zeros(t, dtype=bool)
+        t_select = np.zeros(t, dtype=bool)
+        try:
+            if t:
+                self.tracks.foreach_get("mute", t_mute)
+                self.tracks.foreach_get("select", t_select)
+        except Exception:
+            pass
+        if len(order) != t:
+            # Einzelne Tracks waren nicht lesbar → Flags per Track nachziehen
+            t_mute = np.array([bool(getattr(tr, "mute", False)) for tr in readable], dtype=bool)
+            t_select = np.array([bool(getattr(tr, "select", False)) for tr in readable], dtype=bool)
+        self.track_mute = t_mute
+        self.track_select = t_select
+
+        new_order = tuple(order)
+        if reread or _removed_any(self._blocks, blocks) or new_order != self._order:
+            self._blocks = blocks
+            self._order = new_order
+            self._rebuild()
+        return reread
+
+    def reload_selection(self) -> None:
+        """Liest die Marker-Selektion aller Tracks neu (Selektion ändert die
+        Markeranzahl nicht und wäre sonst veraltet)."""
+        if self.tracks is None or not self._order:
+            return
+        parts = []
+        for tr in self.tracks:
+            try:
+                blk = self._blocks.get(int(tr.as_pointer()))
+            except Exception:
+                blk = None
+            if blk is None:
+                continue
+            if blk.count:
+                try:
+                    tr.markers.foreach_get("select", blk.select)
+                except Exception:
+                    pass
+        for p in self._order:
+            parts.append(self._blocks[p].select)
+        self.select = _concat(parts, bool)
+
+    def _rebuild(self) -> None:
+        blks = [self._blocks[p] for p in self._order]
+        counts = np.fromiter((b.count for b in blks), dtype=np.int64, count=len(blks))
+        self.offsets = np.zeros(len(blks) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self.track_ptrs = np.fromiter(self._order, dtype=np.int64, count=len(blks))
+        self.track_names = [b.name for b in blks]
+        self._ptr_index = {p: i for i, p in enumerate(self._order)}
+        self.marker_track = np.repeat(np.arange(len(blks), dtype=np.int32), counts)
+        self.frame = _concat([b.frame for b in blks], np.int32)
+        self.co = _concat([b.co for b in blks], np.float32, (2,))
+        self.mute = _concat([b.mute for b in blks], bool)
+        self.select = _concat([b.select for b in blks], bool)
+        self.is_keyed = _concat([b.is_keyed for b in blks], bool)
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def iter_blocks(self):
+        """(ptr, Block, track_mute) je Track in Snapshot-Reihenfolge.
+
+        Blöcke werden bei jedem Neulesen ersetzt; Konsumenten können über die
+        Objektidentität erkennen, welche Tracks sich seit ihrem letzten Abgleich
+        geändert haben (siehe ``frame_coverage``).
+        """
+        for i, p in enumerate(self._order):
+            yield p, self._blocks[p], bool(self.track_mute[i]) if i < len(self.track_mute) else False
+
+    def resolve_tracks(self, ptrs: Iterable[int]) -> Dict[int, object]:
+        """ptr → RNA-Track für die übergebenen Pointer (ein Durchlauf über tracks)."""
+        want = {int(p) for p in ptrs}
+        out: Dict[int, object] = {}
+        if not want or self.tracks is None:
+            return out
+        for tr in self.tracks:
+            try:
+                p = int(tr.as_pointer())
+            except Exception:
+                continue
+            if p in want:
+                out[p] = tr
+                if len(out) == len(want):
+                    break
+        return out
+
+    @property
+    def n_tracks(self) -> int:
+        return int(len(self._order))
+
+    @property
+    def n_markers(self) -> int:
+        return int(self.offsets[-1])
+
+    def index_of(self, ptr: int) -> Optional[int]:
+        """Track-Index zu einem ``as_pointer()``-Wert (oder None)."""
+        return self._ptr_index.get(int(ptr))
+
+    def track_slice(self, i: int) -> slice:
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def marker_counts(self) -> np.ndarray:
+        """Markeranzahl je Track (T,)."""
+        return np.diff(self.offsets)
+
+    def active_mask(self, *, ignore_muted_marker: bool = True, ignore_muted_track: bool = True) -> np.ndarray:
+        """Bool-Maske (N,) der Marker, die als 'aktiv' zählen."""
+        mask = np.ones(self.n_markers, dtype=bool)
+        if ignore_muted_marker:
+            mask &= ~self.mute
+        if ignore_muted_track and self.n_markers:
+            mask &= ~self.track_mute[self.marker_track]
+        return mask
+
+    def marker_index(self, i: int, frame: int) -> int:
+        """Globaler Markerindex von Track ``i`` auf ``frame`` (exakt) oder -1."""
+        lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+        if hi <= lo:
+            return -1
+        j = lo + int(np.searchsorted(self.frame[lo:hi], int(frame)))
+        if j < hi and int(self.frame[j]) == int(frame):
+            return j
+        return -1
+
+    def markers_at_frame(self, frame: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(Track-Indizes, Markerindizes) aller Marker exakt auf ``frame``."""
+        sel = self.frame == int(frame)
+        if mask is not None:
+            sel &= mask
+        idx = np.flatnonzero(sel)
+        return self.marker_track[idx], idx
+
+    def frame_counts(
+        self,
+        frame_start: int,
+        frame_end: int,
+        *,
+        ignore_muted_marker: bool = True,
+        ignore_muted_track: bool = True,
+    ) -> np.ndarray:
+        """Histogramm aktiver Marker je Frame für ``[frame_start..frame_end]``."""
+        s, e = int(frame_start), int(frame_end)
+        if e < s:
+            return np.zeros(0, dtype=np.int64)
+        mask = self.active_mask(
+            ignore_muted_marker=ignore_muted_marker,
+            ignore_muted_track=ignore_muted_track,
+        )
+        f = self.frame[mask]
+        f = f[(f >= s) & (f <= e)]
+        return np.bincount(f - s, minlength=e - s + 1)
+
+
+def _removed_any(old: Dict[int, _TrackBlock], new: Dict[int, _TrackBlock]) -> bool:
+    return len(old) != len(new) or any(p not in new for p in old)
+
+
+# ---------------------------------------------------------------------------
+# Modulweiter Cache (pro Clip und Tracks-Container)
+# ---------------------------------------------------------------------------
+
+_SNAPSHOTS: Dict[Tuple[int, int], TrackSnapshot] = {}
+
+
+def _snapshot_key(clip, use_active_object: bool) -> Tuple[Tuple[int, int], object]:
+    tracking = clip.tracking
+    if use_active_object:
+        try:
+            obj = tracking.objects.active
+            if obj is not None and getattr(obj, "tracks", None) is not None:
+                return (int(clip.as_pointer()), int(obj.as_pointer())), obj.tracks
+        except Exception:
+            pass
+    return (int(clip.as_pointer()), 0), tracking.tracks
+
+
+def get_track_snapshot(
+    clip: bpy.types.MovieClip,
+    *,
+    use_active_object: bool = False,
+    refresh: bool = True,
+) -> Optional[TrackSnapshot]:
+    """Liefert den (gecachten) Snapshot für ``clip``; standardmäßig aktualisiert."""
+    if clip is None:
+        return None
+    try:
+        key, tracks = _snapshot_key(clip, use_active_object)
+    except Exception:
+        return None
+    snap = _SNAPSHOTS.get(key)
+    if snap is None:
+        snap = TrackSnapshot(tracks)
+        _SNAPSHOTS[key] = snap
+    else:
+        snap.tracks = tracks
+    if refresh:
+        snap.refresh()
+    return snap
+
+
+def invalidate_track_snapshot(clip: Optional[bpy.types.MovieClip], ptrs: Optional[Iterable[int]] = None) -> None:
+    """Markiert Tracks eines Clips (oder alle) als veraltet, z. B. nach Mute/Refine."""
+    if clip is None:
+        return
+    try:
+        cptr = int(clip.as_pointer())
+    except Exception:
+        return
+    ptrs = None if ptrs is None else [int(p) for p in ptrs]
+    for (c, _o), snap in list(_SNAPSHOTS.items()):
+        if c == cptr:
+            snap.invalidate(ptrs)
+
+
+def clear_track_snapshots() -> None:
+    """Verwirft alle gecachten Snapshots (z. B. beim Cycle-Reset)."""
+    _SNAPSHOTS.clear()
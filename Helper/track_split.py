@@ -0,0 +1,219 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/track_split.py
+---------------------
+Split-Engine: zerlegt Tracks mit Frame-Lücken in einen Track pro Segment.
+
+Statt den Track (k-1)× über ``copy_tracks``/``paste_tracks`` zu duplizieren
+und jede Kopie markerweise zurückzuschneiden, wird jedes Segment ab dem
+zweiten direkt aufgebaut:
+
+  1. ``tracks.new(name, frame)`` legt den Track an (Name wird von Blender
+     eindeutig gemacht, wie beim Paste).
+  2. Die übrigen Segment-Frames werden per ``markers.insert`` ergänzt.
+  3. ``co``, ``pattern_corners``, ``search_min/max``, ``is_keyed`` werden per
+     ``foreach_set`` aus den Quell-Arrays übernommen; alle Marker sind
+     ungemutet (wie beim bisherigen Zuschnitt).
+  4. Track-Einstellungen (Motion-Model, Kanäle, Gewicht, Farbe, …) werden
+     kopiert.
+
+Der Quelltrack behält nur sein erstes Segment. Kein Clipboard, kein
+UI-Override; der Depsgraph wird einmal pro Batch aktualisiert.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import bpy
+import numpy as np
+
+from .segment_runs import segment_runs
+from .update_coalescer import request_depsgraph_update
+
+__all__ = (
+    "split_track_by_segments",
+    "split_tracks_by_segments",
+)
+
+# Track-Eigenschaften, die beim Split übernommen werden (fehlende werden übersprungen)
+_TRACK_SETTINGS = (
+    "motion_model",
+    "pattern_match",
+    "use_brute",
+    "use_normalization",
+    "correlation_min",
+    "margin",
+    "frames_limit",
+    "use_mask",
+    "use_red_channel",
+    "use_green_channel",
+    "use_blue_channel",
+    "use_grayscale_preview",
+    "use_alpha_preview",
+    "weight",
+    "weight_stab",
+    "offset",
+    "color",
+    "use_custom_color",
+    "hide",
+    "lock",
+    "mute",
+)
+
+# Marker-Felder: (Attribut, Komponenten, dtype)
+_MARKER_FIELDS = (
+    ("co", 2, np.float32),
+    ("pattern_corners", 8, np.float32),
+    ("search_min", 2, np.float32),
+    ("search_max", 2, np.float32),
+    ("is_keyed", 1, bool),
+)
+
+
+class _MarkerBlock:
+    """Markerdaten eines Tracks als Arrays (nach Frame sortiert)."""
+
+    __slots__ = ("frame", "fields")
+
+    def __init__(self, track) -> None:
+        markers = track.markers
+        n = len(markers)
+        self.frame = np.empty(n, dtype=np.int32)
+        self.fields: Dict[str, np.ndarray] = {}
+        if not n:
+            return
+        markers.foreach_get("frame", self.frame)
+        for attr, width, dtype in _MARKER_FIELDS:
+            buf = np.empty(n * width, dtype=dtype)
+            try:
+                markers.foreach_get(attr, buf)
+            except Exception:
+                continue
+            self.fields[attr] = buf.reshape(n, width) if width > 1 else buf
+        if np.any(np.diff(self.frame) <= 0):
+            order = np.argsort(self.frame, kind="stable")
+            self.frame = self.frame[order]
+            for k in list(self.fields):
+                self.fields[k] = self.fields[k][order]
+
+
+def _copy_settings(src, dst) -> None:
+    for attr in _TRACK_SETTINGS:
+        try:
+            setattr(dst, attr, getattr(src, attr))
+        except Exception:
+            pass
+
+
+def _build_segment_track(tracks, src, blk: _MarkerBlock, lo: int, hi: int):
+    """Neuer Track mit den Markern ``blk[lo:hi+1]``; Rückgabe: Track oder None."""
+    frames = blk.frame[lo:hi + 1].tolist()
+    try:
+        new_tr = tracks.new(name=str(src.name), frame=int(frames[0]))
+    except Exception:
+        return None
+    markers = new_tr.markers
+    co = blk.fields.get("co")
+    for i, f in enumerate(frames[1:], start=lo + 1):
+        try:
+            markers.insert(int(f), co=tuple(co[i]) if co is not None else (0.0, 0.0))
+        except Exception:
+            pass
+    if len(markers) == len(frames):
+        for attr, _width, _dtype in _MARKER_FIELDS:
+            arr = blk.fields.get(attr)
+            if arr is None:
+                continue
+            try:
+                markers.foreach_set(attr, np.ascontiguousarray(arr[lo:hi + 1]).ravel())
+            except Exception:
+                pass
+        try:
+            markers.foreach_set("mute", np.zeros(len(frames), dtype=bool))
+        except Exception:
+            pass
+    _copy_settings(src, new_tr)
+    return new_tr
+
+
+def _trim_to_range(track, blk: _MarkerBlock, lo: int, hi: int) -> int:
+    """Löscht alle Marker außerhalb ``blk[lo:hi+1]``; Rest wird ungemutet."""
+    doomed = np.concatenate((blk.frame[:lo], blk.frame[hi + 1:]))
+    removed = 0
+    for f in doomed[::-1].tolist():
+        try:
+            track.markers.delete_frame(int(f))
+            removed += 1
+        except Exception:
+            pass
+    try:
+        n = len(track.markers)
+        if n:
+            track.markers.foreach_set("mute", np.zeros(n, dtype=bool))
+    except Exception:
+        pass
+    return removed
+
+
+def split_track_by_segments(track, tracks=None) -> Dict[str, Any]:
+    """Zerlegt ``track`` nach Frame-Lücken (Regel "ALL").
+
+    Das Original behält Segment 0, jedes weitere Segment wird ein neuer Track.
+    Rückgabe: {"status", "segments", "created": [Track, …], "markers_removed"}.
+    """
+    out: Dict[str, Any] = {"status": "NOOP", "segments": 0, "created": [], "markers_removed": 0}
+    if tracks is None:
+        try:
+            tracks = track.id_data.tracking.tracks
+        except Exception:
+            out["status"] = "FAILED"
+            return out
+    try:
+        blk = _MarkerBlock(track)
+    except Exception:
+        out["status"] = "FAILED"
+        return out
+    runs = segment_runs(blk.frame, rule="ALL")
+    out["segments"] = len(runs)
+    if len(runs) <= 1:
+        return out
+
+    firsts = runs.first.tolist()
+    lasts = runs.last.tolist()
+    for lo, hi in zip(firsts[1:], lasts[1:]):
+        new_tr = _build_segment_track(tracks, track, blk, lo, hi)
+        if new_tr is not None:
+            out["created"].append(new_tr)
+    out["markers_removed"] = _trim_to_range(track, blk, firsts[0], lasts[0])
+    out["status"] = "OK" if len(out["created"]) == len(runs) - 1 else "PARTIAL"
+    return out
+
+
+def split_tracks_by_segments(
+    context: Optional[bpy.types.Context],
+    tracks_list: Iterable[Any],
+    *,
+    tracks=None,
+) -> Dict[str, Any]:
+    """Batch-Split aller übergebenen Tracks; ein Depsgraph-Update am Ende."""
+    tracks_split = 0
+    created: List[Any] = []
+    removed = 0
+    for tr in list(tracks_list):
+        try:
+            res = split_track_by_segments(tr, tracks)
+        except Exception:
+            continue
+        if res["created"]:
+            tracks_split += 1
+            created.extend(res["created"])
+        removed += int(res["markers_removed"])
+    if tracks_split and context is not None:
+        request_depsgraph_update(context)
+    return {
+        "status": "OK",
+        "tracks_split": tracks_split,
+        "tracks_created": len(created),
+        "created": created,
+        "markers_removed": removed,
+    }
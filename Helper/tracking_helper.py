@@ -6,6 +6,9 @@ from typing import Optional
 
 import bpy
 
+from .frame_ops import sync_frame
+from .update_coalescer import request_redraw
+
 __all__ = (
     "track_to_scene_end_fn",
     "_redraw_clip_editors",
@@ -59,7 +62,7 @@ def _redraw_clip_editors(_context: bpy.types.Context | None = None) -> None:
     for _w, area in _iter_clip_areas():
         for region in area.regions:
             if region.type == 'WINDOW':
-                region.tag_redraw()
+                request_redraw(region)
 
 
 def _set_frame_and_notify(frame: int, *, verbose: bool = True) -> None:
@@ -71,7 +74,7 @@ def _set_frame_and_notify(frame: int, *, verbose: bool = True) -> None:
     if verbose:
         _log(f"Reset attempt: scene.frame_set({frame}) – before: {scene.frame_current}")
     try:
-        scene.frame_set(frame)
+        sync_frame(scene, frame, need_depsgraph=True)
     except Exception as ex:
         _log(f"scene.frame_set Exception: {ex!r} – fallback scene.frame_current = {frame}")
         scene.frame_current = frame
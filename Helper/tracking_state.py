@@ -5,7 +5,9 @@ from __future__ import annotations
 
 import bpy
 import json
-from dataclasses import dataclass, asdict
+from bpy.app.handlers import persistent
+import numpy as np
+from dataclasses import dataclass, asdict, fields
 from typing import Dict, Any, Tuple, Callable, Optional
 
 # Mapping "Anzahl" -> Motion Model (A1..A5)
@@ -45,40 +47,255 @@ class FrameEntry:
     A9: float = 0.0
 
 
-# ---------- State laden/speichern ----------
+A_KEYS = tuple(f"A{i}" for i in range(1, 10))
+_ENTRY_KEYS = tuple(f.name for f in fields(FrameEntry))
 
-def _get_state(context: bpy.types.Context) -> Dict[str, Any]:
-    scene = context.scene
-    raw = scene.get(SCENE_STATE_PROP, "")
-    if raw:
-        try:
-            return json.loads(raw)
-        except Exception:
-            pass
-    state = {"frames": {}}  # key: str(frame) -> FrameEntry as dict
-    _save_state(context, state)
-    return state
 
+# ---------- In-Memory-State (NumPy) ----------
 
-# ---------- Reset API ----------
+class TrackingState:
+    """Per-Frame-State eines Laufs als NumPy-Arrays.
 
-def reset_tracking_state(context: bpy.types.Context) -> None:
-    """Setzt den gesamten Tracking-State (frames, counts, A-Werte) zurück."""
-    try:
-        state = {"frames": {}}
-        _save_state(context, state)
-        if "_tracking_triplet_mode" in context.scene:
+    Frames liegen dicht in ``[offset, offset + size)``; ``present`` markiert,
+    welche Frames einen Eintrag haben (entspricht den Keys im JSON).
+    Die Szene wird nur bei ``checkpoint`` geschrieben.
+    """
+
+    def __init__(self) -> None:
+        self.offset = 0
+        self.count = np.zeros(0, dtype=np.int64)
+        self.anchor = np.zeros(0, dtype=bool)
+        self.interpolated = np.zeros(0, dtype=bool)
+        self.A = np.zeros((0, len(A_KEYS)), dtype=np.float64)
+        self.present = np.zeros(0, dtype=bool)
+        self.dirty = False
+
+    # --- Speicherverwaltung -------------------------------------------------
+
+    def _reserve(self, lo: int, hi: int) -> None:
+        """Stellt sicher, dass Frames ``lo..hi`` (inklusive) adressierbar sind."""
+        size = self.count.shape[0]
+        if size and self.offset <= lo and hi < self.offset + size:
+            return
+        cur_lo = self.offset if size else lo
+        cur_hi = self.offset + size - 1 if size else hi
+        new_lo, new_hi = min(lo, cur_lo), max(hi, cur_hi)
+        # Puffer in Wachstumsrichtung, damit wiederholtes Wachsen amortisiert bleibt
+        pad = max(16, (new_hi - new_lo + 1) // 2)
+        if lo < cur_lo or not size:
+            new_lo -= pad
+        if hi > cur_hi or not size:
+            new_hi += pad
+        new_size = new_hi - new_lo + 1
+        shift = self.offset - new_lo
+
+        def grow(arr: np.ndarray) -> np.ndarray:
+            out = np.zeros((new_size,) + arr.shape[1:], dtype=arr.dtype)
+            if size:
+                out[shift:shift + size] = arr
+            return out
+
+        self.count = grow(self.count)
+        self.anchor = grow(self.anchor)
+        self.interpolated = grow(self.interpolated)
+        self.A = grow(self.A)
+        self.present = grow(self.present)
+        self.offset = new_lo
+
+    def _idx(self, frames) -> np.ndarray:
+        f = np.asarray(frames, dtype=np.int64)
+        if f.size:
+            self._reserve(int(f.min()), int(f.max()))
+        return f - self.offset
+
+    # --- Einträge -----------------------------------------------------------
+
+    def ensure(self, frame: int) -> bool:
+        """Legt den Frame-Eintrag mit FrameEntry-Defaults an. Rückgabe: neu angelegt."""
+        i = int(self._idx([frame])[0])
+        if self.present[i]:
+            return False
+        self._init_entries(np.array([i]))
+        return True
+
+    def _init_entries(self, idx: np.ndarray) -> None:
+        d = FrameEntry()
+        self.count[idx] = d.count
+        self.anchor[idx] = d.anchor
+        self.interpolated[idx] = d.interpolated
+        self.A[idx] = 0.0
+        self.present[idx] = True
+        self.dirty = True
+
+    def has(self, frame: int) -> bool:
+        i = int(frame) - self.offset
+        return 0 <= i < self.present.shape[0] and bool(self.present[i])
+
+    def get_count(self, frame: int, default: int = 0) -> int:
+        if not self.has(frame):
+            return int(default)
+        return int(self.count[int(frame) - self.offset])
+
+    def set_count(self, frame: int, value: int) -> None:
+        self.ensure(frame)
+        i = int(frame) - self.offset
+        self.count[i] = max(0, int(value))
+        # Alt-Flags neutralisieren
+        self.anchor[i] = False
+        self.interpolated[i] = False
+        self.dirty = True
+
+    def set_A(self, frame: int, k: int, value: float) -> None:
+        self.ensure(frame)
+        self.A[int(frame) - self.offset, int(k) - 1] = float(value)
+        self.dirty = True
+
+    def entry(self, frame: int) -> Dict[str, Any]:
+        """Eintrag als Dict im FrameEntry-Format (Kopie)."""
+        if not self.has(frame):
+            return asdict(FrameEntry())
+        i = int(frame) - self.offset
+        out: Dict[str, Any] = {
+            "count": int(self.count[i]),
+            "anchor": bool(self.anchor[i]),
+            "interpolated": bool(self.interpolated[i]),
+        }
+        for j, key in enumerate(A_KEYS):
+            out[key] = float(self.A[i, j])
+        return out
+
+    # --- Nachbarschafts-Fächerung -------------------------------------------
+
+    def fan_out(self, center_frame: int, center_value: int) -> None:
+        """Vektorisierte Fächerung von ``center_value`` auf f±1, f±2, …
+
+        f±d := center_value − d (solange > 0); vorhandene Werte > 0 werden
+        mit dem Kandidaten gemittelt (Rundung wie ``round``: half-to-even).
+        """
+        c = int(center_value)
+        if c <= 1:
+            return
+        d = np.arange(1, c, dtype=np.int64)
+        frames = np.concatenate((center_frame - d, center_frame + d))
+        cand = np.concatenate((c - d, c - d))
+        idx = self._idx(frames)
+        known = self.present[idx]
+        old = np.where(known, self.count[idx], 0)
+        if not known.all():
+            self._init_entries(idx[~known])
+        blended = np.where(old <= 0, cand, np.rint((old + cand) / 2.0).astype(np.int64))
+        self.count[idx] = np.maximum(blended, 0)
+        self.anchor[idx] = False
+        self.interpolated[idx] = False
+        self.dirty = True
+
+    # --- (De-)Serialisierung ------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        frames: Dict[str, Any] = {}
+        for i in np.flatnonzero(self.present).tolist():
+            frames[str(i + self.offset)] = self.entry(i + self.offset)
+        return {"frames": frames}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "TrackingState":
+        st = cls()
+        frames = (state or {}).get("frames", {}) or {}
+        keys = []
+        for k in frames:
             try:
-                del context.scene["_tracking_triplet_mode"]
+                keys.append(int(k))
             except Exception:
                 pass
-    except Exception as exc:
-        print(f"[tracking_state] Reset fehlgeschlagen: {exc}")
-    return state
+        if not keys:
+            return st
+        idx = st._idx(keys)
+        for i, k in zip(idx.tolist(), keys):
+            e = frames.get(str(k), {}) or {}
+            st.present[i] = True
+            st.count[i] = int(e.get("count", 1))
+            st.anchor[i] = bool(e.get("anchor", False))
+            st.interpolated[i] = bool(e.get("interpolated", False))
+            for j, key in enumerate(A_KEYS):
+                st.A[i, j] = float(e.get(key, 0.0))
+        return st
+
+
+_STATES: Dict[int, TrackingState] = {}
+
+
+def clear_tracking_states() -> None:
+    """In-Memory-States verwerfen (Szenen-Pointer gelten nur für die geladene Datei)."""
+    _STATES.clear()
+
+
+@persistent
+def _on_load_post(*_args) -> None:
+    clear_tracking_states()
+
+
+def register_tracking_state() -> None:
+    """``load_post``-Handler installieren (kein State aus der vorherigen Datei)."""
+    handlers = bpy.app.handlers.load_post
+    if _on_load_post not in handlers:
+        handlers.append(_on_load_post)
+
+
+def unregister_tracking_state() -> None:
+    handlers = bpy.app.handlers.load_post
+    if _on_load_post in handlers:
+        handlers.remove(_on_load_post)
+    clear_tracking_states()
+
+
+def _scene_key(context: bpy.types.Context) -> int:
+    scene = context.scene
+    try:
+        return int(scene.as_pointer())
+    except Exception:
+        return id(scene)
+
+
+def get_tracking_state(context: bpy.types.Context) -> TrackingState:
+    """In-Memory-State des Laufs; beim ersten Zugriff aus der Szene geladen."""
+    key = _scene_key(context)
+    st = _STATES.get(key)
+    if st is None:
+        raw = context.scene.get(SCENE_STATE_PROP, "")
+        st = TrackingState()
+        if raw:
+            try:
+                st = TrackingState.from_dict(json.loads(raw))
+            except Exception:
+                st = TrackingState()
+        _STATES[key] = st
+    return st
+
+
+def checkpoint_tracking_state(context: bpy.types.Context, *, force: bool = False) -> None:
+    """Schreibt den In-Memory-State als JSON in die Szene (nur wenn geändert)."""
+    st = _STATES.get(_scene_key(context))
+    if st is None or not (st.dirty or force):
+        return
+    context.scene[SCENE_STATE_PROP] = json.dumps(st.to_dict(), separators=(",", ":"))
+    st.dirty = False
+
+
+def get_frame_count(context: bpy.types.Context, frame: int, default: int = 1) -> int:
+    """count des Frames (``default``, falls noch kein Eintrag existiert)."""
+    return get_tracking_state(context).get_count(frame, default)
+
+
+# ---------- Kompatibilität (Dict-API) ----------
+
+def _get_state(context: bpy.types.Context) -> Dict[str, Any]:
+    """Kopie des States als Dict (Altformat)."""
+    return get_tracking_state(context).to_dict()
 
 
 def _save_state(context: bpy.types.Context, state: Dict[str, Any]) -> None:
-    context.scene[SCENE_STATE_PROP] = json.dumps(state, separators=(",", ":"))
+    _STATES[_scene_key(context)] = TrackingState.from_dict(state)
+    checkpoint_tracking_state(context, force=True)
 
 
 def _ensure_frame_entry(state: Dict[str, Any], frame: int) -> Tuple[Dict[str, Any], bool]:
@@ -90,6 +307,24 @@ def _ensure_frame_entry(state: Dict[str, Any], frame: int) -> Tuple[Dict[str, An
     return frames[key], False
 
 
+# ---------- Reset API ----------
+
+def reset_tracking_state(context: bpy.types.Context) -> None:
+    """Setzt den gesamten Tracking-State (frames, counts, A-Werte) zurück."""
+    state = {"frames": {}}
+    try:
+        _STATES[_scene_key(context)] = TrackingState()
+        checkpoint_tracking_state(context, force=True)
+        if "_tracking_triplet_mode" in context.scene:
+            try:
+                del context.scene["_tracking_triplet_mode"]
+            except Exception:
+                pass
+    except Exception as exc:
+        print(f"[tracking_state] Reset fehlgeschlagen: {exc}")
+    return state
+
+
 # ---------- Motion-Model / Triplet (erweiterte 25-Schritt-Logik) ----------
 
 def _apply_model_triplet_for_count(context: bpy.types.Context, entry: Dict[str, Any]) -> None:
@@ -194,44 +429,6 @@ def _popup_error_report(context: bpy.types.Context, frame: int, entry: Dict[str,
         for ln in lines:
             print("  ", ln)
  
-# ---------- Nachbarschafts-Fächerung (ohne Anker/Interpolation) ----------
-
-def _get_frame_value(state: Dict[str, Any], frame: int) -> int:
-    return int(state.setdefault("frames", {}).get(str(frame), {}).get("count", 0))
-
-def _set_frame_value(state: Dict[str, Any], frame: int, value: int) -> None:
-    frames = state.setdefault("frames", {})
-    entry, _created = _ensure_frame_entry(state, frame)
-    entry["count"] = max(0, int(value))
-    # Alt-Flags neutralisieren
-    entry["anchor"] = False
-    entry["interpolated"] = False
-    frames[str(frame)] = entry
-
-def _fan_out_neighbors(state: Dict[str, Any], center_frame: int, center_value: int) -> None:
-    """
-    Rollt den center_value gedämpft auf Nachbarn aus:
-    f±1 := center_value-1, f±2 := center_value-2, ... bis >0.
-    Konflikthandling: arithmetisches Mittel (kaufmännisch gerundet).
-    """
-    if center_value <= 1:
-        return
-    def _blend(old_v: int, new_v: int) -> int:
-        if old_v <= 0:
-            return new_v
-        return int(round((old_v + new_v) / 2.0))
-
-    # Beide Richtungen
-    radius = center_value - 1
-    for d in range(1, radius + 1):
-        cand = center_value - d
-        if cand <= 0:
-            break
-        for neighbor in (center_frame - d, center_frame + d):
-            old = _get_frame_value(state, neighbor)
-            _set_frame_value(state, neighbor, _blend(old, cand))
-
-
 # ---------- Öffentliche API ----------
 
 def orchestrate_on_jump(context: bpy.types.Context, frame: int) -> None:
@@ -242,29 +439,25 @@ def orchestrate_on_jump(context: bpy.types.Context, frame: int) -> None:
     - Danach Dämpfungs-Fächerung auf Nachbarn (–1/–2/… bis >0), Konflikte werden gemittelt.
     - ABORT_AT bleibt als Obergrenze für count aktiv.
     """
-    state = _get_state(context)
-    entry, _created = _ensure_frame_entry(state, frame)
+    st = get_tracking_state(context)
+    st.ensure(frame)
     # Zentrum hochzählen (oder initialisieren)
-    center = int(entry.get("count", 0))
+    center = st.get_count(frame)
     center = 1 if center <= 0 else center + 1
-    entry["count"] = center
-    entry["anchor"] = False
-    entry["interpolated"] = False
+    st.set_count(frame, center)
 
     # Abbruchschutz
     if center >= ABORT_AT:
         _set_triplet_mode_on_scene(context, None)
-        _save_state(context, state)
-        _popup_error_report(context, frame, entry)
+        checkpoint_tracking_state(context)
+        _popup_error_report(context, frame, st.entry(frame))
         return
 
     # Nachbarn fächern
-    _set_frame_value(state, frame, center)
-    _fan_out_neighbors(state, frame, center)
+    st.fan_out(frame, center)
 
     # Motion-Model/Triplet aus aktuellem count ableiten (unverändert)
-    _apply_model_triplet_for_count(context, entry)
-    _save_state(context, state)
+    _apply_model_triplet_for_count(context, st.entry(frame))
 
 def record_bidirectional_result(
     context: bpy.types.Context,
@@ -277,14 +470,14 @@ def record_bidirectional_result(
     A_k = Summe über alle Marker: frames_tracked(marker) * error_value(marker)
     k = aktuelle count des Frames (1..9). Bei >=10 wird nichts geschrieben (Abbruchfall).
     """
-    state = _get_state(context)
-    entry, _ = _ensure_frame_entry(state, frame)
-    count = int(entry.get("count", 1))
+    st = get_tracking_state(context)
+    st.ensure(frame)
+    count = st.get_count(frame, 1)
 
     if count >= 10:
         # Abbruchfall: nur Report
-        _save_state(context, state)
-        _popup_error_report(context, frame, entry)
+        checkpoint_tracking_state(context)
+        _popup_error_report(context, frame, st.entry(frame))
         return
 
     clip = context.edit_movieclip
@@ -311,21 +504,4 @@ def record_bidirectional_result(
     # A-Logging bleibt bewusst auf 1..9 gekappt: Auswahl-Logik nutzt A1..A5,
     # spätere Triplet-Schritte benötigen keine A>9.
     idx = max(1, min(count, 9))
-    key = f"A{idx}"
-    entry[key] = float(total)
-
-    _save_state(context, state)
-
-def reset_tracking_state(context: bpy.types.Context) -> None:
-    """Setzt den gesamten Tracking-State (frames, counts, A-Werte) zurück."""
-    try:
-        state = {"frames": {}}
-        _save_state(context, state)
-        if "_tracking_triplet_mode" in context.scene:
-            try:
-                del context.scene["_tracking_triplet_mode"]
-            except Exception:
-                pass
-    except Exception as exc:
-        print(f"[tracking_state] Reset fehlgeschlagen: {exc}")
-    return state
+    st.set_A(frame, idx, total)
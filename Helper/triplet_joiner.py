@@ -7,6 +7,8 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import bpy
 
+from .clip_context import find_clip_editor
+
 __all__ = ("run_triplet_join", "CLIP_OT_triplet_join", "register", "unregister")
 
 # Scene Keys
@@ -21,20 +23,10 @@ def _find_clip_context() -> Tuple[Optional[bpy.types.Window],
                                   Optional[bpy.types.Area],
                                   Optional[bpy.types.Region],
                                   Optional[bpy.types.Space]]:
-    wm = bpy.context.window_manager
-    if not wm:
+    ov = find_clip_editor()
+    if not ov:
         return None, None, None, None
-    for win in wm.windows:
-        scr = win.screen
-        if not scr:
-            continue
-        for area in scr.areas:
-            if area.type == 'CLIP_EDITOR':
-                region = next((r for r in area.regions if r.type == 'WINDOW'), None)
-                space = area.spaces.active if hasattr(area, "spaces") else None
-                if region and space:
-                    return win, area, region, space
-    return None, None, None, None
+    return ov["window"], ov["area"], ov["region"], ov["space_data"]
 
 
 def _run_in_clip_context(op_callable, **kwargs):
@@ -0,0 +1,189 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Helper/update_coalescer.py
+--------------------------
+Bündelt Depsgraph-/View-Layer-Updates und Redraws während eines Pipeline-Laufs.
+
+Helfer rufen in Schleifen (pro Track/Segment/Refine-Schritt)
+``evaluated_depsgraph_get().update()``, ``view_layer.update()``,
+``tag_redraw`` oder gar ``wm.redraw_timer(type='DRAW_WIN_SWAP')`` auf. Über
+``request_*`` werden diese Wünsche stattdessen vorgemerkt:
+
+  - außerhalb eines Laufs (``begin_coalescing`` nicht aktiv) → sofort
+    ausführen (bisheriges Verhalten),
+  - im Lauf → vormerken; ``flush_updates`` führt jede Art höchstens EINMAL aus.
+
+Der Coordinator flusht einmal pro Timer-Tick, headless einmal pro Phase.
+``coalescer_stats`` zählt Anforderungen, Ausführungen und absorbierte Flushes.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+import bpy
+
+__all__ = (
+    "begin_coalescing",
+    "end_coalescing",
+    "coalescing",
+    "is_coalescing",
+    "request_depsgraph_update",
+    "request_view_layer_update",
+    "request_redraw",
+    "request_window_swap",
+    "flush_updates",
+    "coalescer_stats",
+    "reset_coalescer_stats",
+)
+
+_KINDS = ("depsgraph", "view_layer", "redraw", "swap")
+
+_STATE: Dict[str, Any] = {"active": False, "pending": set()}
+_STATS: Dict[str, Dict[str, int]] = {k: {"requested": 0, "executed": 0} for k in _KINDS}
+_FLUSHES = {"ticks": 0}
+
+
+def is_coalescing() -> bool:
+    return bool(_STATE["active"])
+
+
+def begin_coalescing() -> None:
+    """Ab jetzt vormerken statt ausführen (Coordinator-Start)."""
+    _STATE["active"] = True
+    _STATE["pending"].clear()
+
+
+def end_coalescing(context=None) -> None:
+    """Offenes flushen und wieder sofort ausführen (Coordinator-Ende)."""
+    try:
+        flush_updates(context)
+    finally:
+        _STATE["active"] = False
+        _STATE["pending"].clear()
+
+
+@contextmanager
+def coalescing(context=None) -> Iterator[None]:
+    """Scope für Läufe außerhalb des Coordinators."""
+    outer = is_coalescing()
+    if not outer:
+        begin_coalescing()
+    try:
+        yield
+    finally:
+        if not outer:
+            end_coalescing(context)
+
+
+# ---------------------------------------------------------------------------
+# Ausführung
+# ---------------------------------------------------------------------------
+
+def _do_depsgraph(context) -> None:
+    ctx = context or bpy.context
+    try:
+        ctx.evaluated_depsgraph_get().update()
+    except Exception:
+        pass
+
+
+def _do_view_layer(context) -> None:
+    ctx = context or bpy.context
+    try:
+        ctx.view_layer.update()
+    except Exception:
+        pass
+
+
+def _do_redraw(target=None) -> None:
+    if target is not None:
+        try:
+            target.tag_redraw()
+        except Exception:
+            pass
+        return
+    from .clip_context import find_clip_editor
+
+    ov = find_clip_editor()
+    area = ov.get("area") if ov else None
+    if area is not None:
+        try:
+            area.tag_redraw()
+        except Exception:
+            pass
+
+
+def _do_swap() -> None:
+    if getattr(bpy.app, "background", False):
+        return
+    try:
+        bpy.ops.wm.redraw_timer(type="DRAW_WIN_SWAP", iterations=1)
+    except Exception:
+        pass
+
+
+def _request(kind: str, fn, *args) -> None:
+    _STATS[kind]["requested"] += 1
+    if _STATE["active"]:
+        _STATE["pending"].add(kind)
+        return
+    fn(*args)
+    _STATS[kind]["executed"] += 1
+
+
+def request_depsgraph_update(context=None) -> None:
+    _request("depsgraph", _do_depsgraph, context)
+
+
+def request_view_layer_update(context=None) -> None:
+    _request("view_layer", _do_view_layer, context)
+
+
+def request_redraw(target=None) -> None:
+    """``target.tag_redraw()`` (Area/Region) bzw. CLIP_EDITOR; im Lauf gebündelt."""
+    _request("redraw", _do_redraw, target)
+
+
+def request_window_swap() -> None:
+    """Ersetzt ``wm.redraw_timer(type='DRAW_WIN_SWAP')``."""
+    _request("swap", _do_swap)
+
+
+def flush_updates(context=None) -> int:
+    """Vorgemerkte Updates je Art einmal ausführen. Rückgabe: Anzahl ausgeführter."""
+    pending = _STATE["pending"]
+    if not pending:
+        return 0
+    kinds = [k for k in _KINDS if k in pending]
+    pending.clear()
+    _FLUSHES["ticks"] += 1
+    for kind in kinds:
+        if kind == "depsgraph":
+            _do_depsgraph(context)
+        elif kind == "view_layer":
+            _do_view_layer(context)
+        elif kind == "redraw":
+            _do_redraw()
+        else:
+            _do_swap()
+        _STATS[kind]["executed"] += 1
+    return len(kinds)
+
+
+def coalescer_stats() -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    absorbed = 0
+    for kind, st in _STATS.items():
+        a = max(0, st["requested"] - st["executed"] - (1 if kind in _STATE["pending"] else 0))
+        out[kind] = {"requested": st["requested"], "executed": st["executed"], "absorbed": a}
+        absorbed += a
+    out["absorbed"] = absorbed
+    out["flushes"] = _FLUSHES["ticks"]
+    return out
+
+
+def reset_coalescer_stats() -> None:
+    for st in _STATS.values():
+        st["requested"] = st["executed"] = 0
+    _FLUSHES["ticks"] = 0
@@ -15,6 +15,7 @@ from dataclasses import dataclass
 from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
 import bpy
+from bpy.props import BoolProperty, StringProperty
 
 # ---------------------------------------------------------------------------
 # Strikter Solve-Eval-Modus: 3x Solve hintereinander, ohne mutierende Helfer
@@ -27,13 +28,19 @@ class phase_lock:
 
     def __init__(self, name: str) -> None:
         self.name = name
+        self._span = None
 
     def __enter__(self) -> None:
         print(f"[PHASE] >>> {self.name} BEGIN")
+        self._span = span(f"lock.{self.name}", cat="phase")
+        self._span.__enter__()
         gc.disable()  # vermeidet GC-Spikes in Hot-Path
 
     def __exit__(self, exc_type, exc, tb) -> None:
         gc.enable()
+        if self._span is not None:
+            self._span.__exit__(exc_type, exc, tb)
+            self._span = None
         print(f"[PHASE] <<< {self.name} END")
 
 
@@ -79,6 +86,8 @@ def solve_eval_back_to_back(
     max_trials: int = 3,
     quick: bool = True,
     solve_kwargs: Optional[Dict[str, Any]] = None,
+    rounds: Iterable[Dict[str, Any]] = ({},),
+    halving_eta: int = 2,
 ) -> Dict[str, Any]:
     """
     Führt bis zu 3 Solve-Durchläufe (verschiedene Distortion-Modelle) direkt
@@ -88,8 +97,15 @@ def solve_eval_back_to_back(
     Optionales ``rank_callable`` kann verwendet werden, um aus ``(score, model)``
     einen Vergleichswert abzuleiten (z. B. für custom Ranking-Logik).
 
+    ``rounds`` (Successive Halving): je Runde zusätzliche Solve-kwargs, z. B.
+    ``({}, {"quick": False})``. Runde 1 löst alle Modelle, jede weitere nur
+    die Top-k der Vorrunde (``select_survivors``: ceil(n/halving_eta), begrenzt
+    durch das Rest-Budget). ``max_trials`` gilt je Runde. Gewinner ist der
+    beste Kandidat der höchsten Runde mit Ergebnis.
+
     Rückgabe: {"model": best_model, "score": best_score,
-               "rank_value": rank_value, "trials": N, "duration": s}
+               "rank_value": rank_value, "trials": N, "duration": s,
+               "survivors": [[Modelle je Runde], ...]}
     """
 
     solve_kwargs = solve_kwargs or {}
@@ -98,27 +114,49 @@ def solve_eval_back_to_back(
     best: Optional[Tuple[float, Any, float]] = None
     trials = 0
     models = list(candidate_models)
+    solve_secs: list[float] = []
+    survivors_log: list[list[Any]] = []
+    prev_ranked: list[tuple[float, Any]] = []
 
     with phase_lock("SOLVE_EVAL"), undo_off(), solve_eval_mode():
-        for model in models:
-            if trials >= max_trials or (time.perf_counter() - t0) > time_budget_sec:
-                print("[SolveEval] Budget erreicht – abbrechen.")
-                break
-            # WICHTIG: nur Model setzen + Solve aufrufen. Nichts anderes.
-            apply_model(model)
-            t1 = time.perf_counter()
-            score = do_solve(quick=quick, **solve_kwargs)  # dein solve_camera()-Wrapper
-            dt = time.perf_counter() - t1
-            rank_value = rank_callable(score, model) if rank_callable else score
-            if rank_callable:
-                print(
-                    f"[SolveEval] {model}: score={score:.6f} rank={rank_value:.6f} dur={dt:.3f}s"
+        for r_idx, round_kwargs in enumerate(list(rounds) or [{}]):
+            if r_idx > 0:
+                if not prev_ranked:
+                    break
+                models = select_survivors(
+                    prev_ranked,
+                    eta=halving_eta,
+                    budget_sec=time_budget_sec,
+                    elapsed_sec=time.perf_counter() - t0,
+                    solve_sec=(sum(solve_secs) / len(solve_secs)) if solve_secs else None,
                 )
-            else:
-                print(f"[SolveEval] {model}: score={score:.6f} dur={dt:.3f}s")
-            if (best is None) or (rank_value < best[0]):
-                best = (rank_value, model, score)
-            trials += 1
+            survivors_log.append(list(models))
+            kwargs = {"quick": quick, **solve_kwargs, **round_kwargs}
+            round_best: Optional[Tuple[float, Any, float]] = None
+            prev_ranked = []
+            for model in models:
+                if len(prev_ranked) >= max_trials or (time.perf_counter() - t0) > time_budget_sec:
+                    print("[SolveEval] Budget erreicht – abbrechen.")
+                    break
+                # WICHTIG: nur Model setzen + Solve aufrufen. Nichts anderes.
+                apply_model(model)
+                t1 = time.perf_counter()
+                score = do_solve(**kwargs)  # dein solve_camera()-Wrapper
+                dt = time.perf_counter() - t1
+                solve_secs.append(dt)
+                rank_value = rank_callable(score, model) if rank_callable else score
+                if rank_callable:
+                    print(
+                        f"[SolveEval] R{r_idx + 1} {model}: score={score:.6f} rank={rank_value:.6f} dur={dt:.3f}s"
+                    )
+                else:
+                    print(f"[SolveEval] R{r_idx + 1} {model}: score={score:.6f} dur={dt:.3f}s")
+                if (round_best is None) or (rank_value < round_best[0]):
+                    round_best = (rank_value, model, score)
+                prev_ranked.append((rank_value, model))
+                trials += 1
+            if round_best is not None:
+                best = round_best
 
     return {
         "model": best[1] if best else None,  # Gewinner-Modell
@@ -126,6 +164,7 @@ def solve_eval_back_to_back(
         "rank_value": best[0] if best else float("inf"),  # Vergleichswert
         "trials": trials,
         "duration": time.perf_counter() - t0,
+        "survivors": survivors_log,
     }
 
 # ---------------------------------------------------------------------------
@@ -200,11 +239,14 @@ def solve_eval_with_final_refine(
     max_trials: int = 3,
     quick: bool = True,
     solve_kwargs: Optional[Dict[str, Any]] = None,
+    rounds: Iterable[Dict[str, Any]] = ({},),
+    halving_eta: int = 2,
 ) -> Dict[str, Any]:
     """
     Führt back-to-back die Modell-Evaluierung (3× Solve) aus und danach
     EINEN finalen Voll-Solve mit aktivierten Intrinsics-Refine-Flags.
     Eval bleibt strikt read-only; der finale Solve ist getrennt gekapselt.
+    ``rounds``/``halving_eta`` wie bei ``solve_eval_back_to_back``.
     Rückgabe enthält Eval- und Final-Score.
     """
     # 1) Eval (read-only, ohne mutierende Helfer)
@@ -218,6 +260,8 @@ def solve_eval_with_final_refine(
         max_trials=max_trials,
         quick=quick,
         solve_kwargs=solve_kwargs,
+        rounds=rounds,
+        halving_eta=halving_eta,
     )
     # 2) Finaler Refine-Solve (separat, mit allen Intrinsics-Flags)
     final_score = solve_final_refine(
@@ -235,15 +279,17 @@ def solve_eval_with_final_refine(
 # calls to ``print()`` in this module have been replaced by a no-op logger.
 # The ``_log`` function can be used in place of ``print`` to completely
 # suppress output. UI messages should continue to be emitted via ``self.report``.
+# With tracing enabled (scene key ``tco_trace``) messages become instant events
+# in the Chrome trace (Helper/trace.py).
 def _log(*args, **kwargs):
-    """No-op logger used to suppress console output."""
-    return None
+    """Logger without console output (trace instant event while tracing)."""
+    trace_log(*args)
 from ..Helper.find_low_marker_frame import run_find_low_marker_frame
 from ..Helper.jump_to_frame import run_jump_to_frame
 # Primitive importieren; Orchestrierung (Formel/Freeze) erfolgt hier.
 from ..Helper.detect import run_detect_once as _primitive_detect_once
 from ..Helper.distanze import run_distance_cleanup
-from ..Helper.spike_filter_cycle import run_marker_spike_filter_cycle
+from ..Helper.spike_filter_cycle import run_marker_spike_filter_cycle, plan_spike_threshold
 from ..Helper.clean_short_segments import clean_short_segments
 from ..Helper.clean_short_tracks import clean_short_tracks
 from ..Helper.split_cleanup import recursive_split_cleanup
@@ -257,8 +303,68 @@ from ..Helper.solve_eval import (
     collect_metrics,
     compute_parallax_scores,
     score_metrics,
+    select_survivors,
+    warm_start_intrinsics,
+)
+from ..Helper.solve_farm import SolveFarm, farm_available
+from ..Helper.epipolar import (
+    check_solve_feasibility,
+    find_feasible_keyframes,
+    find_epipolar_outliers,
+    apply_epipolar_prefilter,
 )
+from ..Helper.solve_cache import (
+    solve_fingerprint,
+    fingerprint_seed,
+    read_intrinsics,
+    restore_intrinsics,
+    recon_summary,
+    cache_get,
+    cache_put,
+)
+from ..Helper.track_snapshot import invalidate_track_snapshot, clear_track_snapshots
+from ..Helper.frame_coverage import clear_frame_coverage
 from ..Helper.reset_state import reset_for_new_cycle  # zentraler Reset (Bootstrap/Cycle)
+from ..Helper.completion import Completion, expect, discard, add_waker, remove_waker, job_running
+from ..Helper.headless import (
+    is_headless,
+    headless_clip_override,
+    HeadlessRun,
+    write_summary,
+)
+from ..Helper.clip_context import clip_override
+from ..Helper.frame_ops import (
+    sync_frame,
+    flush_view_layer,
+    set_frame_phase,
+    frame_ops_stats,
+    reset_frame_ops_stats,
+)
+from ..Helper.update_coalescer import (
+    begin_coalescing,
+    end_coalescing,
+    flush_updates,
+    coalescer_stats,
+    reset_coalescer_stats,
+)
+from ..Helper.trace import (
+    start_trace,
+    stop_trace,
+    is_tracing,
+    span,
+    trace_log,
+    profile_phase,
+    export_chrome_trace,
+    dump_profiles,
+    trace_stats,
+)
+from ..Helper.rna_profile import (
+    start_rna_profile,
+    stop_rna_profile,
+    is_rna_profiling,
+    set_rna_phase,
+    rna_profile_stats,
+)
 
 # Versuche, die Auswertungsfunktion fÃ¼r die Markeranzahl zu importieren.
 # Diese Funktion soll nach dem Distanz-Cleanup ausgefÃ¼hrt werden und
@@ -278,8 +384,8 @@ from ..Helper.tracker_settings import apply_tracker_settings
 from ..Helper.tracking_state import (
     orchestrate_on_jump,
     record_bidirectional_result,
-    _get_state,          # intern genutzt, um count zu prÃ¼fen
-    _ensure_frame_entry, # intern genutzt, um Frame-Eintrag zu holen
+    get_frame_count,            # count eines Frames aus dem In-Memory-State
+    checkpoint_tracking_state,  # State in die Szene schreiben (Laufende)
     reset_tracking_state,
     ABORT_AT,
 )
@@ -321,12 +427,13 @@ def _solve_log(context, value):
 # Optional: den Bidirectionalâ€‘Track Operator importieren. Wenn der Import
 # fehlschlÃ¤gt, bleibt die Variable auf None und es erfolgt kein Aufruf.
 try:
-    from ..Helper.bidirectional_track import CLIP_OT_bidirectional_track  # type: ignore
+    from ..Helper.bidirectional_track import CLIP_OT_bidirectional_track, run_bidirectional_track_sync  # type: ignore
 except Exception:
     try:
-        from .bidirectional_track import CLIP_OT_bidirectional_track  # type: ignore
+        from .bidirectional_track import CLIP_OT_bidirectional_track, run_bidirectional_track_sync  # type: ignore
     except Exception:
         CLIP_OT_bidirectional_track = None  # type: ignore
+        run_bidirectional_track_sync = None  # type: ignore
 
 # -----------------------------------------------------------------------------
 # Optionally import the multi-pass helper. This helper performs additional
@@ -374,33 +481,30 @@ PH_BIDI       = "BIDI"
 # ---- intern: State Keys / Locks -------------------------------------------
 _LOCK_KEY = "tco_lock"
 
+# ---- Tick-Scheduler ----------------------------------------------------------
+# Synchrone Phasen werden pro Timer-Tick verkettet, bis das Zeitbudget
+# (scene["tco_tick_budget_ms"]) verbraucht ist oder auf einen modalen
+# Unter-Operator gewartet wird. Das Timer-Intervall folgt dem Wartegrund.
+_TICK_BUDGET_MS_DEFAULT = 50.0
+_TICK_MAX_STEPS = 64            # Schutz gegen Endlosketten ohne Fortschritt
+_TIMER_BUSY = 0.01              # Budget erschöpft → sofort weiter
+_TIMER_WAIT = {                 # Warten auf Unter-Operator (Completion weckt zusätzlich)
+    "BIDI": 0.25,
+    "SOLVE": 0.5,
+    "FARM": 0.5,
+}
+_TIMER_DEFAULT = 0.10
+
 # ----------------------------------------------------------------------------
 # Utilities
 # ----------------------------------------------------------------------------
 
 def _ensure_clip_context(context: bpy.types.Context) -> dict:
-    """Finde einen CLIP_EDITOR und liefere ein temp_override-Dict fÃ¼r Clip-Operatoren."""
-    wm = bpy.context.window_manager
-    if not wm:
-        return {}
-    for win in wm.windows:
-        scr = getattr(win, "screen", None)
-        if not scr:
-            continue
-        for area in scr.areas:
-            if area.type != "CLIP_EDITOR":
-                continue
-            region = next((r for r in area.regions if r.type == "WINDOW"), None)
-            space = area.spaces.active if hasattr(area, "spaces") else None
-            if region and space:
-                return {
-                    "window": win,
-                    "area": area,
-                    "region": region,
-                    "space_data": space,
-                    "scene": bpy.context.scene,
-                }
-    return {}
+    """temp_override-Dict für Clip-Operatoren (gecachter Resolver, ``Helper/clip_context``).
+
+    Ohne CLIP_EDITOR (z. B. Headless) liefert der Resolver einen synthetischen Override.
+    """
+    return clip_override(context)
 
 def _resolve_clip(context: bpy.types.Context):
     """Robuster Clip-Resolver (Edit-Clip, Space-Clip, erster Clip)."""
@@ -445,6 +549,17 @@ def _marker_count_by_selected_track(context: bpy.types.Context) -> dict[str, int
             pass
     return out
 
+def _invalidate_selected_in_snapshot(context: bpy.types.Context) -> None:
+    """Snapshot-Einträge der ausgewählten (getrackten) Tracks verwerfen."""
+    clip = _resolve_clip(context)
+    if not clip:
+        return
+    try:
+        ptrs = [t.as_pointer() for t in clip.tracking.tracks if getattr(t, "select", False)]
+        invalidate_track_snapshot(clip, ptrs)
+    except Exception:
+        pass
+
 def _delta_counts(before: dict[str, int], after: dict[str, int]) -> dict[str, int]:
     """Delta = after - before (clamp â‰¥ 0)."""
     names = set(before) | set(after)
@@ -566,6 +681,20 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
     # ModalitÃ¤t kommt Ã¼ber modal(); Cursor-Grabbing ist nicht nÃ¶tig.
     bl_options = {"REGISTER", "UNDO"}
 
+    headless: BoolProperty(
+        name="Headless",
+        description="Synchron ohne Timer/UI laufen (blender -b); schreibt am Ende eine JSON-Zusammenfassung",
+        default=False,
+        options={"SKIP_SAVE"},
+    )
+    summary_path: StringProperty(
+        name="Summary",
+        description="Zielpfad der JSON-Zusammenfassung im Headless-Lauf ('//' = relativ zur .blend)",
+        default="",
+        subtype="FILE_PATH",
+        options={"SKIP_SAVE"},
+    )
+
     # â€” Laufzeit-State (nur Operator, nicht Szene) â€”
     _timer: object | None = None
     phase: str = PH_FIND_LOW
@@ -734,7 +863,40 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
     _tco_best: SolveMetrics | None = None
     _tco_auto_prev: bool = False
     _tco_keyframe_prev: tuple[int, int] | None = None
+    _tco_farm: SolveFarm | None = None
+    _tco_farm_jobs: list[tuple[str, int]] | None = None
+    # Successive Halving: aktuelle Runde (= Refine-Stufe), Start, Solve-Dauern
+    _tco_eval_round: int = 1
+    _tco_eval_t0: float = 0.0
+    _tco_solve_secs: list[float] | None = None
+    # Solve-Cache: Fingerprint je offenem Kandidaten, Anzahl Treffer im Lauf
+    _tco_eval_fps: dict[tuple[str, int], str] | None = None
+    _tco_cache_hits: int = 0
+    # Warm-Start: gelöste Intrinsics je Kandidat, Startwert-Herkunft, Laufzeit-Protokoll
+    _tco_intrinsics: dict[tuple[str, int], dict] | None = None
+    _tco_current_seed: str | None = None
+    _tco_farm_seeds: dict[tuple[str, int], tuple[str, dict]] | None = None
+    _tco_warm_log: list[dict] | None = None
+    # Fertig-Signale der Unter-Operatoren (Helper/completion.py) + Weck-Timer
+    _bidi_done: Completion | None = None
+    _tco_solve_done: Completion | None = None
+    _kick_timers: list | None = None
+    _win: object | None = None
+    _timer_interval: float = _TIMER_DEFAULT
+    # Headless-Lauf: Protokoll + Abschluss-Info für die Zusammenfassung
+    _headless_run: HeadlessRun | None = None
+    _finish_info: tuple[str | None, bool] | None = None
+
     def execute(self, context: bpy.types.Context):
+        if self.headless or is_headless():
+            self.headless = True
+            # Ein Override für den gesamten Lauf: alle Clip-Operatoren sehen
+            # denselben (synthetischen) CLIP_EDITOR.
+            with headless_clip_override(context, _resolve_clip(context)):
+                return self._execute(context)
+        return self._execute(context)
+
+    def _execute(self, context: bpy.types.Context):
         # Bootstrap/Reset
         try:
             _bootstrap(context)
@@ -742,6 +904,18 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
             self.report({'ERROR'}, f"Bootstrap failed: {exc}")
             return {'CANCELLED'}
         self.report({'INFO'}, "Coordinator: Bootstrap OK")
+        # Marker-Snapshots aus früheren Läufen verwerfen (Pointer können wiederverwendet sein)
+        clear_track_snapshots()
+        clear_frame_coverage()
+        reset_frame_ops_stats()
+        # Redraw-/Depsgraph-Wünsche der Helfer bis zum Tick-/Phasenende bündeln
+        reset_coalescer_stats()
+        begin_coalescing()
+        # Span-Tracing (Phasen, Helfer, bpy.ops) → Chrome-Trace in _finish
+        self._start_trace(context)
+        # Debug: RNA-Zugriffe der Helfer je Phase zählen
+        if bool(context.scene.get("tco_rna_profile", False)):
+            start_rna_profile()
 
         # Bootstrap: harter Neustart + Solve-Error-Log leeren
         reset_for_new_cycle(context, clear_solve_log=True)
@@ -776,7 +950,9 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
         except Exception:
             pass
 
-        
+        if self.headless:
+            return self._run_headless(context)
+
         wm = context.window_manager
         # --- Robust: valides Window sichern ---
         win = getattr(context, "window", None)
@@ -791,18 +967,72 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
             win = getattr(bpy.context, "window", None)
         try:
             # Wenn win None ist, Timer OHNE window anlegen (Blender erlaubt das)
-            self._timer = wm.event_timer_add(0.10, window=win) if win else wm.event_timer_add(0.10)
+            self._timer = wm.event_timer_add(_TIMER_DEFAULT, window=win) if win else wm.event_timer_add(_TIMER_DEFAULT)
             self.report({'INFO'}, f"Timer status=OK (window={'set' if win else 'none'})")
         except Exception as exc:
             self.report({'WARNING'}, f"Timer setup failed ({exc}); retry without window")
             try:
-                self._timer = wm.event_timer_add(0.10)
+                self._timer = wm.event_timer_add(_TIMER_DEFAULT)
             except Exception as exc2:
                 self.report({'ERROR'}, f"Timer hard-failed: {exc2}")
+                end_coalescing(context)
+                stop_trace()
+                stop_rna_profile()
                 return {'CANCELLED'}
         wm.modal_handler_add(self)
+        # Unter-Operatoren wecken den Coordinator direkt beim Beenden
+        self._win = win
+        self._timer_interval = _TIMER_DEFAULT
+        self._kick_timers = []
+        add_waker(self._on_completion)
         return {'RUNNING_MODAL'}
 
+    def _on_completion(self, comp: Completion) -> None:
+        """Waker: 0-s-Timer einplanen → nächster modal()-Tick sofort."""
+        if self._timer is None:
+            return
+        try:
+            wm = bpy.context.window_manager
+            kick = wm.event_timer_add(0.0, window=self._win) if self._win else wm.event_timer_add(0.0)
+            self._kick_timers.append(kick)
+        except Exception:
+            pass
+
+    def _drop_kick_timers(self, context) -> None:
+        for kick in self._kick_timers or ():
+            try:
+                context.window_manager.event_timer_remove(kick)
+            except Exception:
+                pass
+        self._kick_timers = []
+
+    def _run_headless(self, context: bpy.types.Context):
+        """Synchrone, timerlose Schleife über dieselben Phasen wie ``modal``."""
+        run = self._headless_run = HeadlessRun()
+        self._finish_info = None
+        result = {'RUNNING_MODAL'}
+        while 'RUNNING_MODAL' in result:
+            phase = self.phase if self.phase != PH_SOLVE_EVAL else f"{self.phase}:{self._tco_state}"
+            t0 = time.perf_counter()
+            try:
+                result = self._traced_phase(context)
+            except KeyboardInterrupt:
+                result = self._finish(context, info="Headless-Lauf unterbrochen.", cancelled=True)
+            except Exception as exc:
+                result = self._finish(context, info=f"Headless-Lauf fehlgeschlagen in {phase}: {exc!r}", cancelled=True)
+            run.record(phase, time.perf_counter() - t0, self.phase)
+            # Headless: gebündelte Updates einmal pro Phase
+            if self.phase != phase.split(":", 1)[0]:
+                flush_updates(context)
+
+        info, cancelled = self._finish_info or (None, 'CANCELLED' in result)
+        status = 'CANCELLED' if cancelled else 'FINISHED'
+        try:
+            write_summary(self.summary_path or None, run.to_dict(context, status=status, info=info))
+        except Exception as exc:
+            print(f"[Headless] Summary fehlgeschlagen: {exc!r}")
+        return result
+
     # -- Solve-Eval intern -------------------------------------------------
     def _init_solve_eval(self):
         self._tco_state = "EVAL_PREP"
@@ -815,13 +1045,50 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
         self._tco_cfg = SolveConfig()
         self._tco_cam_defaults = None
         self._tco_best = None
+        self._tco_farm = None
+        self._tco_farm_jobs = None
+        self._tco_eval_round = 1
+        self._tco_eval_t0 = time.monotonic()
+        self._tco_solve_secs = []
+        self._tco_eval_fps = {}
+        self._tco_cache_hits = 0
+        self._tco_intrinsics = {}
+        self._tco_current_seed = None
+        self._tco_farm_seeds = None
+        self._tco_warm_log = []
+
+    # Runde 1 löst alle Modelle, Runde 2 (Refine-Stufe 2) nur die Überlebenden
+    _EVAL_MODELS = ("POLYNOMIAL", "DIVISION", "BROWN")
+    _EVAL_ROUNDS = 2
 
     def _build_eval_queue(self):
-        models = ("POLYNOMIAL", "DIVISION", "BROWN")
-        stages = (1, 2)
-        for m in models:
-            for s in stages:
-                yield (m, s)
+        for m in self._EVAL_MODELS:
+            yield (m, 1)
+
+    def _advance_eval_round(self, context) -> bool:
+        """Successive Halving: Top-k der aktuellen Runde in die nächste Stufe.
+
+        False, wenn alle Runden gelaufen sind (→ Gewinner anwenden).
+        """
+        if self._tco_eval_round >= self._EVAL_ROUNDS:
+            return False
+        cfg = self._tco_cfg or SolveConfig()
+        scn = context.scene
+        prev = [(m.score, m.model) for m in (self._tco_metrics or []) if m.refine_stage == self._tco_eval_round]
+        if not prev:
+            return False
+        secs = self._tco_solve_secs or []
+        survivors = select_survivors(
+            prev,
+            eta=cfg.halving_eta,
+            budget_sec=float(scn.get("tco_solve_eval_budget_sec", cfg.time_budget_sec)),
+            elapsed_sec=time.monotonic() - self._tco_eval_t0,
+            solve_sec=(sum(secs) / len(secs)) if secs else None,
+        )
+        self._tco_eval_round += 1
+        self._tco_eval_queue = [(m, self._tco_eval_round) for m in survivors]
+        self.report({'INFO'}, f"Solve-Eval Runde {self._tco_eval_round}: {', '.join(survivors)}")
+        return True
 
     def _get_clip(self, context):
         return _resolve_clip(context)
@@ -846,31 +1113,225 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
             mid = (fs + fe) // 2
             obj.keyframe_a = max(fs, mid - cfg.parallax_delta)
             obj.keyframe_b = min(fe, mid + cfg.parallax_delta)
+        feas = self._check_keyframes(context, clip, obj, scores, (fs, fe))
+        if feas is not None and feas["status"] != "OK":
+            # Kein tragfähiges Paar gefunden – die Heuristik kann irren, daher
+            # nicht abbrechen, sondern Blender die Keyframes wählen lassen
+            tr_settings.use_keyframe_selection = True
+            feas = dict(feas, fallback="KEYFRAME_SELECTION")
+            _log(f"[Coordinator] WARN: Keyframe-Paar nicht machbar ({feas.get('reason')}) → automatische Keyframe-Auswahl")
+            try:
+                context.scene["tco_last_solve_feasibility"] = feas
+            except Exception:
+                pass
         self._tco_keyframe_prev = (obj.keyframe_a, obj.keyframe_b)
+        # Seed aus dem Fingerprint → gleiche Eingaben, gleiche Hold-outs (Cache-Treffer)
         holdouts = choose_holdouts(
             clip,
             ratio=cfg.holdout_ratio,
             grid=cfg.holdout_grid,
             edge_boost=cfg.holdout_edge_boost,
+            seed=fingerprint_seed(solve_fingerprint(clip, solver_flags=False)),
         )
         self._tco_holdouts = {t: getattr(t, "weight", 1.0) for t in holdouts}
         set_holdout_weights(holdouts, 0.0)
         cam = tr.camera
         self._tco_f_nom = float(getattr(cam, "focal_length", 0.0)) or 0.0
-        self._tco_cam_defaults = {
-            "distortion_model": cam.distortion_model,
-            "focal_length": float(getattr(cam, "focal_length", 0.0)),
-            "k1": float(getattr(cam, "k1", 0.0)),
-            "k2": float(getattr(cam, "k2", 0.0)),
-            "k3": float(getattr(cam, "k3", 0.0)),
-            "division_k1": float(getattr(cam, "division_k1", 0.0)),
-            "division_k2": float(getattr(cam, "division_k2", 0.0)),
-            "brown_k1": float(getattr(cam, "brown_k1", 0.0)),
-            "brown_k2": float(getattr(cam, "brown_k2", 0.0)),
-            "brown_k3": float(getattr(cam, "brown_k3", 0.0)),
-            "brown_k4": float(getattr(cam, "brown_k4", 0.0)),
-            "brown_p1": float(getattr(cam, "brown_p1", 0.0)),
-            "brown_p2": float(getattr(cam, "brown_p2", 0.0)),
+        self._tco_cam_defaults = read_intrinsics(cam)
+        return feas
+
+    def _check_keyframes(self, context, clip, obj, scores, frame_range) -> dict | None:
+        """Epipolar-Vorprüfung des Keyframe-Paars; bei Bedarf Re-Key.
+
+        None = Prüfung abgeschaltet (Scene-Key ``tco_solve_feasibility``).
+        Ergebnis landet in ``scene["tco_last_solve_feasibility"]``. Bleibt es
+        bei "nicht machbar", solvt ``_prepare_eval`` mit automatischer
+        Keyframe-Auswahl statt den Lauf zu beenden.
+        """
+        scn = context.scene
+        if not bool(scn.get("tco_solve_feasibility", True)):
+            return None
+        cfg = self._tco_cfg or SolveConfig()
+        kw = {"min_parallax_px": float(scn.get("tco_feasibility_min_parallax_px", 2.0))}
+        try:
+            res = check_solve_feasibility(clip, obj.keyframe_a, obj.keyframe_b, **kw)
+            if res["status"] != "OK":
+                alt = find_feasible_keyframes(clip, scores, cfg.parallax_delta, frame_range, **kw)
+                if alt["status"] == "OK":
+                    obj.keyframe_a, obj.keyframe_b = alt["keyframes"]
+                    alt["rekeyed_from"] = res["keyframes"]
+                    self.report({'INFO'}, f"Solve-Eval: Keyframes neu gesetzt {alt['keyframes']} ({res['reason']})")
+                res = alt
+        except Exception as exc:
+            _log(f"[Coordinator] WARN: Machbarkeitsprüfung fehlgeschlagen: {exc}")
+            return None
+        try:
+            scn["tco_last_solve_feasibility"] = dict(res)
+        except Exception:
+            pass
+        return res
+
+    def _epipolar_prefilter(self, context) -> None:
+        """Solve-freier Ausreißer-Vorfilter vor dem ersten Solve.
+
+        Tracks, die die Epipolarbedingung über den Clip hinweg mehrheitlich um
+        mehr als ``error_track`` verletzen, werden markiert (selektiert) und in
+        ``scene["tco_last_epipolar_prefilter"]`` abgelegt. Opt-in über
+        ``tco_epipolar_prefilter``; ``tco_epipolar_prefilter_action`` =
+        "MUTE"/"DELETE" entfernt sie zusätzlich.
+        """
+        scn = context.scene
+        if not bool(scn.get("tco_epipolar_prefilter", False)):
+            return
+        clip = self._get_clip(context)
+        cfg = self._tco_cfg or SolveConfig()
+        try:
+            found = find_epipolar_outliers(
+                clip,
+                _clip_frame_range(clip),
+                px_thresh=float(scn.get("tco_epipolar_px", getattr(scn, "error_track", 2.0))),
+                gap=2 * int(cfg.parallax_delta),
+            )
+            res = apply_epipolar_prefilter(
+                clip, found, action=str(scn.get("tco_epipolar_prefilter_action", "SELECT"))
+            )
+        except Exception as exc:
+            _log(f"[Coordinator] WARN: Epipolar-Vorfilter fehlgeschlagen: {exc}")
+            return
+        summary = {k: found[k] for k in ("status", "pairs", "skipped", "checked", "candidates", "px_thresh")}
+        summary.update(res, names=found["names"][:50])
+        try:
+            scn["tco_last_epipolar_prefilter"] = summary
+        except Exception:
+            pass
+        if res["affected"]:
+            self.report({'INFO'}, (
+                f"Epipolar-Vorfilter: {res['affected']} Track(s) {res['action']} "
+                f"({found['pairs']} Frame-Paare, >{found['px_thresh']:.2f}px)"
+            ))
+
+    # -- Solve-Cache (Helper/solve_cache.py) ----------------------------------
+    def _eval_cache_key(self, clip) -> str:
+        # Refine-Flags setzt SOLVE_EVAL je Solve selbst → nicht Teil der Eingabe
+        return solve_fingerprint(clip, solver_flags=False, extra="SOLVE_EVAL")
+
+    def _try_cached_eval(self, context) -> bool:
+        """Gesamte SOLVE_EVAL überspringen, wenn Eingaben + live Rekonstruktion
+        einem früheren Lauf entsprechen."""
+        clip = self._get_clip(context)
+        try:
+            entry = cache_get(clip, self._eval_cache_key(clip))
+            if not entry or entry.get("recon") != recon_summary(clip):
+                return False
+            restore_intrinsics(clip.tracking.camera, entry.get("intrinsics"))
+            best = SolveMetrics(**entry["best"])
+        except Exception:
+            return False
+        self._tco_best = best
+        self._tco_metrics = [SolveMetrics(**m) for m in entry.get("all", ())]
+        context.scene["tco_last_solve_eval"] = {"winner": best.model, "best": best.__dict__, "cached": True}
+        self.report({'INFO'}, f'Solve-Eval (Cache): {best.model} score={best.score:.3f}')
+        return True
+
+    def _store_eval_cache(self, context) -> None:
+        clip = self._get_clip(context)
+        best = self._tco_best
+        try:
+            cache_put(clip, self._eval_cache_key(clip), {
+                "best": dict(best.__dict__),
+                "all": [dict(m.__dict__) for m in (self._tco_metrics or [])],
+                "intrinsics": read_intrinsics(clip.tracking.camera),
+                "recon": recon_summary(clip),
+            })
+        except Exception as exc:
+            _log(f"[Coordinator] WARN: Solve-Cache nicht geschrieben: {exc}")
+
+    def _candidate_cached(self, context, model: str, stage: int) -> bool:
+        """Kandidat einrichten (inkl. Warm-Start) und ggf. aus dem Cache bedienen.
+
+        Der Fingerprint wird nach dem Einrichten gebildet, enthält also die
+        tatsächlichen Startwerte. Bei einem Fehlgriff bleibt er für das
+        Speichern nach dem Solve hinterlegt.
+        """
+        clip = self._get_clip(context)
+        cfg = self._tco_cfg or SolveConfig()
+        self._setup_model_refine(context, model, stage)
+        try:
+            fp = solve_fingerprint(clip, extra=("candidate", cfg.center_box))
+        except Exception:
+            return False
+        entry = cache_get(clip, fp)
+        if entry is None:
+            if self._tco_eval_fps is None:
+                self._tco_eval_fps = {}
+            self._tco_eval_fps[(model, stage)] = fp
+            return False
+        self._append_metrics(model, stage, *entry["metrics"], entry["f_solved"])
+        if entry.get("intrinsics") and self._tco_intrinsics is not None:
+            self._tco_intrinsics[(model, stage)] = dict(entry["intrinsics"])
+        self._tco_cache_hits += 1
+        return True
+
+    def _take_cached_candidates(self, context) -> None:
+        """Kandidaten mit bekanntem Fingerprint aus dem Cache bedienen (kein Solve)."""
+        self._tco_eval_queue = [
+            (model, stage) for model, stage in list(self._tco_eval_queue or [])
+            if not self._candidate_cached(context, model, stage)
+        ]
+
+    def _store_candidate_cache(self, clip, model, stage, metrics, f_solved, intrinsics) -> None:
+        fp = (self._tco_eval_fps or {}).get((model, stage))
+        if not fp:
+            return
+        try:
+            cache_put(clip, fp, {
+                "metrics": tuple(metrics),
+                "f_solved": float(f_solved),
+                "intrinsics": dict(intrinsics or {}),
+                "recon": recon_summary(clip),
+            })
+        except Exception:
+            pass
+
+    def _log_warm_run(self, model, stage, seed_from, solve_sec: float) -> None:
+        if self._tco_warm_log is not None:
+            self._tco_warm_log.append({
+                "model": str(model), "stage": int(stage),
+                "seed": seed_from or "", "solve_sec": round(float(solve_sec), 3),
+            })
+
+    def _warm_start_summary(self, context) -> dict:
+        """Ersparnis je warm gestartetem Kandidaten gegenüber dem Kaltstart
+        desselben Modells (gleiche Refine-Stufe).
+
+        Kaltstart-Zeiten je Modell/Stufe werden in ``scene["tco_solve_cold_sec"]``
+        fortgeschrieben, damit auch Läufe ohne eigenen Kaltstart des Modells
+        einen Vergleich haben. Die Iterationszahl des Solvers ist über die
+        Python-API nicht verfügbar; protokolliert wird die Wall-Time.
+        """
+        scn = context.scene
+        log = list(self._tco_warm_log or [])
+        try:
+            cold_ref = {str(k): float(v) for k, v in dict(scn.get("tco_solve_cold_sec", {})).items()}
+        except Exception:
+            cold_ref = {}
+        for e in log:
+            if not e["seed"]:
+                cold_ref[f"{e['model']}/{e['stage']}"] = e["solve_sec"]
+        saved_total = 0.0
+        for e in log:
+            ref = cold_ref.get(f"{e['model']}/{e['stage']}")
+            if e["seed"] and ref is not None:
+                e["saved_sec"] = round(ref - e["solve_sec"], 3)
+                saved_total += e["saved_sec"]
+        try:
+            scn["tco_solve_cold_sec"] = cold_ref
+        except Exception:
+            pass
+        return {
+            "cold_sec": {k: round(v, 3) for k, v in cold_ref.items()},
+            "saved_sec_total": round(saved_total, 3),
+            "candidates": log,
         }
 
     def _set_refine_stage(self, tr_settings, stage: int):
@@ -884,30 +1345,58 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
         except Exception:
             pass
 
+    def _warm_seed(self, context, model: str, stage: int) -> tuple[str | None, dict | None]:
+        """Startwerte aus dem bisher besten gelösten Kandidaten (für ``model``
+        umgerechnet; nur Brennweite + in ``stage`` verfeinerte Koeffizienten)."""
+        cfg = self._tco_cfg or SolveConfig()
+        if not bool(context.scene.get("tco_solve_eval_warm_start", cfg.warm_start)):
+            return None, None
+        solved = self._tco_intrinsics or {}
+        done = [m for m in (self._tco_metrics or []) if (m.model, m.refine_stage) in solved]
+        if not done:
+            return None, None
+        best = min(done, key=lambda m: (m.score, m.holdout_p95_px, m.edge_gap_px))
+        seed = warm_start_intrinsics(solved[(best.model, best.refine_stage)], model, stage)
+        return f"{best.model}/{best.refine_stage}", seed
+
     def _setup_model_refine(self, context, model: str, stage: int):
         clip = self._get_clip(context)
         tr = clip.tracking
         cam = tr.camera
         tr_settings = tr.settings
-        defaults = self._tco_cam_defaults or {}
-        for attr, val in defaults.items():
-            try:
-                setattr(cam, attr, val)
-            except Exception:
-                pass
+        restore_intrinsics(cam, self._tco_cam_defaults)
         cam.distortion_model = model
+        seed_from, seed = self._warm_seed(context, model, stage)
+        if seed:
+            restore_intrinsics(cam, seed)
         self._set_refine_stage(tr_settings, stage)
         self._tco_current_model = model
         self._tco_current_stage = stage
+        self._tco_current_seed = seed_from
 
-    def _begin_solve(self, context):
+    def _expect_solve(self, context) -> None:
+        """Digest merken + Completion "solve" (aufgelöst im depsgraph-Handler)."""
         clip = self._get_clip(context)
-        self._tco_solve_digest_before = self._recon_digest(clip)
+        before = self._recon_digest(clip)
+        self._tco_solve_digest_before = before
+
+        def _probe():
+            if job_running("CLIP_SOLVE_CAMERA"):
+                return None
+            now = self._recon_digest(clip)
+            if now == before:
+                return None
+            return "OK" if (now.valid and now.num_cams > 0) else "FAILED"
+
+        self._tco_solve_done = expect("solve", probe=_probe)
         self._tco_solve_started_at = time.monotonic()
+
+    def _begin_solve(self, context):
+        self._expect_solve(context)
         try:
-            solve_camera_only(context)
+            solve_camera_only(context, blocking=self.headless)
         except Exception:
-            bpy.ops.clip.solve_camera('INVOKE_DEFAULT')
+            bpy.ops.clip.solve_camera('EXEC_DEFAULT' if self.headless else 'INVOKE_DEFAULT')
         self._tco_state = "WAIT_SOLVE"
 
     def _recon_digest(self, clip) -> _ReconDigest:
@@ -940,12 +1429,20 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
 
     def _solve_finished(self, context) -> tuple[bool, bool]:
         clip = self._get_clip(context)
+        fut = self._tco_solve_done
+        if fut is not None and fut.done():
+            self._tco_solve_done = None
+            return True, fut.result == "OK"
         before = self._tco_solve_digest_before
         now = self._recon_digest(clip)
         changed = (now != before)
         ok = (now.valid and now.num_cams > 0)
         timed_out = (time.monotonic() - self._tco_solve_started_at) > self._tco_timeout_sec
-        done = changed or timed_out
+        # Headless wird blockierend gelöst → nach dem Aufruf immer fertig
+        done = changed or timed_out or self.headless
+        if done:
+            discard("solve")
+            self._tco_solve_done = None
         return done, (ok and not timed_out)
 
     def _collect_metrics_current_run(self, context, *, ok: bool):
@@ -959,14 +1456,29 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
             hold_med = hold_p95 = edge_gap = 999.0
             persist = 0.0
         f_solved = float(getattr(cam, "focal_length", 0.0)) or self._tco_f_nom
+        if ok:
+            intrinsics = read_intrinsics(cam)
+            if self._tco_intrinsics is not None:
+                self._tco_intrinsics[(self._tco_current_model, self._tco_current_stage)] = intrinsics
+            self._store_candidate_cache(
+                clip, self._tco_current_model, self._tco_current_stage,
+                (hold_med, hold_p95, edge_gap, persist), f_solved, intrinsics,
+            )
+        self._append_metrics(
+            self._tco_current_model or "POLYNOMIAL", self._tco_current_stage,
+            hold_med, hold_p95, edge_gap, persist, f_solved,
+        )
+
+    def _append_metrics(self, model, stage, hold_med, hold_p95, edge_gap, persist, f_solved):
+        cfg = self._tco_cfg or SolveConfig()
         fov_dev_norm = abs(f_solved - self._tco_f_nom) / self._tco_f_nom if self._tco_f_nom > 0 else 0.0
         score = score_metrics(hold_med, hold_p95, edge_gap, persist, fov_dev_norm, cfg.score_w)
         if self._tco_metrics is None:
             self._tco_metrics = []
         self._tco_metrics.append(
             SolveMetrics(
-                model=self._tco_current_model or "POLYNOMIAL",
-                refine_stage=self._tco_current_stage,
+                model=model,
+                refine_stage=stage,
                 holdout_med_px=hold_med,
                 holdout_p95_px=hold_p95,
                 edge_gap_px=edge_gap,
@@ -976,6 +1488,92 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
             )
         )
 
+    # -- Solve-Farm (parallele Kandidaten in blender -b) ----------------------
+    def _start_farm(self, context) -> bool:
+        """Kandidaten an Background-Worker verteilen; False → sequentieller Pfad.
+
+        Opt-in über ``scene["tco_solve_farm"]`` (speichert eine Kopie der Datei
+        und startet Background-Prozesse).
+        """
+        scn = context.scene
+        if not bool(scn.get("tco_solve_farm", False)) or not farm_available():
+            return False
+        queue = list(self._tco_eval_queue or [])
+        if len(queue) < 2:
+            return False
+        cfg = self._tco_cfg or SolveConfig()
+        seeds = {}
+        for model, stage in queue:
+            seed_from, seed = self._warm_seed(context, model, stage)
+            if seed:
+                seeds[(model, stage)] = (seed_from, seed)
+        farm = SolveFarm(
+            self._get_clip(context),
+            queue,
+            cam_defaults=self._tco_cam_defaults,
+            seeds={k: v[1] for k, v in seeds.items()},
+            holdouts=[t.name for t in (self._tco_holdouts or {})],
+            center_box=cfg.center_box,
+            workers=int(scn.get("tco_solve_farm_workers", 0) or 0),
+            job_timeout=float(scn.get("tco_solve_farm_timeout_sec", 300.0) or 300.0),
+        )
+        try:
+            farm.start()
+        except Exception as exc:
+            farm.cancel()
+            self.report({'WARNING'}, f"Solve-Farm nicht gestartet ({exc}) – sequentiell")
+            return False
+        self._tco_farm = farm
+        self._tco_farm_jobs = queue
+        self._tco_farm_seeds = seeds
+        self._tco_eval_queue = []
+        self.report({'INFO'}, f"Solve-Farm: {len(queue)} Kandidaten auf {farm.workers} Worker")
+        return True
+
+    def _collect_farm_results(self, context) -> None:
+        """Worker-Ergebnisse → SolveMetrics (Kandidaten-Reihenfolge wie sequentiell)."""
+        farm, jobs = self._tco_farm, list(self._tco_farm_jobs or [])
+        seeds = self._tco_farm_seeds or {}
+        self._tco_farm = None
+        self._tco_farm_jobs = None
+        self._tco_farm_seeds = None
+        by_key = {(r.get("model"), int(r.get("stage") or 0)): r for r in farm.results}
+        n_ok = sum(1 for r in farm.results if r.get("ok"))
+        try:
+            context.scene["tco_last_solve_farm"] = {
+                "jobs": len(jobs),
+                "workers": farm.workers,
+                "ok": n_ok,
+                "wall_sec": round(farm.wall_sec(), 3),
+            }
+        except Exception:
+            pass
+        farm.cleanup()
+        if not n_ok:
+            # Worker-Umgebung unbrauchbar (z. B. Clip-Pfad nicht erreichbar) → live lösen
+            self.report({'WARNING'}, "Solve-Farm ohne Ergebnis – sequentieller Fallback")
+            self._tco_eval_queue = jobs
+            return
+        secs = [float(r["solve_sec"]) for r in farm.results if r.get("ok") and r.get("solve_sec")]
+        if self._tco_solve_secs is not None:
+            self._tco_solve_secs.extend(secs)
+        for model, stage in jobs:
+            r = by_key.get((model, stage)) or {}
+            if r.get("ok") and "hold_med" in r:
+                vals = (float(r["hold_med"]), float(r["hold_p95"]), float(r["edge_gap"]), float(r["persist"]))
+            else:
+                vals = (999.0, 999.0, 999.0, 0.0)
+            f_solved = float(r.get("focal_length") or 0.0) or self._tco_f_nom
+            if r.get("ok") and "hold_med" in r:
+                if r.get("intrinsics") and self._tco_intrinsics is not None:
+                    self._tco_intrinsics[(model, stage)] = dict(r["intrinsics"])
+                self._store_candidate_cache(
+                    self._get_clip(context), model, stage, vals, f_solved, r.get("intrinsics"),
+                )
+            if r.get("solve_sec") is not None:
+                self._log_warm_run(model, stage, seeds.get((model, stage), (None,))[0], float(r["solve_sec"]))
+            self._append_metrics(model, stage, *vals, f_solved)
+
     def _pick_best_run(self):
         if not self._tco_metrics:
             raise RuntimeError("No solve metrics collected")
@@ -1011,6 +1609,7 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
         # 2) Alle drei Intrinsics-Refine-Flags aktivieren (UI + Solve-Call)
         _apply_refine_flags(context, focal=True, principal=True, radial=True)
         # 3) Finalen Refine-Solve starten – synchron, mit Flags
+        self._expect_solve(context)
         try:
             solve_camera_only(
                 context,
@@ -1020,9 +1619,8 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
             )
         except Exception:
             # Fallback auf den Operator (nimmt Flags aus tracking.settings mit)
-            bpy.ops.clip.solve_camera('INVOKE_DEFAULT')
+            bpy.ops.clip.solve_camera('EXEC_DEFAULT' if self.headless else 'INVOKE_DEFAULT')
         # 4) State umstellen – der modal()-Loop wartet auf Abschluss
-        self._tco_solve_started_at = time.monotonic()
         self._tco_state = "WAIT_FINAL_SOLVE"
 
     def _finish(self, context, *, info: str | None = None, cancelled: bool = False):
@@ -1033,10 +1631,50 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
         except Exception:
             pass
         self._timer = None
+        remove_waker(self._on_completion)
+        if self._tco_farm is not None:
+            try:
+                self._tco_farm.cancel()
+            except Exception:
+                pass
+            self._tco_farm = None
+        self._drop_kick_timers(context)
+        for key in ("bidi", "solve"):
+            discard(key)
         try:
             self._restore_holdouts(context)
         except Exception:
             pass
+        # Tracking-State nur am Laufende in die Szene schreiben
+        try:
+            checkpoint_tracking_state(context)
+        except Exception:
+            pass
+        # Vermiedene Depsgraph-Auswertungen je Phase (Helper/frame_ops.py)
+        try:
+            context.scene["tco_last_frame_ops"] = frame_ops_stats()
+        except Exception:
+            pass
+        try:
+            end_coalescing(context)  # schaltet auch bei Flush-Fehlern ab
+        except Exception:
+            pass
+        try:
+            context.scene["tco_last_update_coalescer"] = coalescer_stats()
+        except Exception:
+            pass
+        set_frame_phase("IDLE")
+        self._finish_trace(context)
+        if is_rna_profiling():
+            stop_rna_profile()
+            try:
+                context.scene["tco_last_rna_profile"] = rna_profile_stats()
+            except Exception:
+                pass
+            # Snapshots halten Proxy-Tracks → nicht über den Lauf hinaus cachen
+            clear_track_snapshots()
+        set_rna_phase("IDLE")
+        self._finish_info = (info, cancelled)
         if info:
             self.report({'INFO'} if not cancelled else {'WARNING'}, info)
         return {'CANCELLED' if cancelled else 'FINISHED'}
@@ -1049,6 +1687,9 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
         # nur Timer-Events verarbeiten
         if event.type != 'TIMER':
             return {'PASS_THROUGH'}
+        # Weck-Timer sind einmalig
+        if self._kick_timers:
+            self._drop_kick_timers(context)
         # Optionales Debugging: erste 3 Ticks loggen
         try:
             count = int(getattr(self, "_dbg_tick_count", 0)) + 1
@@ -1057,7 +1698,123 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
             self._dbg_tick_count = count
         except Exception:
             pass
+        # Fehler in einer Phase beenden den Lauf sauber: _finish nimmt
+        # Update-Bündelung, bpy.ops-Patch und Waker wieder zurück
+        try:
+            return self._run_tick(context)
+        except Exception as exc:
+            _log(f"[Coordinator] ERROR in {self.phase}: {exc!r}")
+            return self._finish(context, info=f"Phase {self.phase} fehlgeschlagen: {exc!r}", cancelled=True)
+
+    # -- Tick-Scheduler ------------------------------------------------------
+    def _waiting_for(self) -> str | None:
+        """Wartegrund, falls ein modaler Unter-Operator noch läuft."""
+        if self.phase == PH_BIDI and self.bidi_started:
+            fut = self._bidi_done
+            if fut is None or not fut.done():
+                return "BIDI"
+        if self.phase == PH_SOLVE_EVAL and self._tco_state == "WAIT_FARM":
+            return "FARM"
+        if self.phase == PH_SOLVE_EVAL and self._tco_state in ("WAIT_SOLVE", "WAIT_FINAL_SOLVE"):
+            fut = self._tco_solve_done
+            if fut is None or not fut.done():
+                return "SOLVE"
+        return None
+
+    def _run_tick(self, context: bpy.types.Context):
+        """Verkettet Phasen innerhalb des Tick-Budgets; passt danach den Timer an."""
+        try:
+            budget = float(context.scene.get("tco_tick_budget_ms", _TICK_BUDGET_MS_DEFAULT)) / 1000.0
+        except Exception:
+            budget = _TICK_BUDGET_MS_DEFAULT / 1000.0
+        t0 = time.perf_counter()
+        steps = 0
+        while True:
+            result = self._traced_phase(context)
+            steps += 1
+            if 'RUNNING_MODAL' not in result:
+                return result
+            waiting = self._waiting_for()
+            if waiting is not None:
+                # Gebündelte Updates höchstens einmal pro Tick
+                flush_updates(context)
+                self._set_timer_interval(context, _TIMER_WAIT.get(waiting, _TIMER_DEFAULT))
+                return result
+            if steps >= _TICK_MAX_STEPS or (time.perf_counter() - t0) >= budget:
+                flush_updates(context)
+                self._set_timer_interval(context, _TIMER_BUSY)
+                return result
+
+    def _set_timer_interval(self, context, interval: float) -> None:
+        """Haupt-Timer nur bei geändertem Intervall neu anlegen."""
+        if self._timer is None or abs(interval - self._timer_interval) < 1e-6:
+            return
+        wm = context.window_manager
+        try:
+            new_timer = wm.event_timer_add(interval, window=self._win) if self._win else wm.event_timer_add(interval)
+        except Exception:
+            return
+        try:
+            wm.event_timer_remove(self._timer)
+        except Exception:
+            pass
+        self._timer = new_timer
+        self._timer_interval = interval
 
+    # -- Tracing -------------------------------------------------------------
+    def _start_trace(self, context) -> None:
+        scn = context.scene
+        try:
+            if not bool(scn.get("tco_trace", False)):
+                return
+            start_trace(
+                capacity=int(scn.get("tco_trace_capacity", 50000)),
+                profile=bool(scn.get("tco_trace_profile_dir", "")),
+            )
+        except Exception as exc:
+            _log(f"[Coordinator] WARN: Tracing nicht gestartet: {exc}")
+
+    def _finish_trace(self, context) -> None:
+        """Chrome-Trace + Phasen-Profile schreiben, Tracing beenden."""
+        if not is_tracing():
+            return
+        scn = context.scene
+        stop_trace()
+        try:
+            path = export_chrome_trace(
+                str(scn.get("tco_trace_path", "//kaiserlich_trace.json")),
+                metadata={"scene": scn.name},
+            )
+            profiles = []
+            prof_dir = str(scn.get("tco_trace_profile_dir", ""))
+            if prof_dir:
+                profiles = dump_profiles(prof_dir)
+            stats = trace_stats()
+            phases = {k: v for k, v in stats["spans"].items() if v["cat"] == "phase"}
+            scn["tco_last_trace"] = {
+                "path": path or "",
+                "events": stats["events"],
+                "dropped": stats["dropped"],
+                "profiles": profiles,
+                "phases": phases,
+            }
+            if path:
+                self.report({'INFO'}, f"Trace: {path}")
+        except Exception as exc:
+            _log(f"[Coordinator] WARN: Trace-Export fehlgeschlagen: {exc}")
+
+    def _traced_phase(self, context: bpy.types.Context):
+        """``_run_phase`` als Span (Label inkl. Solve-Zustand) + optionales cProfile."""
+        if not is_tracing():
+            return self._run_phase(context)
+        label = self.phase if self.phase != PH_SOLVE_EVAL else f"{self.phase}:{self._tco_state}"
+        with span(label, cat="phase"), profile_phase(label):
+            return self._run_phase(context)
+
+    def _run_phase(self, context: bpy.types.Context):
+        """Ein Schritt der Phasenmaschine (Timer-Tick bzw. Headless-Iteration)."""
+        set_frame_phase(self.phase)
+        set_rna_phase(self.phase)
         # PHASE 1: FIND_LOW
         if self.phase == PH_FIND_LOW:
             res = run_find_low_marker_frame(context)
@@ -1087,9 +1844,7 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
             try:
                 orchestrate_on_jump(context, int(self.target_frame))
                 # count prÃ¼fen (orchestrator zeigt bei ==10 bereits Popup)
-                _state = _get_state(context)
-                _entry, _ = _ensure_frame_entry(_state, int(self.target_frame))
-                _count = int(_entry.get("count", 1))
+                _count = get_frame_count(context, int(self.target_frame))
                 self.repeat_count_for_target = _count
                 # Abbruch erst, wenn tracking_state die globale Schwelle erreicht (inkl. +10 VerlÃ¤ngerung)
                 if _count >= ABORT_AT:
@@ -1145,6 +1900,8 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
                 clip = _resolve_clip(context)
                 post_ptrs = {int(t.as_pointer()) for t in getattr(clip.tracking, "tracks", [])}
                 base = self.pre_ptrs or set()
+                # Neue Tracks können freigegebene Pointer gelöschter Tracks erben
+                invalidate_track_snapshot(clip, post_ptrs - base)
                 print(f"[COORD] Post Detect: detect_new={len(post_ptrs - base)}")
             except Exception:
                 pass
@@ -1281,9 +2038,9 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
                                             t.select = True
                                         except Exception:
                                             pass
-                                # Frame sicher setzen
+                                # Frame sicher setzen (delete_marker nutzt den Clip-User-Frame)
                                 try:
-                                    scn.frame_set(curf)
+                                    sync_frame(scn, curf, need_depsgraph=True)
                                 except Exception:
                                     pass
                                 override = _ensure_clip_context(context)
@@ -1310,10 +2067,12 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
                                                 deleted_markers += 1
                                             except Exception:
                                                 break
+                            invalidate_track_snapshot(clip, new_ptrs_after_cleanup)
                             # Flush/Refresh, damit der Effekt sofort greift
+                            # (frame-frei entbehrlich: Marker werden per Frame gelesen)
                             try:
-                                bpy.context.view_layer.update()
-                                scn.frame_set(curf)
+                                flush_view_layer(context)
+                                sync_frame(scn, curf)
                             except Exception:
                                 pass
 
@@ -1343,12 +2102,10 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
 
                 # Markeranzahl im gÃ¼ltigen Bereich â€“ optional Multi-Pass und dann Bidirectional-Track ausfÃ¼hren.
                 did_multi = False
-                # NEU: Multi-Pass nur, wenn der *aktuelle* count (aus JSON) >= 6
+                # NEU: Multi-Pass nur, wenn der *aktuelle* count (aus dem Tracking-State) >= 6
                 wants_multi = False
                 try:
-                    _state = _get_state(context)
-                    _entry, _ = _ensure_frame_entry(_state, int(self.target_frame))
-                    _cnt_now = int(_entry.get("count", 1))
+                    _cnt_now = get_frame_count(context, int(self.target_frame))
                     self.repeat_count_for_target = _cnt_now  # fÃ¼r Logging/UI spiegeln
                     wants_multi = (_cnt_now >= 6)
                 except Exception:
@@ -1478,16 +2235,40 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
             return self._finish(context, info="Sequenz abgeschlossen.", cancelled=False)
         if self.phase == PH_SOLVE_EVAL:
             if self._tco_state == 'EVAL_PREP':
-                self._prepare_eval(context)
+                self._epipolar_prefilter(context)
+                if self._try_cached_eval(context):
+                    return self._finish(context, info='Sequenz abgeschlossen (Solve aus Cache).', cancelled=False)
+                feas = self._prepare_eval(context)
+                if feas is not None and feas["status"] != "OK":
+                    self.report({'WARNING'}, (
+                        f"Solve-Eval: Keyframe-Paar nicht machbar ({feas['reason']}) – "
+                        f"Solve mit automatischer Keyframe-Auswahl"
+                    ))
+                self._take_cached_candidates(context)
+                self._tco_state = 'WAIT_FARM' if self._start_farm(context) else 'EVAL_NEXT_RUN'
+                return {'RUNNING_MODAL'}
+
+            if self._tco_state == 'WAIT_FARM':
+                if self.headless:
+                    self._tco_farm.wait()
+                elif not self._tco_farm.poll():
+                    return {'RUNNING_MODAL'}
+                self._collect_farm_results(context)
                 self._tco_state = 'EVAL_NEXT_RUN'
                 return {'RUNNING_MODAL'}
 
             if self._tco_state == 'EVAL_NEXT_RUN':
                 if not self._tco_eval_queue:
+                    if self._advance_eval_round(context):
+                        self._take_cached_candidates(context)
+                        self._tco_state = 'WAIT_FARM' if self._start_farm(context) else 'EVAL_NEXT_RUN'
+                        return {'RUNNING_MODAL'}
                     self._apply_winner_and_start_final(context)
                     return {'RUNNING_MODAL'}
                 model, stage = self._tco_eval_queue.pop(0)
-                self._setup_model_refine(context, model, stage)
+                # Erst jetzt einrichten: Warm-Start nutzt den besten Solve dieser Runde
+                if self._candidate_cached(context, model, stage):
+                    return {'RUNNING_MODAL'}
                 self._begin_solve(context)
                 return {'RUNNING_MODAL'}
 
@@ -1495,6 +2276,10 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
                 done, ok = self._solve_finished(context)
                 if not done:
                     return {'RUNNING_MODAL'}
+                dt = time.monotonic() - self._tco_solve_started_at
+                if self._tco_solve_secs is not None:
+                    self._tco_solve_secs.append(dt)
+                self._log_warm_run(self._tco_current_model, self._tco_current_stage, self._tco_current_seed, dt)
                 self._tco_last_run_ok = ok
                 self._tco_state = 'COLLECT'
                 return {'RUNNING_MODAL'}
@@ -1511,7 +2296,12 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
                 best = self._tco_best
                 if best:
                     _solve_log(context, {"winner": best.model, "best": best.__dict__, "all": [m.__dict__ for m in self._tco_metrics]})
-                    context.scene["tco_last_solve_eval"] = {"winner": best.model, "best": best.__dict__}
+                    context.scene["tco_last_solve_eval"] = {
+                        "winner": best.model, "best": best.__dict__, "cache_hits": int(self._tco_cache_hits),
+                        "warm_start": self._warm_start_summary(context),
+                    }
+                    if ok:
+                        self._store_eval_cache(context)
                     self.report({'INFO'}, f'Solve-Eval: {best.model} score={best.score:.3f}')
                 return self._finish(context, info='Sequenz abgeschlossen.', cancelled=False)
             return {'RUNNING_MODAL'}
@@ -1519,6 +2309,18 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
         if self.phase == PH_SPIKE_CYCLE:
             scn = context.scene
             thr = float(self.spike_threshold or 100.0)
+            # Quantil-Modus: Zwischenstufen überspringen und direkt zur Schwelle
+            # springen, bei der FIND_MAX voraussichtlich FOUND meldet.
+            if str(scn.get("tco_spike_mode", "STEP")).upper() == "QUANTILE":
+                schedule = []
+                t = thr
+                while t >= 10:
+                    schedule.append(t)
+                    t *= 0.9
+                plan = plan_spike_threshold(context, schedule or [thr])
+                if plan.get("status") == "OK":
+                    thr = float(plan["threshold"])
+                    scn["tco_last_spike_plan"] = dict(plan)
             # 1) Spike-Filter
             try:
                 run_marker_spike_filter_cycle(context, track_threshold=thr)
@@ -1590,8 +2392,13 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
         # auf dessen Abschluss. Danach wird die Sequenz wieder bei PH_FIND_LOW fortgesetzt.
         if self.phase == PH_BIDI:
             scn = context.scene
-            bidi_active = bool(scn.get("bidi_active", False))
-            bidi_result = scn.get("bidi_result", "")
+            fut = self._bidi_done
+            if fut is not None:
+                bidi_active = not fut.done()
+                bidi_result = fut.result if fut.done() else ""
+            else:
+                bidi_active = bool(scn.get("bidi_active", False))
+                bidi_result = scn.get("bidi_result", "")
             # Operator noch nicht gestartet â†’ starten
             if not self.bidi_started:
                 if CLIP_OT_bidirectional_track is None:
@@ -1599,9 +2406,14 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
                 try:
                     # Snapshot vor Start (nur ausgewÃ¤hlte Tracks)
                     self.bidi_before_counts = _marker_count_by_selected_track(context)
+                    self._bidi_done = expect("bidi")
                     # Starte den Bidirectionalâ€‘Track mittels Operator. Das 'INVOKE_DEFAULT'
                     # sorgt dafÃ¼r, dass Blender den Operator modal ausfÃ¼hrt.
-                    bpy.ops.clip.bidirectional_track('INVOKE_DEFAULT')
+                    # Headless: synchron tracken; bidi_active ist danach bereits False.
+                    if self.headless and run_bidirectional_track_sync is not None:
+                        run_bidirectional_track_sync(context)
+                    else:
+                        bpy.ops.clip.bidirectional_track('INVOKE_DEFAULT')
                     self.bidi_started = True
                     self.report({'INFO'}, "Bidirectional-Track gestartet")
                 except Exception as exc:
@@ -1628,6 +2440,8 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
                     self.report({'INFO'}, f"A_k gespeichert @f{f}: sumÎ”={sum(per_marker_frames.values())}")
                 except Exception as _exc:
                     self.report({'WARNING'}, f"A_k speichern fehlgeschlagen: {_exc}")
+                # Tracking kann bestehende Marker überschreiben, ohne die Anzahl zu ändern
+                _invalidate_selected_in_snapshot(context)
                 # Erfolgreich: fÃ¼r die neue Runde zurÃ¼cksetzen
                 try:
                     clean_short_tracks(context)
@@ -1641,6 +2455,7 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
                 self.repeat_map = {}
                 self.bidi_started = False
                 self.bidi_before_counts = None
+                self._bidi_done = None
                 self.repeat_count_for_target = None
                 self.phase = PH_FIND_LOW
                 self.report({'INFO'}, "Bidirectional-Track abgeschlossen â€“ neuer Zyklus beginnt")
@@ -1650,7 +2465,7 @@ class CLIP_OT_tracking_coordinator(bpy.types.Operator):
 
         # Fallback (unbekannte Phase)
         return self._finish(context, info=f"Unbekannte Phase: {self.phase}", cancelled=True)
-        # --- Ende modal() ---
+        # --- Ende _run_phase() ---
 
 # --- Registrierung ----------------------------------------------------------
 def register():
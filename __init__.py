@@ -119,16 +119,26 @@ def _unregister_scene_props() -> None:
 
 # ---------------------------------------------------------------------------
 # Launcher-Operator: startet den modalen Coordinator
+# (Background: synchroner Headless-Lauf, siehe Helper/headless.py)
 # ---------------------------------------------------------------------------
 class CLIP_OT_kaiserlich_coordinator_launcher(BpyOperator):
     bl_idname = "clip.kaiserlich_coordinator_launcher"
     bl_label = "Kaiserlich Coordinator (Start)"
     bl_options = {"REGISTER", "UNDO"}
 
+    summary_path: StringProperty(
+        name="Summary",
+        description="JSON-Zusammenfassung des Headless-Laufs ('//' = relativ zur .blend)",
+        default="",
+        subtype="FILE_PATH",
+        options={"SKIP_SAVE"},
+    )
+
     def execute(self, context):
         if bpy.app.background:
-            self.report({'ERROR'}, "Kein UI (Background).")
-            return {'CANCELLED'}
+            return bpy.ops.clip.tracking_coordinator(
+                'EXEC_DEFAULT', headless=True, summary_path=self.summary_path
+            )
         return bpy.ops.clip.tracking_coordinator('INVOKE_DEFAULT')
 
 # ---------------------------------------------------------------------------
@@ -195,16 +205,30 @@ _CLASSES = (
 
 def register() -> None:
     from .ui import register as _ui_register
+    from .Helper.clip_context import register_clip_context
+    from .Helper.tracking_state import register_tracking_state
     # 1) Klassen zuerst registrieren (damit bl_rna existiert)
     for cls in _CLASSES:
         bpy.utils.register_class(cls)
     # 2) Dann Scene-Properties anlegen (nutzt registrierte PropertyGroups)
     _register_scene_props()
     _ui_register()  # Panels/Menus/Overlay
+    register_clip_context()  # Editor-Cache beim Datei-Laden verwerfen
+    register_tracking_state()  # In-Memory-State beim Datei-Laden verwerfen
 
 def unregister() -> None:
     from .ui import unregister as _ui_unregister
+    from .Helper.completion import clear_completions
+    from .Helper.solve_cache import clear_solve_cache
+    from .Helper.clip_context import unregister_clip_context
+    from .Helper.tracking_state import unregister_tracking_state
+    from .Helper.trace import clear_trace
     _ui_unregister()
+    clear_completions()  # offene Fertig-Signale + depsgraph-Handler entfernen
+    clear_solve_cache()
+    unregister_clip_context()  # load_post-Handler, Editor-Cache + msgbus-Abos
+    unregister_tracking_state()  # load_post-Handler + In-Memory-State
+    clear_trace()  # bpy.ops-Patch zurücknehmen
     # 1) Scene-Properties zuerst sauber entfernen (lösen Referenzen)
     _unregister_scene_props()
     # 2) Dann Klassen deregistrieren